@@ -1,14 +1,19 @@
 import sys
-import cv2
-import numpy as np
-import dxcam
-from PyQt5 import QtCore, QtGui, QtWidgets
-import win32gui
-import win32con
-import win32api
-import ctypes
-import keyboard
 import time
+STARTED = time.perf_counter() # 시작 시간 측정 기준
+
+# 아래 import 는 일부러 STARTED 뒤에 둠 (PyQt / win32 를 불러오는 시간도 시작 시간에 포함, E402 는 의도된 것)
+from PyQt5 import QtCore, QtGui, QtWidgets  # noqa: E402
+import win32gui  # noqa: E402
+import win32con  # noqa: E402
+import win32api  # noqa: E402
+import ctypes  # noqa: E402
+
+from edge_config import Config, config_store, color_key  # noqa: E402
+
+# 창 / 설정 화면에 필요한 모듈만 먼저 불러옴
+# NumPy / OpenCV / 엣지 파이프라인 (capture_workers) 과 keyboard 는 창을 띄운 뒤 BackendLoader 가 불러옴
+GUI_IMPORTED = time.perf_counter()
 
 # High DPI 인식 설정 (High DPI Awareness)
 try:
@@ -17,20 +22,13 @@ try:
 except Exception:
     pass
 
-class Config:
-    CANNY_MIN = 50
-    CANNY_MAX = 150
-    EDGE_COLOR = (0, 255, 0)  # 초록색 (RGB)
-    EDGE_THICKNESS = 1
-    EDGE_OPACITY = 255
-    REFRESH_RATE = 60
-    AUTO_SIGMA = 0.33
-    REALTIME_AUTO = False
-    
 class SettingsWidget(QtWidgets.QWidget):
     valueChanged = QtCore.pyqtSignal()
     sig_req_auto_adjust = QtCore.pyqtSignal()
     sig_req_window_select = QtCore.pyqtSignal()
+    sig_req_dump_stats = QtCore.pyqtSignal()
+    sig_req_add_region = QtCore.pyqtSignal()
+    sig_req_record = QtCore.pyqtSignal(bool)
 
     def __init__(self):
         super().__init__()
@@ -71,6 +69,28 @@ class SettingsWidget(QtWidgets.QWidget):
         # 그룹 2: 임계값 수동 설정 (Manual Thresholds)
         group_thresh = QtWidgets.QGroupBox("임계값 수동 설정 (Manual Thresholds)")
         layout_thresh = QtWidgets.QVBoxLayout()
+
+        # 엣지 검출기 (Canny 외에는 Max 값 하나로 판정, 더 저렴하지만 선이 굵음)
+        layout_thresh.addWidget(QtWidgets.QLabel("검출기 (Detector)"))
+        self.detector_combo = QtWidgets.QComboBox()
+        self.detector_combo.addItem("Canny", "canny")
+        self.detector_combo.addItem("Sobel", "sobel")
+        self.detector_combo.addItem("Scharr", "scharr")
+        self.detector_combo.addItem("Laplacian", "laplacian")
+        self.detector_combo.addItem("형태학적 기울기 (Morph)", "morph")
+        self.detector_combo.setCurrentIndex(self.detector_combo.findData(Config.EDGE_DETECTOR))
+        self.detector_combo.currentIndexChanged.connect(self.update_config)
+        layout_thresh.addWidget(self.detector_combo)
+
+        # 사전 블러
+        layout_thresh.addWidget(QtWidgets.QLabel("블러 (Blur)"))
+        self.blur_combo = QtWidgets.QComboBox()
+        self.blur_combo.addItem("끄기 (Off)", 0)
+        self.blur_combo.addItem("3x3", 3)
+        self.blur_combo.addItem("5x5", 5)
+        self.blur_combo.setCurrentIndex(self.blur_combo.findData(Config.BLUR_SIZE))
+        self.blur_combo.currentIndexChanged.connect(self.update_config)
+        layout_thresh.addWidget(self.blur_combo)
         
         # Canny Min
         self.canny_min_label = QtWidgets.QLabel(f"Canny Min: {Config.CANNY_MIN}")
@@ -122,11 +142,85 @@ class SettingsWidget(QtWidgets.QWidget):
         group_appear.setLayout(layout_appear)
         main_layout.addWidget(group_appear)
 
+        # 그룹 4: 성능 설정 (Performance)
+        group_perf = QtWidgets.QGroupBox("성능 설정 (Performance)")
+        layout_perf = QtWidgets.QVBoxLayout()
+
+        # 병렬 처리 스레드 (0/1 = 단일 처리)
+        layout_perf.addWidget(QtWidgets.QLabel("병렬 처리 스레드 (Threads, 0 = 끄기)"))
+        self.threads_spin = QtWidgets.QSpinBox()
+        self.threads_spin.setRange(0, 16)
+        self.threads_spin.setValue(Config.WORKER_THREADS)
+        self.threads_spin.valueChanged.connect(self.update_config)
+        layout_perf.addWidget(self.threads_spin)
+
+        # 캡처 / 처리를 별도 프로세스에서 (GIL 분리, 새로 추가하는 모니터 워커부터 적용)
+        self.process_chk = QtWidgets.QCheckBox("다중 프로세스 (Multi-process)")
+        self.process_chk.setChecked(Config.MULTIPROCESS)
+        self.process_chk.stateChanged.connect(self.update_config)
+        layout_perf.addWidget(self.process_chk)
+
+        # 출력 방식 (마스크 = 색상 / 투명도를 화면에서 적용, 전달량 1/4)
+        # 벡터 = 윤곽선을 펜으로 그림, 자동 = 엣지가 드물면 벡터 / 많으면 마스크
+        layout_perf.addWidget(QtWidgets.QLabel("출력 방식 (Output)"))
+        self.output_combo = QtWidgets.QComboBox()
+        self.output_combo.addItem("마스크 (Mask)", "mask")
+        self.output_combo.addItem("RGBA", "rgba")
+        self.output_combo.addItem("벡터 (Vector)", "vector")
+        self.output_combo.addItem("자동 (Auto)", "auto")
+        self.output_combo.setCurrentIndex(self.output_combo.findData(Config.OUTPUT_MODE))
+        self.output_combo.currentIndexChanged.connect(self.update_config)
+        layout_perf.addWidget(self.output_combo)
+
+        # 처리 배율 (축소 해상도에서 엣지 검출 후 확대)
+        layout_perf.addWidget(QtWidgets.QLabel("처리 배율 (Scale)"))
+        self.scale_combo = QtWidgets.QComboBox()
+        for scale in (1.0, 0.75, 0.5, 0.25):
+            self.scale_combo.addItem(f"{int(scale * 100)}%", scale)
+        self.scale_combo.setCurrentIndex(self.scale_combo.findData(Config.PROCESSING_SCALE))
+        self.scale_combo.currentIndexChanged.connect(self.update_config)
+        layout_perf.addWidget(self.scale_combo)
+
+        self.thin_chk = QtWidgets.QCheckBox("얇은 선 유지 (Thin lines)")
+        self.thin_chk.setChecked(Config.UPSCALE_METHOD == "thin")
+        self.thin_chk.stateChanged.connect(self.update_config)
+        layout_perf.addWidget(self.thin_chk)
+
+        # 스크롤 / 화면 이동 시 이전 엣지 맵 재사용
+        self.scroll_chk = QtWidgets.QCheckBox("스크롤 재사용 (Scroll reuse)")
+        self.scroll_chk.setChecked(Config.SCROLL_REUSE)
+        self.scroll_chk.stateChanged.connect(self.update_config)
+        layout_perf.addWidget(self.scroll_chk)
+
+        # 성능 측정 표시 (HUD) / 통계 저장
+        self.hud_chk = QtWidgets.QCheckBox("성능 표시 (HUD)")
+        self.hud_chk.setChecked(Config.SHOW_HUD)
+        self.hud_chk.stateChanged.connect(self.update_config)
+        layout_perf.addWidget(self.hud_chk)
+
+        self.dump_btn = QtWidgets.QPushButton("통계 저장 (Dump Stats)")
+        self.dump_btn.clicked.connect(self.sig_req_dump_stats.emit)
+        layout_perf.addWidget(self.dump_btn)
+
+        # 캡처 프레임 녹화 (edge_bench.py replay 로 다른 기기에서 재현)
+        self.record_btn = QtWidgets.QPushButton("녹화 (Record)")
+        self.record_btn.setCheckable(True)
+        self.record_btn.toggled.connect(self.sig_req_record.emit)
+        layout_perf.addWidget(self.record_btn)
+
+        group_perf.setLayout(layout_perf)
+        main_layout.addWidget(group_perf)
+
         # 윈도우 선택 버튼 (하단으로 이동)
         self.win_select_btn = QtWidgets.QPushButton("윈도우 선택 (Select Window)")
         self.win_select_btn.clicked.connect(self.sig_req_window_select.emit)
         main_layout.addWidget(self.win_select_btn)
 
+        # 영역 추가 (같은 모니터의 영역들은 캡처 하나를 공유, 영역 창에서 Delete = 닫기)
+        self.add_region_btn = QtWidgets.QPushButton("영역 추가 (Add Region)")
+        self.add_region_btn.clicked.connect(self.sig_req_add_region.emit)
+        main_layout.addWidget(self.add_region_btn)
+
         self.setLayout(main_layout)
 
     def update_config(self):
@@ -136,19 +230,33 @@ class SettingsWidget(QtWidgets.QWidget):
         Config.EDGE_OPACITY = self.opacity_slider.value()
         Config.AUTO_SIGMA = self.sigma_slider.value() / 100.0
         Config.REALTIME_AUTO = self.realtime_chk.isChecked()
+        Config.WORKER_THREADS = self.threads_spin.value()
+        Config.EDGE_DETECTOR = self.detector_combo.currentData()
+        Config.BLUR_SIZE = self.blur_combo.currentData()
+        Config.MULTIPROCESS = self.process_chk.isChecked()
+        Config.OUTPUT_MODE = self.output_combo.currentData()
+        Config.PROCESSING_SCALE = self.scale_combo.currentData()
+        Config.UPSCALE_METHOD = "thin" if self.thin_chk.isChecked() else "nearest"
+        Config.SCROLL_REUSE = self.scroll_chk.isChecked()
+        Config.SHOW_HUD = self.hud_chk.isChecked()
         
         self.canny_min_label.setText(f"Canny Min: {Config.CANNY_MIN}")
         self.canny_max_label.setText(f"Canny Max: {Config.CANNY_MAX}")
         self.opacity_label.setText(f"투명도 (Opacity): {Config.EDGE_OPACITY}")
         self.sigma_label.setText(f"Sigma: {Config.AUTO_SIGMA:.2f}")
+        # 워커는 게시된 스냅샷만 읽으므로 변경 후 한 번에 게시
+        config_store.publish()
         self.valueChanged.emit()
 
     def update_sliders_from_config(self):
         # 재귀적인 시그널 발생 방지
-        self.canny_min_slider.blockSignals(True)
-        self.canny_max_slider.blockSignals(True)
-        self.opacity_slider.blockSignals(True)
-        self.sigma_slider.blockSignals(True)
+        # (하나라도 막지 않으면 update_config 가 아직 갱신 전인 위젯 값으로 Config 를 덮어씀)
+        widgets = (self.canny_min_slider, self.canny_max_slider, self.thickness_spin, self.opacity_slider,
+                   self.sigma_slider, self.realtime_chk, self.threads_spin, self.detector_combo, self.blur_combo,
+                   self.process_chk, self.output_combo, self.scale_combo, self.thin_chk, self.scroll_chk,
+                   self.hud_chk)
+        for widget in widgets:
+            widget.blockSignals(True)
         
         self.canny_min_slider.setValue(int(Config.CANNY_MIN))
         self.canny_max_slider.setValue(int(Config.CANNY_MAX))
@@ -156,16 +264,23 @@ class SettingsWidget(QtWidgets.QWidget):
         self.opacity_slider.setValue(int(Config.EDGE_OPACITY))
         self.sigma_slider.setValue(int(Config.AUTO_SIGMA * 100))
         self.realtime_chk.setChecked(Config.REALTIME_AUTO)
+        self.threads_spin.setValue(int(Config.WORKER_THREADS))
+        self.detector_combo.setCurrentIndex(self.detector_combo.findData(Config.EDGE_DETECTOR))
+        self.blur_combo.setCurrentIndex(self.blur_combo.findData(Config.BLUR_SIZE))
+        self.process_chk.setChecked(Config.MULTIPROCESS)
+        self.output_combo.setCurrentIndex(self.output_combo.findData(Config.OUTPUT_MODE))
+        self.scale_combo.setCurrentIndex(self.scale_combo.findData(Config.PROCESSING_SCALE))
+        self.thin_chk.setChecked(Config.UPSCALE_METHOD == "thin")
+        self.scroll_chk.setChecked(Config.SCROLL_REUSE)
+        self.hud_chk.setChecked(Config.SHOW_HUD)
 
         self.canny_min_label.setText(f"Canny Min: {int(Config.CANNY_MIN)}")
         self.canny_max_label.setText(f"Canny Max: {int(Config.CANNY_MAX)}")
         self.opacity_label.setText(f"투명도 (Opacity): {int(Config.EDGE_OPACITY)}")
         self.sigma_label.setText(f"Sigma: {Config.AUTO_SIGMA:.2f}")
         
-        self.canny_min_slider.blockSignals(False)
-        self.canny_max_slider.blockSignals(False)
-        self.opacity_slider.blockSignals(False)
-        self.sigma_slider.blockSignals(False)
+        for widget in widgets:
+            widget.blockSignals(False)
 
 
     def change_color(self):
@@ -173,180 +288,311 @@ class SettingsWidget(QtWidgets.QWidget):
             QtGui.QColor(*Config.EDGE_COLOR), self, "엣지 색상 선택"
         )
         if color.isValid():
-            Config.EDGE_COLOR = (color.red(), color.green(), color.blue())
+            config_store.publish(EDGE_COLOR=(color.red(), color.green(), color.blue()))
             self.valueChanged.emit()
 
-class CaptureWorker(QtCore.QThread):
-    sig_frame_ready = QtCore.pyqtSignal(QtGui.QImage)
-    
-    def __init__(self, parent=None):
+class StartupTimer:
+    # 시작 시간 측정: 구간별 시각 (STARTED 기준 초)
+    #   gui_imports (Qt / win32) -> window (첫 창 그리기) -> backend (파이프라인 import)
+    #   -> camera (캡처 준비) -> first_frame (첫 엣지 프레임 그리기)
+    ORDER = ("gui_imports", "window", "backend", "camera", "first_frame")
+
+    def __init__(self, started):
+        self.started = started
+        self.marks = {}
+        self.backend_import = None # 백그라운드 import 소요 시간 (초)
+
+    def mark(self, name, at=None):
+        # 처음 한 번만 기록
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() if at is None else at) - self.started
+
+    def summary(self):
+        result = {name: self.marks[name] for name in self.ORDER if name in self.marks}
+        if self.backend_import is not None:
+            result["backend_import"] = self.backend_import
+        return result
+
+    def report(self):
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.summary().items()]
+        return "시작 시간: " + " | ".join(parts)
+
+
+class BackendLoader(QtCore.QThread):
+    # 무거운 모듈을 백그라운드에서 import (GUI 스레드는 그동안 창을 그리고 입력을 처리)
+    # 글로벌 단축키도 keyboard 를 불러온 뒤 여기서 등록
+    sig_loaded = QtCore.pyqtSignal(object, float) # capture_workers 모듈, import 소요 시간 (초)
+
+    def __init__(self, hotkeys, parent=None):
         super().__init__(parent)
-        self.running = True
-        self.paused = False
-        self.cam = None
-        self.current_monitor_idx = 0
-        self.region = None # (lx, ly, w, h)
-        self.request_one_shot_auto = False # 1회성 자동 조절 요청 플래그
-        
-        # 최적화 변수
-        self.rgba_buffer = None
-        self.last_buffer_shape = None
-        
-        # DXCam 초기화
-        self._init_camera(0)
+        self.hotkeys = hotkeys # 단축키 -> 콜백 (다른 스레드에서 호출되므로 시그널 emit 만)
+        self.keyboard = None
 
-    def _init_camera(self, monitor_idx):
+    def run(self):
+        t0 = time.perf_counter()
+        import capture_workers
+        elapsed = time.perf_counter() - t0
+        self.sig_loaded.emit(capture_workers, elapsed)
         try:
-            # 안전하게 기존 카메라 해제
-            if getattr(self, 'cam', None) is not None:
-                old_cam = self.cam
-                self.cam = None # 속성은 유지하되 값만 None으로 변경 (run 루프 안전)
-                del old_cam
-            
-            # output_color="BGR" 대신 "GRAY"를 고려할 수 있으나, DXCam은 기본적으로 RGB/BGR 지원이 강력함.
-            # 그대로 BGR 사용 (OpenCV 변환이 빠름)
-            self.cam = dxcam.create(output_idx=monitor_idx, output_color="BGR")
-            self.current_monitor_idx = monitor_idx
+            import keyboard
+            for combo, callback in self.hotkeys.items():
+                keyboard.add_hotkey(combo, callback)
+            self.keyboard = keyboard
         except Exception as e:
-            print(f"CaptureWorker: DXCam 초기화 실패: {e}")
-            self.cam = None
-
-    def set_region_and_monitor(self, monitor_idx, region):
-        self.region = region
-        if self.current_monitor_idx != monitor_idx:
-            # 모니터 변경 시 카메라 재초기화
-            self._init_camera(monitor_idx)
-            
-        # 영역 크기가 변경되면 버퍼 초기화 필요 (run 루프에서 처리하도록 함)
+            print(f"단축키 등록 실패: {e}")
 
-    def trigger_auto_adjust(self):
-        self.request_one_shot_auto = True
 
-    def run(self):
-        while self.running:
-            loop_start = time.time()
-            
-            if self.paused or self.cam is None or self.region is None:
-                self.msleep(100)
-                continue
-                
-            lx, ly, w, h = self.region
-            if w <= 0 or h <= 0:
-                self.msleep(50)
-                continue
-                
-            # 프레임 캡처 (Grab Frame)
-            try:
-                # 모니터 경계 확인 (Clamp)
-                if lx + w > self.cam.width: w = self.cam.width - lx
-                if ly + h > self.cam.height: h = self.cam.height - ly
-                
-                if w <= 0 or h <= 0:
-                    self.msleep(50)
-                    continue
+class OverlayManager(QtCore.QObject):
+    # 여러 오버레이 창(영역)과 모니터별 캡처 워커 관리
+    # 같은 모니터의 창들은 워커(카메라 / grab 루프) 하나를 공유하고, 설정 창 / 단축키도 하나만 둔다.
+    # 창이 모니터 경계에 걸치면 걸친 모니터들을 워커 하나가 동시에 grab 해 이어 붙임 (capture_span)
+    #   한 모니터를 두 워커가 캡처하지 않도록 모니터를 공유하는 창들은 (이어지는 것끼리) 한 워커로 묶음
+    # 키보드 스레드에서 안전한 UI 업데이트를 위한 시그널 정의
+    sig_toggle_visibility = QtCore.pyqtSignal()
+    sig_toggle_interactive = QtCore.pyqtSignal()
 
-                frame = self.cam.grab(region=(lx, ly, lx+w, ly+h))
-                if frame is None: 
-                    continue
-            except Exception as e:
-                self.msleep(50)
-                continue
-                
-            # 이미지 처리 (Process Image)
-            try:
-                # 그레이스케일 변환
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # 자동 조절 로직
-                if Config.REALTIME_AUTO or self.request_one_shot_auto:
-                    self._calculate_auto_threshold(gray)
-                    self.request_one_shot_auto = False
-                
-                # 가우시안 블러 -> Canny
-                blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-                edges = cv2.Canny(blurred, Config.CANNY_MIN, Config.CANNY_MAX)
-                
-                # 팽창 (Thickness)
-                if Config.EDGE_THICKNESS > 1:
-                    kernel = np.ones((Config.EDGE_THICKNESS, Config.EDGE_THICKNESS), np.uint8)
-                    edges = cv2.dilate(edges, kernel, iterations=1)
-                    
-                # RGBA 변환 최적화 (버퍼 재사용)
-                h_img, w_img = edges.shape
-                
-                # 버퍼 크기 확인 및 재할당
-                if self.rgba_buffer is None or self.last_buffer_shape != (h_img, w_img):
-                    self.rgba_buffer = np.zeros((h_img, w_img, 4), dtype=np.uint8)
-                    self.last_buffer_shape = (h_img, w_img)
-                else:
-                    # 버퍼 초기화 (전체 0으로)
-                    # self.rgba_buffer.fill(0) # 혹은 아래에서 마스킹으로 처리
-                    # 마스크 기반 할당이므로 투명 영역은 0이어야 함. 
-                    # 이전 프레임의 잔상을 지우기 위해 fill(0)은 필수적이나 느릴 수 있음.
-                    # 하지만 Canny edge는 희소하므로 마스크 영역만 갱신하면 잔상이 남음.
-                    # -> fill(0)을 해야 함.
-                     self.rgba_buffer.fill(0)
-                
-                # 색상 적용
-                r, g, b = Config.EDGE_COLOR
-                mask = edges > 0
-                
-                # numpy bad mask error 방지를 위해 안전장치? (shape 일치하므로 불필요)
-                # 고급 인덱싱 사용 - 색상은 고정이므로 미리 튜플이 아닌 배열로 준비하면 더 빠를 수 있음.
-                self.rgba_buffer[mask, 0] = r
-                self.rgba_buffer[mask, 1] = g
-                self.rgba_buffer[mask, 2] = b
-                self.rgba_buffer[mask, 3] = Config.EDGE_OPACITY
-                
-                # QImage 생성 (버퍼 공유)
-                # copy()를 하지 않으면 스레드 경합 문제 발생 가능성 있음?
-                # QImage가 데이터를 참조하므로, 다음 프레임에서 rgba_buffer를 수정하면 UI 표시 중인 이미지가 깨질 수 있음.
-                # 따라서 .copy()는 안전을 위해 유지하는 것이 좋음.
-                qt_image = QtGui.QImage(self.rgba_buffer.data, w_img, h_img, w_img * 4, QtGui.QImage.Format_RGBA8888).copy()
-                self.sig_frame_ready.emit(qt_image)
-                
-            except Exception as e:
-                print(f"이미지 처리 오류: {e}")
+    def __init__(self):
+        super().__init__()
+        self.workers = {}   # 출력 묶음 ((출력 인덱스, (x, y)), ...) -> CaptureWorker
+        self.windows = {}   # 영역 id -> OverlayWindow
+        self.regions = {}   # 영역 id -> ({출력 인덱스: 모니터 (x, y, w, h)}, 창 영역), 모두 가상 데스크톱 좌표
+        self.placement = {} # 영역 id -> 출력 묶음
+        self.next_key = 0
+        self.active_window = None # 마지막으로 조작한 창 (윈도우 선택 대상)
+        self.is_visible = True
+        self.is_interactive = True
+        self.recording = None # 녹화 중이면 파일 이름 접두사
+        self.startup = StartupTimer(STARTED)
+        self.startup.mark("gui_imports", GUI_IMPORTED)
+        self.backend = None # capture_workers 모듈 (불러오기 전에는 None)
+        self.pending_regions = {} # 불러오기 전에 요청된 영역 id -> (걸친 모니터, 영역)
+        self.capture_pool = None # 모니터별 카메라 풀 (워커가 종료돼도 잠시 유지)
 
-            # 주사율 제어 (정밀 타이밍)
-            if Config.REFRESH_RATE > 0:
-                elapsed = time.time() - loop_start
-                target_interval = 1.0 / Config.REFRESH_RATE
-                sleep_time = target_interval - elapsed
-                
-                if sleep_time > 0:
-                    self.msleep(int(sleep_time * 1000))
-            else:
-                self.msleep(1) # 최대 속도 제한 해제 시에도 최소한의 sleep 권장
+        # 설정 윈도우
+        self.settings_widget = SettingsWidget()
+        # 마스크 출력은 색상 / 투명도를 그릴 때 적용하므로 바로 다시 그리면 됨
+        self.settings_widget.valueChanged.connect(self.update_windows)
+        self.settings_widget.sig_req_auto_adjust.connect(self.perform_auto_adjust)
+        self.settings_widget.sig_req_window_select.connect(self.start_window_selection)
+        self.settings_widget.sig_req_dump_stats.connect(self.dump_stats)
+        self.settings_widget.sig_req_add_region.connect(self.add_window)
+        self.settings_widget.sig_req_record.connect(self.set_recording)
 
-    def _calculate_auto_threshold(self, gray_image):
-        h, w = gray_image.shape
-        if w > 320:
-            small_gray = cv2.resize(gray_image, (0, 0), fx=0.2, fy=0.2, interpolation=cv2.INTER_NEAREST)
+        # 시그널 연결
+        self.sig_toggle_visibility.connect(self.toggle_visibility)
+        self.sig_toggle_interactive.connect(self.toggle_interactive)
+
+        # 파이프라인 모듈 / 글로벌 단축키는 백그라운드에서 준비
+        self.loader = BackendLoader({'ctrl+f9': self.sig_toggle_visibility.emit,
+                                     'ctrl+f10': self.sig_toggle_interactive.emit})
+        self.loader.sig_loaded.connect(self.backend_loaded)
+        self.loader.start()
+
+    def backend_loaded(self, module, elapsed):
+        self.backend = module
+        self.capture_pool = module.CapturePool(max_idle=Config.CAPTURE_POOL_SIZE,
+                                               idle_timeout=Config.CAPTURE_IDLE_TIMEOUT)
+        # 오래 쓰이지 않은 카메라 정리
+        self.pool_timer = QtCore.QTimer(self)
+        self.pool_timer.timeout.connect(self.capture_pool.evict)
+        self.pool_timer.start(5000)
+        self.startup.backend_import = elapsed
+        self.startup.mark("backend")
+        pending, self.pending_regions = self.pending_regions, {}
+        for key, (screens, region) in pending.items():
+            self.set_region(key, screens, region)
+
+    def frame_painted(self):
+        # 창이 엣지 프레임을 처음 그렸을 때 (시작 시간 측정 완료)
+        if "first_frame" not in self.startup.marks:
+            self.startup.mark("first_frame")
+            print(self.startup.report())
+
+    def add_window(self):
+        key = self.next_key
+        self.next_key += 1
+        window = OverlayWindow(self, key)
+        if self.active_window is not None:
+            # 새 영역은 마지막 창 옆에 조금 비켜서 생성
+            window.setGeometry(self.active_window.geometry().translated(40, 40))
+        self.windows[key] = window
+        self.active_window = window
+        window.show()
+        return window
+
+    def set_region(self, key, screens, region):
+        # 창 영역 (x, y, w, h) 갱신. screens: 창이 걸친 모니터 {출력 인덱스: (x, y, w, h)}, 모두 가상 데스크톱 좌표
+        if self.backend is None:
+            # 파이프라인을 불러오는 중 -> 마지막 영역만 기억했다가 불러온 뒤 시작
+            self.pending_regions[key] = (screens, region)
+            return
+        old = self.regions.get(key)
+        self.regions[key] = (screens, region)
+        if old is None or old[0] != screens:
+            self.place()
         else:
-            small_gray = gray_image
-            
-        v = np.median(small_gray)
-        sigma = Config.AUTO_SIGMA
-        lower = int(max(0, (1.0 - sigma) * v))
-        upper = int(min(255, (1.0 + sigma) * v))
-        
-        Config.CANNY_MIN = lower
-        Config.CANNY_MAX = upper
+            self.update_worker_region(key)
+
+    def place(self):
+        # 영역 -> 출력 묶음 다시 계산: 모니터를 공유하는 영역끼리 합침 (창 수가 적으므로 반복 병합)
+        groups = [] # [({출력 인덱스: (x, y)}, {영역 id})]
+        for key, (screens, _) in self.regions.items():
+            monitors, keys = {idx: geometry[:2] for idx, geometry in screens.items()}, {key}
+            for group in [group for group in groups if group[0].keys() & monitors.keys()]:
+                groups.remove(group)
+                monitors.update(group[0])
+                keys |= group[1]
+            groups.append((monitors, keys))
+        placement = {key: tuple(sorted(monitors.items())) for monitors, keys in groups for key in keys}
+
+        # 묶음이 바뀐 영역은 이전 워커에서 먼저 빼고 (빈 워커는 종료 -> 카메라를 풀에 반납) 새 워커에 추가
+        for key in [key for key, outputs in self.placement.items() if placement.get(key) != outputs]:
+            self.detach_region(key)
+        for key, outputs in placement.items():
+            self.placement[key] = outputs
+            self.update_worker_region(key)
+
+    def update_worker_region(self, key):
+        # 창 영역을 워커 좌표 (출력 묶음의 왼쪽 위 기준) 로 바꿔 전달, 워커가 없으면 시작
+        outputs = self.placement[key]
+        worker = self.workers.get(outputs)
+        if worker is None:
+            backend = self.backend
+            worker_class = backend.ProcessCaptureWorker if Config.MULTIPROCESS else backend.CaptureWorker
+            worker = worker_class(outputs, pool=self.capture_pool)
+            worker.mailbox.sig_posted.connect(self.collect_frames)
+            worker.sig_thresholds_changed.connect(self.sync_thresholds_slot)
+            worker.sig_ready.connect(lambda: self.startup.mark("camera"))
+            worker.paused = not self.is_visible
+            worker.start()
+            self.workers[outputs] = worker
+            if self.recording:
+                worker.start_recording(f"{self.recording}_m{self.output_label(outputs)}.edgerec")
+        ox = min(x for _, (x, _) in outputs)
+        oy = min(y for _, (_, y) in outputs)
+        x, y, w, h = self.regions[key][1]
+        worker.set_region(key, (x - ox, y - oy, w, h))
+
+    @staticmethod
+    def output_label(outputs):
+        # 파일 이름용 출력 묶음 이름 ("0", "0+1")
+        return "+".join(str(idx) for idx, _ in outputs)
+
+    def detach_region(self, key):
+        # 워커에서 영역 제거. 영역이 남지 않은 워커는 종료 (카메라는 풀에 반납)
+        outputs = self.placement.pop(key, None)
+        worker = self.workers.get(outputs)
+        if worker is None:
+            return
+        worker.remove_region(key)
+        if not worker.has_regions():
+            del self.workers[outputs]
+            worker.stop()
+
+    def release_region(self, key):
+        # 영역 캡처 중단 (윈도우 선택 중 / 창 닫힘). 남은 영역은 묶음을 다시 나눔 (걸친 창이 빠지면 모니터별로)
+        self.pending_regions.pop(key, None)
+        if self.regions.pop(key, None) is not None:
+            self.detach_region(key)
+            self.place()
+
+    def worker_for(self, key):
+        return self.workers.get(self.placement.get(key))
+
+    def collect_frames(self, mailbox):
+        # 워커 우편함의 최신 프레임들을 창에 전달 (밀린 동안 덮어쓰인 프레임은 이미 반환됨)
+        for frame in mailbox.take():
+            self.dispatch_frame(frame)
+
+    def dispatch_frame(self, frame):
+        window = self.windows.get(frame.target)
+        if window is None:
+            frame.release()
+        else:
+            window.update_image_slot(frame)
+
+    def window_closed(self, window):
+        self.release_region(window.key)
+        self.windows.pop(window.key, None)
+        if self.active_window is window:
+            self.active_window = next(iter(self.windows.values()), None)
+        if not self.windows:
+            for worker in list(self.workers.values()):
+                worker.stop()
+            self.workers = {}
+            if self.capture_pool is not None:
+                self.capture_pool.close()
+            if self.loader.keyboard is not None:
+                self.loader.keyboard.unhook_all()
+            self.settings_widget.close()
+
+    def update_windows(self):
+        for window in self.windows.values():
+            window.update()
+
+    def toggle_visibility(self):
+        self.is_visible = not self.is_visible
+        for worker in self.workers.values():
+            worker.paused = not self.is_visible
+        for window in self.windows.values():
+            window.set_visible(self.is_visible)
 
-    def stop(self):
-        self.running = False
-        self.wait()
+    def toggle_interactive(self):
+        self.is_interactive = not self.is_interactive
+        for window in self.windows.values():
+            window.set_interactive(self.is_interactive)
+
+    def start_window_selection(self):
+        if self.active_window is not None:
+            self.active_window.start_window_selection()
+
+    def perform_auto_adjust(self):
+        # 워커에게 1회성 자동 조절 요청
+        for worker in self.workers.values():
+            worker.trigger_auto_adjust()
+
+    def sync_thresholds_slot(self, low, high):
+        # 자동 조절이 값을 변경했을 경우 설정에 반영 후 UI 슬라이더 동기화 (값이 움직일 때만 호출됨)
+        config_store.publish(CANNY_MIN=low, CANNY_MAX=high)
+        self.settings_widget.update_sliders_from_config()
+
+    def set_recording(self, on):
+        # 모니터(워커)별 녹화 파일
+        if on:
+            self.recording = time.strftime("edge_rec_%Y%m%d_%H%M%S")
+            for outputs, worker in self.workers.items():
+                worker.start_recording(f"{self.recording}_m{self.output_label(outputs)}.edgerec")
+        else:
+            self.recording = None
+            for worker in self.workers.values():
+                worker.stop_recording()
+
+    def dump_stats(self):
+        # 모니터(워커)별로 저장
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        settings = {name: getattr(Config, name) for name in dir(Config) if name.isupper()}
+        for outputs, worker in self.workers.items():
+            path = f"edge_stats_{stamp}_m{self.output_label(outputs)}.json"
+            regions = {str(key): list(region) for key, region in worker.regions.items()}
+            try:
+                worker.telemetry.dump(path, {"config": settings,
+                                             "quality_level": worker.quality_level(),
+                                             "regions": regions,
+                                             "processed_pixels": worker.region_summary()[2],
+                                             "capture_pool": self.capture_pool.stats(),
+                                             "startup": self.startup.summary()})
+                print(f"성능 통계 저장: {path}")
+            except Exception as e:
+                print(f"성능 통계 저장 실패: {e}")
 
 
 class OverlayWindow(QtWidgets.QMainWindow):
-    # 키보드 스레드에서 안전한 UI 업데이트를 위한 시그널 정의
-    sig_toggle_visibility = QtCore.pyqtSignal()
-    sig_toggle_interactive = QtCore.pyqtSignal()
     sig_snap_window = QtCore.pyqtSignal(int, object) # hwnd, rect
 
-    def __init__(self):
+    def __init__(self, manager, key=0):
         super().__init__()
+        self.manager = manager
+        self.key = key # 영역 id (워커가 보낸 프레임의 target)
         self.setWindowTitle("Edge Overlay")
         
         # 윈도우 초기 크기 및 위치
@@ -368,28 +614,34 @@ class OverlayWindow(QtWidgets.QMainWindow):
         except Exception as e:
             print(f"SetWindowDisplayAffinity 실패: {e}")
         
-        # 워커 스레드 설정
-        self.worker = CaptureWorker()
-        self.worker.sig_frame_ready.connect(self.update_image_slot)
-        self.worker.start()
-
-        # 모니터 관리
+        # 모니터 관리 (캡처 워커는 manager 가 모니터별로 공유)
         self.check_monitor_timer = QtCore.QTimer()
         self.check_monitor_timer.timeout.connect(self.update_capture_region)
         self.check_monitor_timer.start(500) # 0.5초마다 체크
 
-        # 설정 윈도우
-        self.settings_widget = SettingsWidget()
+        # 설정 윈도우 (모든 창이 공유)
+        self.settings_widget = manager.settings_widget
         
         # 상태 변수
-        self.qt_image = None
-        self.is_interactive = True
-        self.is_visible = True
+        self.frame = None # 현재 표시 중인 EdgeFrame
+        self.frame_painted = False
+        self.retired_frames = [] # 다음 paintEvent 이후 반환할 이전 프레임
+        self.color_table = None
+        self.color_table_key = None
+        self.edge_pen = None
+        self.edge_pen_key = None
+        self.full_repaint = True # 다음 프레임은 창 전체를 다시 그림 (표시하지 않고 버린 프레임이 있음)
+        self.painted_key = None # 마지막으로 그린 프레임 이미지 (크기, 형식) -> 바뀌면 전체 갱신
+        self.decorations = None # 편집 모드 테두리 / 안내 문구 캐시 (QPixmap, 그리는 부분 QRegion)
+        self.hud_rect = None
+        self.is_interactive = manager.is_interactive
+        self.is_visible = manager.is_visible
         self.update_mouse_input_mode()
         
-        # 설정 시그널 연결
-        self.settings_widget.sig_req_auto_adjust.connect(self.perform_auto_adjust)
-        self.settings_widget.sig_req_window_select.connect(self.start_window_selection)
+        # HUD 는 화면 변화가 없어도 주기적으로 갱신
+        self.hud_timer = QtCore.QTimer()
+        self.hud_timer.timeout.connect(self.refresh_hud)
+        self.hud_timer.start(500)
         
         # 윈도우 선택 상태
         self.is_selecting_window = False
@@ -404,26 +656,17 @@ class OverlayWindow(QtWidgets.QMainWindow):
         self.resize_margin = 30
         self.resize_edge = None
 
-        # 시그널 연결
-        self.sig_toggle_visibility.connect(self.toggle_visibility_slot)
-        self.sig_toggle_interactive.connect(self.toggle_interactive_slot)
-
-        # 글로벌 단축키 등록
-        keyboard.add_hotkey('ctrl+f9', lambda: self.sig_toggle_visibility.emit())
-        keyboard.add_hotkey('ctrl+f10', lambda: self.sig_toggle_interactive.emit())
-
-    def toggle_visibility_slot(self):
-        self.is_visible = not self.is_visible
+    def set_visible(self, visible):
+        # 보기 토글 (워커 일시 정지는 manager 가 처리)
+        self.is_visible = visible
         if not self.is_visible:
-            self.worker.paused = True
-            self.qt_image = None
+            self.clear_frame()
             self.update()
         else:
-            self.worker.paused = False
             self.update_capture_region() # 깨우기
 
-    def toggle_interactive_slot(self):
-        self.is_interactive = not self.is_interactive
+    def set_interactive(self, interactive):
+        self.is_interactive = interactive
         self.update_mouse_input_mode()
 
     def update_mouse_input_mode(self):
@@ -451,63 +694,93 @@ class OverlayWindow(QtWidgets.QMainWindow):
                     self.setGeometry(self.pre_selection_geometry)
                 self.is_interactive = True
                 self.update_mouse_input_mode()
-                self.worker.paused = False
+                self.update_capture_region()
             else:
                 self.settings_widget.close()
+        elif event.key() == QtCore.Qt.Key_Delete and len(self.manager.windows) > 1:
+            # 영역 닫기 (마지막 영역은 유지)
+            self.close()
 
     def closeEvent(self, event):
-        self.worker.stop()
-        keyboard.unhook_all()
+        # 부모 없는 타이머라 창이 닫혀도 계속 돌며 닫힌 창을 건드리므로 모두 멈춤
+        self.check_monitor_timer.stop()
+        self.hud_timer.stop()
+        self.selection_timer.stop()
+        self.clear_frame()
+        self.manager.window_closed(self)
         super().closeEvent(event)
 
-    def update_image_slot(self, image):
-        if self.is_visible and not self.is_selecting_window:
-            self.qt_image = image
-            self.update()
-        
-        # 자동 조절이 값을 변경했을 경우 UI 슬라이더 동기화
-        if (Config.REALTIME_AUTO or self.settings_widget.auto_btn.isDown()) and self.settings_widget.isVisible():
-             self.settings_widget.update_sliders_from_config()
+    def update_image_slot(self, frame):
+        frame.telemetry.record("queue", time.perf_counter() - frame.emitted_at)
+        if not frame.pin():
+            # 다중 프로세스 모드: 표시하기 전에 처리 프로세스가 슬롯을 덮어쓰기 시작함 (다음 프레임이 곧 도착)
+            # 이 프레임의 변경 영역이 빠지므로 다음 프레임은 창 전체를 다시 그림
+            frame.release()
+            frame.telemetry.count("dropped")
+            self.full_repaint = True
+        elif self.is_visible and not self.is_selecting_window:
+            self.set_frame(frame)
+            region = self.dirty_region(frame)
+            if region is None:
+                self.update()
+                self.full_repaint = False
+            elif not region.isEmpty():
+                # 바뀐 부분만 다시 그림 (Qt 가 밀린 갱신 영역은 합쳐서 한 번에 그림)
+                self.update(region)
+        else:
+            frame.release()
+            self.full_repaint = True
+
+    def dirty_region(self, frame):
+        # 이전에 그린 프레임과 달라진 부분 (QRegion), 알 수 없으면 None (창 전체)
+        if (frame.dirty is None or self.full_repaint or not Config.PARTIAL_REPAINT
+                or self.painted_key != (frame.image.size(), frame.image.format())):
+            return None
+        region = QtGui.QRegion()
+        for y0, y1, x0, x1 in frame.dirty:
+            region += QtCore.QRect(x0, y0, x1 - x0, y1 - y0)
+        return region
+
+    def set_frame(self, frame):
+        old, self.frame = self.frame, frame
+        if old is not None:
+            if self.frame_painted:
+                # 화면에 그려진 프레임은 새 프레임이 그려진 뒤 반환
+                self.retired_frames.append(old)
+            else:
+                # 한 번도 그려지지 않은 프레임은 바로 반환 (변경 영역은 새 프레임에 합침)
+                frame.absorb(old)
+                old.release()
+                old.telemetry.count("dropped")
+        self.frame_painted = False
+
+    def clear_frame(self):
+        for frame in self.retired_frames:
+            frame.release()
+        self.retired_frames = []
+        if self.frame is not None:
+            self.frame.release()
+            self.frame = None
+        self.full_repaint = True
 
     def update_capture_region(self):
-        if not self.is_visible: return
+        if not self.is_visible or self.is_selecting_window: return
         
         geometry = self.geometry()
         x, y, w, h = geometry.x(), geometry.y(), geometry.width(), geometry.height()
         
-        # 모니터 및 안전 영역 찾기 로직
-        # 1. 모니터 찾기
-        cx, cy = x + w//2, y + h//2
-        screen = QtWidgets.QApplication.screenAt(QtCore.QPoint(cx, cy))
-        if not screen: 
-            screen = QtWidgets.QApplication.primaryScreen()
-            
-        # 2. 모니터 지오메트리 가져오기
-        screen_geo = screen.geometry()
-        sx, sy, sw, sh = screen_geo.x(), screen_geo.y(), screen_geo.width(), screen_geo.height()
-        
-        # 3. 모니터 인덱스 결정 (휴리스틱)
-        screens = QtWidgets.QApplication.screens()
-        try:
-            target_idx = screens.index(screen)
-        except ValueError:
-            target_idx = 0
-
-        # 4. 교차 영역 계산
-        ix = max(x, sx)
-        iy = max(y, sy)
-        iw = min(x + w, sx + sw) - ix
-        ih = min(y + h, sy + sh) - iy
-        
-        if iw <= 0 or ih <= 0:
+        # 창과 겹치는 모니터 찾기 (모니터 인덱스 = DXCam 출력 인덱스, 휴리스틱)
+        # 여러 모니터에 걸치면 워커가 모니터마다 동시에 grab 해 이어 붙임
+        screens = {}
+        for idx, screen in enumerate(QtWidgets.QApplication.screens()):
+            screen_geo = screen.geometry()
+            if screen_geo.intersects(geometry):
+                screens[idx] = (screen_geo.x(), screen_geo.y(), screen_geo.width(), screen_geo.height())
+        if not screens:
             return # 화면 밖
-
-        # 5. 로컬 좌표 (DXCam용)
-        lx = ix - sx
-        ly = iy - sy
         
-        # 워커 업데이트
-        self.worker.set_region_and_monitor(target_idx, (lx, ly, iw, ih))
+        # 워커 업데이트 (같은 모니터의 다른 창과 캡처 공유, 모니터 밖 부분은 워커가 잘라냄)
+        self.manager.set_region(self.key, screens, (x, y, w, h))
 
 
     def start_window_selection(self):
@@ -515,9 +788,9 @@ class OverlayWindow(QtWidgets.QMainWindow):
         self.is_selecting_window = True
         self.is_interactive = False 
         
-        # 워커 일시 정지
-        self.worker.paused = True
-        self.qt_image = None
+        # 이 영역 캡처 중단 (같은 모니터의 다른 창은 계속 처리)
+        self.manager.release_region(self.key)
+        self.clear_frame()
         
         # 모든 클릭을 잡기 위한 전체 화면 (가상 스크린)
         v_screen = QtWidgets.QApplication.primaryScreen().virtualGeometry()
@@ -581,9 +854,10 @@ class OverlayWindow(QtWidgets.QMainWindow):
         self.setGeometry(l, t, w, h)
         self.is_interactive = True
         self.update_mouse_input_mode()
-        self.worker.paused = False
+        self.update_capture_region()
 
     def paintEvent(self, event):
+        self.manager.startup.mark("window")
         painter = QtGui.QPainter(self)
         
         if self.is_selecting_window:
@@ -593,16 +867,118 @@ class OverlayWindow(QtWidgets.QMainWindow):
                 painter.drawRect(self.highlight_rect)
             return
 
-        if self.qt_image:
-            painter.drawImage(0, 0, self.qt_image)
+        # 갱신 영역 (바뀐 부분만 그릴 때는 창 일부, Qt 가 그 밖은 이전 내용을 유지)
+        region = event.region()
+        if self.frame is not None:
+            if self.frame.is_vector():
+                # 윤곽선을 설정한 색상 / 두께의 펜으로 바로 그림 (팽창 / 색 입히기 없음)
+                t0 = time.perf_counter()
+                painter.setPen(self.get_edge_pen(color_key(Config), Config.EDGE_THICKNESS))
+                painter.setBrush(QtCore.Qt.NoBrush)
+                painter.drawPath(self.frame.path)
+                self.painted_key = None
+            else:
+                if self.frame.is_mask():
+                    # 마스크 값 0 = 투명, 그 외 = 엣지 색상 (색상표만 바꾸므로 재계산 없음)
+                    key = color_key(Config)
+                    if self.frame.color_key != key:
+                        self.frame.image.setColorTable(self.get_color_table(key))
+                        self.frame.color_key = key
+                t0 = time.perf_counter()
+                image = self.frame.image
+                bounds = image.rect()
+                for rect in region.rects():
+                    rect = rect.intersected(bounds)
+                    if not rect.isEmpty():
+                        painter.drawImage(rect, image, rect)
+                self.painted_key = (image.size(), image.format())
+                if not self.frame.intact():
+                    # 다중 프로세스 모드: 표시 중인 슬롯은 잡아 두므로 (pin) 생기지 않아야 함 (방어용)
+                    # 찢어진 픽셀이 바뀐 영역 밖에 남지 않도록 다음 프레임은 창 전체를 다시 그림
+                    self.frame.telemetry.count("torn")
+                    self.painted_key = None
+                    self.full_repaint = True
+            telemetry = self.frame.telemetry
+            telemetry.record("paint", time.perf_counter() - t0)
+            if not self.frame_painted:
+                telemetry.frame_presented(self.frame.captured_at)
+                self.manager.frame_painted()
+            self.frame_painted = True
+            
+            # 새 프레임이 그려졌으므로 이전 프레임 슬롯을 워커에 반환
+            for frame in self.retired_frames:
+                frame.release()
+            self.retired_frames = []
         
         if self.is_interactive:
+            # 테두리 / 안내 문구는 캐시한 이미지에서 갱신 영역과 겹치는 부분만 복사
+            pixmap, area = self.get_decorations()
+            area = area.intersected(region)
+            if not area.isEmpty():
+                painter.setClipRegion(area)
+                painter.drawPixmap(0, 0, pixmap)
+                painter.setClipping(False)
+        
+        if Config.SHOW_HUD and (self.hud_rect is None or region.intersects(self.hud_rect)):
+            self.draw_hud(painter, 40 if self.is_interactive else 20)
+
+    def get_decorations(self):
+        # 편집 모드 테두리 / 안내 문구 (창 크기가 바뀔 때만 다시 그림)
+        size, ratio = self.size(), self.devicePixelRatioF()
+        if self.decorations is None or self.decorations[2] != (size, ratio):
+            pixmap = QtGui.QPixmap(size * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pixmap)
+            hint = "[Ctrl+F9] 보기 토글 | [Ctrl+F10] 편집 모드"
             painter.setPen(QtGui.QPen(QtCore.Qt.yellow))
-            painter.drawText(10, 20, "[Ctrl+F9] 보기 토글 | [Ctrl+F10] 편집 모드")
+            painter.drawText(10, 20, hint)
+            text_rect = painter.fontMetrics().boundingRect(hint).translated(10, 20).adjusted(-2, -2, 2, 2)
             
             # 테두리 그리기
             painter.setPen(QtGui.QPen(QtCore.Qt.yellow, 5))
             painter.drawRect(0, 0, self.width()-1, self.height()-1)
+            painter.end()
+            rect = self.rect()
+            area = QtGui.QRegion(rect).subtracted(QtGui.QRegion(rect.adjusted(4, 4, -4, -4)))
+            self.decorations = (pixmap, area.united(QtGui.QRegion(text_rect)), (size, ratio))
+        return self.decorations[:2]
+
+    def draw_hud(self, painter, top):
+        # 성능 측정 요약 (단축키 안내 아래), 이 창이 있는 모니터 워커 기준
+        worker = self.manager.worker_for(self.key)
+        if worker is None:
+            return
+        lines = worker.telemetry.hud_lines(Config.REFRESH_RATE)
+        regions, groups, pixels = worker.region_summary()
+        lines.append(f"영역 {regions}개 / 묶음 {groups}개 | 처리 {pixels / 1e6:.2f} MP")
+        metrics = painter.fontMetrics()
+        line_h = metrics.height()
+        width = max(metrics.horizontalAdvance(line) for line in lines) + 10
+        self.hud_rect = QtCore.QRect(5, top - metrics.ascent() - 3, width, line_h * len(lines) + 6)
+        painter.fillRect(self.hud_rect, QtGui.QColor(0, 0, 0, 160))
+        painter.setPen(QtGui.QPen(QtCore.Qt.white))
+        for i, line in enumerate(lines):
+            painter.drawText(10, top + i * line_h, line)
+
+    def refresh_hud(self):
+        if Config.SHOW_HUD and self.is_visible:
+            self.update()
+
+    def get_color_table(self, key):
+        if self.color_table_key != key:
+            (r, g, b), a = key
+            self.color_table = [QtGui.qRgba(0, 0, 0, 0)] + [QtGui.qRgba(r, g, b, a)] * 255
+            self.color_table_key = key
+        return self.color_table
+
+    def get_edge_pen(self, key, thickness):
+        if self.edge_pen_key != (key, thickness):
+            # 벡터 프레임은 파이프라인을 불러온 뒤에만 오므로 여기서 import 해도 비용 없음
+            from edge_vector import edge_pen
+            self.edge_pen = edge_pen(key, thickness)
+            self.edge_pen_key = (key, thickness)
+        return self.edge_pen
 
     def get_resize_edge(self, pos):
         rect = self.rect()
@@ -619,6 +995,7 @@ class OverlayWindow(QtWidgets.QMainWindow):
 
     def mousePressEvent(self, event):
         if not self.is_interactive: return
+        self.manager.active_window = self # 윈도우 선택 등은 마지막으로 조작한 창에 적용
         if event.button() == QtCore.Qt.LeftButton:
             self.resize_edge = self.get_resize_edge(event.pos())
             if self.resize_edge == 0:
@@ -664,14 +1041,10 @@ class OverlayWindow(QtWidgets.QMainWindow):
         self.drag_pos = None
         self.resize_edge = None
 
-    def perform_auto_adjust(self):
-        # 워커에게 1회성 자동 조절 요청
-        self.worker.trigger_auto_adjust()
-
 def main():
     app = QtWidgets.QApplication(sys.argv)
-    window = OverlayWindow()
-    window.show()
+    manager = OverlayManager()
+    manager.add_window()
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
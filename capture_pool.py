@@ -0,0 +1,78 @@
+# 캡처 소스 풀 (Capture Backend Pool)
+# 출력(모니터) 인덱스별로 캡처 소스를 보관해 다시 사용한다.
+# 창을 모니터 경계에서 왔다 갔다 움직이면 워커가 생겼다 사라지는데, 그때마다 카메라를 새로 만들지 않도록
+# 반납된 소스를 잠시 유지하고 (최근 사용 순), 유휴 시간이 지나거나 개수를 넘으면 해제한다.
+# 소스는 FrameSource 형태 (width / height / grab / release) 이면 무엇이든 가능 -> factory 로 가짜 소스 주입 가능.
+import threading
+import time
+from collections import OrderedDict
+
+from frame_sources import DXCamSource
+
+
+class CapturePool:
+    # factory(출력 인덱스) -> 소스, max_idle: 보관할 유휴 소스 최대 수 (0 = 반납 즉시 해제)
+    # idle_timeout: 이 시간 (초) 넘게 쓰이지 않은 소스는 evict() 때 해제
+    def __init__(self, factory=DXCamSource, max_idle=2, idle_timeout=30.0, clock=time.monotonic):
+        self.factory = factory
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.idle = OrderedDict() # 출력 인덱스 -> (소스, 반납 시각), 오래된 것부터
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, output_idx):
+        # 보관 중이면 바로 돌려주고, 없으면 새로 만듦 (호출한 스레드에서 생성, 실패하면 예외)
+        with self.lock:
+            entry = self.idle.pop(output_idx, None)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        return self.factory(output_idx)
+
+    def release(self, output_idx, source):
+        # 워커가 다 쓴 소스 반납 (같은 인덱스에 이미 보관 중인 소스가 있으면 그쪽을 해제)
+        evicted = []
+        with self.lock:
+            old = self.idle.pop(output_idx, None)
+            if old is not None:
+                evicted.append(old[0])
+            self.idle[output_idx] = (source, self.clock())
+            while len(self.idle) > self.max_idle:
+                evicted.append(self.idle.popitem(last=False)[1][0])
+            self.evictions += len(evicted)
+        self._release(evicted)
+
+    def evict(self, now=None):
+        # 유휴 시간이 지난 소스 해제 (주기적으로 호출), 해제한 수 반환
+        now = self.clock() if now is None else now
+        with self.lock:
+            expired = [idx for idx, (_, released) in self.idle.items()
+                       if now - released >= self.idle_timeout]
+            evicted = [self.idle.pop(idx)[0] for idx in expired]
+            self.evictions += len(evicted)
+        self._release(evicted)
+        return len(evicted)
+
+    def _release(self, sources):
+        # 해제는 잠금 밖에서 (카메라 해제가 느릴 수 있음)
+        for source in sources:
+            try:
+                source.release()
+            except Exception as e:
+                print(f"CapturePool: 캡처 소스 해제 실패: {e}")
+
+    def stats(self):
+        with self.lock:
+            return {"idle": list(self.idle), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    def close(self):
+        with self.lock:
+            evicted = [source for source, _ in self.idle.values()]
+            self.idle.clear()
+        self._release(evicted)
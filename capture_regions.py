@@ -0,0 +1,186 @@
+# 여러 영역 공유 캡처 (Shared Capture for Multiple Regions)
+# 한 모니터의 여러 오버레이 영역을 캡처 한 번으로 처리한다.
+#   - 모든 영역을 감싸는 사각형을 틱마다 한 번만 grab
+#   - 겹치는 영역은 합친 사각형에서 엣지 파이프라인을 한 번, 나머지는 영역별로 한 번
+# 처리 비용은 창 개수가 아니라 실제로 처리하는 픽셀 수에 비례한다.
+# Qt 비의존: 캡처 워커와 벤치마크가 함께 사용.
+import time
+
+from edge_engine import STAGES, EdgeEngine
+
+# 영역: (x, y, w, h) 모니터 로컬 좌표
+
+
+def clamp_region(region, width, height):
+    # 모니터 밖으로 나간 부분을 잘라냄 (남는 부분이 없으면 None)
+    x, y, w, h = region
+    x0, y0 = max(0, x), max(0, y)
+    x1, y1 = min(width, x + w), min(height, y + h)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def union_region(a, b):
+    x0, y0 = min(a[0], b[0]), min(a[1], b[1])
+    x1, y1 = max(a[0] + a[2], b[0] + b[2]), max(a[1] + a[3], b[1] + b[3])
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def overlaps(a, b):
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2]
+            and a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def group_regions(regions):
+    # {id: 영역} -> [(합친 영역, (id, ...)), ...]
+    # 겹치는 두 묶음은 합친 사각형의 넓이가 따로 처리할 때의 넓이 합 이하일 때만 합침
+    # (대각선으로 살짝 걸친 두 창을 합치면 빈 공간까지 처리하게 되므로)
+    groups = [(region, (key,)) for key, region in sorted(regions.items())]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                (a, ids_a), (b, ids_b) = groups[i], groups[j]
+                if not overlaps(a, b):
+                    continue
+                union = union_region(a, b)
+                if union[2] * union[3] <= a[2] * a[3] + b[2] * b[3]:
+                    groups[i] = (union, ids_a + ids_b)
+                    del groups[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return groups
+
+
+class RegionGroup:
+    # 엣지 파이프라인 하나를 공유하는 영역 묶음
+    def __init__(self, store):
+        self.engine = EdgeEngine(store)
+        self.region = None
+        self.members = {} # id -> 엣지 맵 안의 위치 (y0, y1, x0, x1)
+        self.changed = False
+
+    def assign(self, region, ids, regions):
+        self.region = region
+        gx, gy = region[0], region[1]
+        self.members = {}
+        for key in ids:
+            x, y, w, h = regions[key]
+            self.members[key] = (y - gy, y - gy + h, x - gx, x - gx + w)
+
+
+class RegionCapture:
+    # 한 모니터(소스)의 여러 영역 처리: update() 한 번 = grab 한 번 + 묶음별 파이프라인
+    def __init__(self, store):
+        self.store = store
+        self.regions = {}   # id -> 영역 (GUI 가 바꾸면 다음 틱에 반영)
+        self.groups = {}    # 묶음 id 튜플 -> RegionGroup
+        self.layout = None  # 마지막으로 묶음을 나눈 (영역, 모니터 크기)
+        self.quality_scale = 1.0
+        self.timings = dict.fromkeys(STAGES, 0.0)
+        self.pixels = 0     # 마지막 틱에 파이프라인이 처리한 픽셀 수
+        self.captured_at = 0.0  # 마지막 grab 완료 시각 (perf_counter)
+        self.recorder = None    # FrameRecorder: grab 한 프레임을 그대로 녹화
+
+    def set_region(self, key, region):
+        regions = dict(self.regions)
+        regions[key] = region
+        self.regions = regions  # 참조를 한 번에 교체 (워커는 틱마다 한 번 읽음)
+
+    def remove_region(self, key):
+        regions = dict(self.regions)
+        regions.pop(key, None)
+        self.regions = regions
+
+    def invalidate(self):
+        for group in self.groups.values():
+            group.engine.invalidate()
+
+    def trigger_auto_adjust(self):
+        for group in self.groups.values():
+            group.engine.trigger_auto_adjust()
+
+    def bounds(self, width, height):
+        # 모든 영역을 감싸는 사각형 (모니터 안으로 자름), 처리할 영역이 없으면 None
+        bounds = None
+        for region in self.regions.values():
+            region = clamp_region(region, width, height)
+            if region is not None:
+                bounds = region if bounds is None else union_region(bounds, region)
+        return bounds
+
+    def locate(self, key):
+        # 영역 id -> (묶음, 엣지 맵 안의 위치), 이번 틱에 처리되지 않았으면 (None, None)
+        for group in self.groups.values():
+            if key in group.members:
+                return group, group.members[key]
+        return None, None
+
+    def _regroup(self, regions, width, height):
+        clamped = {}
+        for key, region in regions.items():
+            region = clamp_region(region, width, height)
+            if region is not None:
+                clamped[key] = region
+        # 새 dict 로 만들어 교체 (GUI 스레드가 이전 dict 를 순회 중일 수 있음)
+        old = self.groups
+        groups = {}
+        for region, ids in group_regions(clamped):
+            # 같은 구성의 묶음은 엔진(이전 엣지 맵 / 버퍼) 재사용
+            group = old.get(ids) or RegionGroup(self.store)
+            group.assign(region, ids, clamped)
+            groups[ids] = group
+        self.groups = groups
+        for ids, group in old.items():
+            if ids not in groups:
+                group.engine.close()
+
+    def update(self, source, cfg=None):
+        # 새 프레임이 없으면 None, 있으면 변경된 묶음이 있는지 여부
+        regions = self.regions
+        layout = (regions, source.width, source.height)
+        if layout != self.layout:
+            self._regroup(regions, source.width, source.height)
+            self.layout = layout
+        groups = list(self.groups.values())
+        if not groups:
+            return None
+
+        # 모든 묶음을 감싸는 사각형을 한 번만 캡처
+        bounds = groups[0].region
+        for group in groups[1:]:
+            bounds = union_region(bounds, group.region)
+        bx, by, bw, bh = bounds
+        frame = source.grab(region=(bx, by, bx + bw, by + bh))
+        self.captured_at = time.perf_counter()
+        if frame is None:
+            return None
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.write(frame, bounds, self.captured_at, cfg)
+
+        timings = self.timings
+        for name in timings:
+            timings[name] = 0.0
+        self.pixels = 0
+        changed = False
+        for group in groups:
+            x, y, w, h = group.region
+            engine = group.engine
+            engine.quality_scale = self.quality_scale
+            group.changed = engine.update(frame[y - by:y - by + h, x - bx:x - bx + w], cfg)
+            changed |= group.changed
+            self.pixels += w * h
+            for name, seconds in engine.timings.items():
+                timings[name] += seconds
+        return changed
+
+    def close(self):
+        for group in self.groups.values():
+            group.engine.close()
+        self.groups = {}
+        self.layout = None
@@ -0,0 +1,125 @@
+# 여러 모니터에 걸친 캡처 (Spanning Capture)
+# 오버레이 영역이 모니터 경계에 걸치면 겹치는 모니터들을 동시에 grab 해 가상 데스크톱 좌표로 이어 붙이고,
+# 엣지 검출은 이어 붙인 프레임 하나에서 한다 -> 경계에서도 블러 / 임계값 / 두께가 끊기지 않음.
+#   - 모니터마다 캡처는 하나 (출력 인덱스당 소스 하나)
+#   - 첫 부분은 호출한 스레드에서, 나머지는 스레드 풀에서 동시에 grab
+#     -> 늘어나는 지연은 grab 한 번 (가장 느린 모니터) + 이어 붙이는 복사
+#   - 영역이 한 모니터 안에 있으면 그 소스의 grab 결과를 그대로 돌려줌 (복사 없음)
+#   - 새 프레임이 없는 모니터 (dxcam: 화면 변화 없음 -> None) 는 마지막으로 받은 픽셀을 다시 사용
+#   - 모니터 사이 빈 공간 (크기 / 위치가 다른 배치) 은 검은색
+# 좌표: grab 영역 / width / height 는 모두 묶인 모니터들의 바운딩 박스 기준 (왼쪽 위 = origin)
+# Qt 비의존. 부분 소스는 FrameSource 형태면 무엇이든 가능 (벤치마크는 가짜 모니터 소스 사용)
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from frame_sources import FrameSource, open_source
+
+
+def span_outputs(outputs):
+    # 출력 인덱스 또는 ((출력 인덱스, (x, y) 가상 데스크톱 위치), ...) -> 정렬된 튜플
+    if isinstance(outputs, int):
+        return ((outputs, (0, 0)),)
+    return tuple(sorted((int(idx), (int(x), int(y))) for idx, (x, y) in outputs))
+
+
+def span_spec(outputs):
+    # 캡처 프로세스용 open_source 형식 ("dxcam:0" 또는 "span:dxcam:0@0,0;dxcam:1@1920,0")
+    if len(outputs) == 1:
+        return f"dxcam:{outputs[0][0]}"
+    return "span:" + ";".join(f"dxcam:{idx}@{x},{y}" for idx, (x, y) in outputs)
+
+
+class SpanSource(FrameSource):
+    # parts: [(출력 인덱스, 소스, (x, y) 가상 데스크톱 위치), ...]
+    # owned: release() 때 부분 소스도 해제 (캡처 프로세스), False 면 만든 쪽이 반납 (CapturePool)
+    def __init__(self, parts, owned=False):
+        if not parts:
+            raise ValueError("묶을 모니터가 없음")
+        ox = min(x for _, _, (x, _) in parts)
+        oy = min(y for _, _, (_, y) in parts)
+        self.origin = (ox, oy)
+        self.parts = [] # (출력 인덱스, 소스, (l, t, r, b) 바운딩 박스 기준)
+        for idx, source, (x, y) in parts:
+            self.parts.append((idx, source, (x - ox, y - oy, x - ox + source.width, y - oy + source.height)))
+        self.width = max(rect[2] for _, _, rect in self.parts)
+        self.height = max(rect[3] for _, _, rect in self.parts)
+        self.owned = owned
+        self.cache = {} # 출력 인덱스 -> (모니터 로컬 영역 (l, t, r, b), 마지막으로 받은 픽셀)
+        self.executor = None
+        if len(parts) > 1:
+            self.executor = ThreadPoolExecutor(len(parts) - 1, thread_name_prefix="span-grab")
+
+    def grab(self, region=None):
+        l, t, r, b = region if region is not None else (0, 0, self.width, self.height)
+        jobs = []   # (출력 인덱스, 소스, 모니터 로컬 영역, 결과 안의 위치 (y0, y1, x0, x1))
+        covered = 0
+        for idx, source, (x0, y0, x1, y1) in self.parts:
+            il, it, ir, ib = max(l, x0), max(t, y0), min(r, x1), min(b, y1)
+            if ir > il and ib > it:
+                jobs.append((idx, source, (il - x0, it - y0, ir - x0, ib - y0),
+                             (it - t, ib - t, il - l, ir - l)))
+                covered += (ir - il) * (ib - it)
+        if not jobs:
+            return None
+        area = (r - l) * (b - t)
+        if len(jobs) == 1 and covered == area:
+            return jobs[0][1].grab(region=jobs[0][2])
+
+        # 모니터별 grab 을 동시에 (dxcam 은 grab 중 GIL 을 놓음)
+        futures = [self.executor.submit(source.grab, region=local) for _, source, local, _ in jobs[1:]]
+        crops = [jobs[0][1].grab(region=jobs[0][2])] + [future.result() for future in futures]
+        fresh = False
+        for (idx, _, local, _), crop in zip(jobs, crops):
+            if crop is not None:
+                self.cache[idx] = (local, crop)
+                fresh = True
+        if not fresh:
+            return None
+
+        # 이어 붙이기 (매번 새 배열: 녹화 큐 등이 이전 프레임을 참조하고 있을 수 있음)
+        pieces = []
+        for idx, _, (ll, lt, lr, lb), rect in jobs:
+            cached = self.cache.get(idx)
+            if cached is None:
+                return None # 이 모니터의 픽셀을 아직 받지 못함 (화면이 바뀌면 받음)
+            (cl, ct, cr, cb), pixels = cached
+            if ll < cl or lt < ct or lr > cr or lb > cb:
+                return None # 영역이 바뀌었는데 이 모니터는 아직 새 프레임이 없음
+            pieces.append((rect, pixels[lt - ct:lb - ct, ll - cl:lr - cl]))
+        shape = (b - t, r - l) + pieces[0][1].shape[2:]
+        frame = np.empty(shape, np.uint8) if covered == area else np.zeros(shape, np.uint8)
+        for (y0, y1, x0, x1), pixels in pieces:
+            frame[y0:y1, x0:x1] = pixels
+        return frame
+
+    def rewind(self):
+        for _, source, _ in self.parts:
+            source.rewind()
+        self.cache = {}
+
+    def release(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.owned:
+            for _, source, _ in self.parts:
+                source.release()
+        self.parts = []
+        self.cache = {}
+
+
+def open_span(spec, width=1920, height=1080):
+    # "SPEC@X,Y;SPEC@X,Y;..." (예: "dxcam:0@0,0;dxcam:1@1920,0") -> 부분 소스를 소유하는 SpanSource
+    # SPEC 은 open_source 형식 (synthetic / video 등도 가능, width / height 는 부분 소스마다 적용)
+    parts = []
+    try:
+        for idx, item in enumerate(spec.split(";")):
+            inner, _, origin = item.rpartition("@")
+            x, y = (int(v) for v in origin.split(","))
+            parts.append((idx, open_source(inner, width, height), (x, y)))
+    except Exception:
+        for _, source, _ in parts:
+            source.release()
+        raise
+    return SpanSource(parts, owned=True)
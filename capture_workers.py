@@ -0,0 +1,562 @@
+# 캡처 워커 (Capture Workers)
+# 모니터별 캡처 / 엣지 처리 스레드와 GUI 로 전달하는 프레임.
+# NumPy / OpenCV / 엣지 파이프라인을 모두 불러오므로 Edge_Overlay 는 창을 먼저 띄운 뒤 백그라운드에서 import 한다.
+import threading
+import time
+
+from PyQt5 import QtCore, QtGui, sip
+
+from edge_config import config_store
+from capture_pool import CapturePool
+from capture_regions import RegionCapture
+from capture_span import SpanSource, span_outputs, span_spec
+from edge_engine import BufferRing
+from edge_processes import OUTPUT_KINDS, ProcessPipeline
+from edge_stream import StreamSet
+from edge_vector import contours_to_path
+from frame_recording import FrameRecorder
+from frame_scheduler import FrameScheduler
+from telemetry import Telemetry
+
+
+def merge_dirty(older, newer):
+    # 연속한 두 프레임의 변경 영역 합치기 (어느 한쪽이라도 전체면 전체)
+    if older is None or newer is None:
+        return None
+    return older + newer
+
+
+class EdgeFrame:
+    # 워커 -> GUI 로 전달되는 프레임 (링 버퍼 슬롯 + 슬롯 메모리를 참조하는 QImage)
+    # GUI 가 그린 뒤 release() 해야 워커가 슬롯을 다시 사용함
+    # 벡터 출력은 슬롯 / 이미지 없이 윤곽선 경로(path)만 전달
+    # target: 이 프레임을 그릴 영역(창) id, telemetry: 보낸 워커의 성능 측정
+    # 다중 프로세스 모드: slot = 출력 링 참조 (RingHold), buffer = QImage 가 참조하는 공유 메모리 뷰,
+    #   check = 덮어써지지 않았는지 확인, pin / unpin = 표시하는 동안 처리 프로세스가 슬롯을 덮어쓰지 않도록 잡기 / 풀기
+    # dirty: 이 영역에 이전에 보낸 프레임과 달라진 부분 [(y0, y1, x0, x1), ...], None = 전체 (창 부분 갱신용)
+    def __init__(self, slot, image, captured_at=0.0, path=None, target=None, telemetry=None,
+                 buffer=None, check=None, dirty=None, pin=None, unpin=None):
+        self.slot = slot
+        self.image = image
+        self.path = path
+        self.target = target
+        self.telemetry = telemetry
+        self.buffer = buffer
+        self.check = check
+        self.pin_slot = pin
+        self.unpin_slot = unpin
+        self.pinned = False
+        self.dirty = dirty
+        self.color_key = None # 마스크 프레임에 마지막으로 적용한 색상표
+        self.captured_at = captured_at # 캡처 시각 (perf_counter, 지연 측정용)
+        self.emitted_at = time.perf_counter()
+
+    def is_mask(self):
+        return self.image is not None and self.image.format() == QtGui.QImage.Format_Indexed8
+
+    def is_vector(self):
+        return self.path is not None
+
+    def intact(self):
+        return self.check is None or self.check()
+
+    def pin(self):
+        # 창에 표시하기 전에 호출: 슬롯을 잡음 (이미 덮어쓰기 시작했으면 False -> 그리지 말고 버림)
+        if self.pin_slot is None:
+            return True
+        self.pinned = self.pin_slot()
+        return self.pinned
+
+    def absorb(self, older):
+        # 화면에 그려지지 않고 건너뛴 이전 프레임의 변경 영역을 합침 (이 프레임은 그보다 이전 화면 기준으로 그려짐)
+        self.dirty = merge_dirty(older.dirty, self.dirty)
+
+    def release(self):
+        if self.pinned:
+            self.unpin_slot()
+            self.pinned = False
+        if self.slot is not None:
+            self.slot.release()
+            self.slot = None
+
+
+class FrameMailbox(QtCore.QObject):
+    # 워커 -> GUI 최신 프레임 우편함: 영역마다 한 칸, 새 프레임이 아직 가져가지 않은 프레임을 덮어씀 (버림으로 기록)
+    # GUI 가 밀려도 Qt 이벤트 큐에는 알림 하나만 쌓이고, 프레임은 영역당 하나만 남으므로 메모리 / 지연이 제한됨
+    sig_posted = QtCore.pyqtSignal(object) # 비어 있던 우편함에 프레임이 들어옴 (self), 가져갈 때까지 다시 알리지 않음
+
+    def __init__(self, telemetry, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self.lock = threading.Lock()
+        self.frames = {} # 영역 id -> EdgeFrame
+        self.notified = False
+
+    def post(self, frame):
+        with self.lock:
+            old = self.frames.get(frame.target)
+            self.frames[frame.target] = frame
+            notify = not self.notified
+            self.notified = True
+        if old is not None:
+            frame.absorb(old)
+            old.release()
+            self.telemetry.count("dropped")
+        if notify:
+            self.sig_posted.emit(self)
+
+    def take(self):
+        # GUI 스레드: 쌓인 최신 프레임을 모두 가져감
+        with self.lock:
+            frames, self.frames = self.frames, {}
+            self.notified = False
+        return list(frames.values())
+
+    def busy(self):
+        # 이전 알림을 GUI 가 아직 처리하지 않음 (GUI 포화) -> 워커는 이번 틱 처리를 건너뜀
+        return self.notified
+
+    def clear(self):
+        for frame in self.take():
+            frame.release()
+
+
+class RegionTarget:
+    # 워커가 영역(창)마다 유지하는 출력 상태
+    def __init__(self, key):
+        self.key = key
+        # 출력 버퍼 링 (복사 없는 전달, 크기 변경 시에만 재할당)
+        self.ring = BufferRing(3)
+        self.pending_render = False # 빈 슬롯이 없어 출력하지 못한 변경이 있음
+        self.last_color_key = None # RGBA 출력에 마지막으로 사용한 색상
+        self.shown = None # 마지막으로 보낸 프레임 (엔진, 위치, 출력 방식, 색상, serial) -> 다음 프레임의 변경 영역 계산
+
+
+class CaptureWorker(QtCore.QThread):
+    # 모니터 하나 (또는 영역이 걸친 모니터 묶음) 의 캡처 루프. 이 모니터들 위의 모든 영역을 틱마다 한 번의 grab 으로 처리
+    # 결과 프레임은 mailbox 로 전달 (영역별 최신 프레임만 유지)
+    sig_thresholds_changed = QtCore.pyqtSignal(int, int) # 자동 조절로 임계값이 실제로 바뀜 (min, max)
+    sig_ready = QtCore.pyqtSignal() # 카메라 준비 완료 (시작 시간 측정용)
+    
+    # outputs: 출력 인덱스 또는 ((출력 인덱스, (x, y) 가상 데스크톱 위치), ...)
+    #   여러 개면 모니터별 카메라를 동시에 grab 해 이어 붙임 (SpanSource), 영역 좌표는 묶음의 왼쪽 위 기준
+    # pool: 카메라를 빌리고 반납할 CapturePool (None 이면 이 워커 전용, 반납 즉시 해제)
+    def __init__(self, outputs=0, pool=None, parent=None):
+        super().__init__(parent)
+        self.running = True
+        self.paused = False
+        self.cam = None
+        self.outputs = span_outputs(outputs)
+        self.cameras = {} # 출력 인덱스 -> 풀에서 빌린 카메라
+        self.pool = pool if pool is not None else CapturePool(max_idle=0)
+        
+        # 영역별 엣지 파이프라인 (Qt 비의존, 겹치는 영역은 한 파이프라인 공유)
+        self.store = config_store
+        self.capture = RegionCapture(config_store)
+        self.targets = {} # 영역 id -> RegionTarget (GUI 가 바꾸면 참조를 통째로 교체)
+        
+        # 프레임 스케줄러 (절대 마감 시각 + 부하에 따른 품질 조절)
+        self.scheduler = FrameScheduler()
+        
+        # 성능 측정 (GUI 스레드도 큐 대기 / 그리기 시간을 기록)
+        self.telemetry = Telemetry()
+        self.mailbox = FrameMailbox(self.telemetry)
+        self.streams = StreamSet() # 외부 프로세스용 엣지 스트림 (Config.EDGE_STREAM)
+        
+        # 카메라는 run() 에서 풀에서 빌림 (새로 만들어야 해도 GUI 스레드를 막지 않도록)
+        self.pending_recording = None # 카메라 준비 전에 요청된 녹화 파일
+
+    def _init_camera(self):
+        # 모니터마다 카메라를 풀에서 빌림 (하나라도 실패하면 빌린 카메라는 반납)
+        try:
+            for idx, _ in self.outputs:
+                self.cameras[idx] = self.pool.acquire(idx)
+        except Exception as e:
+            print(f"CaptureWorker: DXCam 초기화 실패: {e}")
+            self._release_cameras()
+            return
+        if len(self.outputs) == 1:
+            self.cam = self.cameras[self.outputs[0][0]]
+        else:
+            self.cam = SpanSource([(idx, self.cameras[idx], origin) for idx, origin in self.outputs])
+
+    def _release_cameras(self):
+        # 카메라는 풀에 반납 (다른 워커가 같은 모니터로 다시 쓸 수 있음)
+        cam, self.cam = self.cam, None
+        if isinstance(cam, SpanSource):
+            cam.release()
+        cameras, self.cameras = self.cameras, {}
+        for idx, camera in cameras.items():
+            self.pool.release(idx, camera)
+
+    def set_region(self, key, region):
+        # 영역 (lx, ly, w, h) 추가 / 변경. 영역 크기가 바뀌면 버퍼 초기화는 엔진에서 처리
+        if key not in self.targets:
+            targets = dict(self.targets)
+            targets[key] = RegionTarget(key)
+            self.targets = targets
+        self.capture.set_region(key, region)
+
+    def remove_region(self, key):
+        self.capture.remove_region(key)
+        targets = dict(self.targets)
+        targets.pop(key, None)
+        self.targets = targets
+
+    def has_regions(self):
+        return bool(self.targets)
+
+    def trigger_auto_adjust(self):
+        self.capture.trigger_auto_adjust()
+
+    @property
+    def regions(self):
+        return self.capture.regions
+
+    def start_recording(self, path):
+        # 이 모니터에서 grab 한 프레임을 설정 버전 / 위치 / 시각과 함께 녹화
+        cam = self.cam
+        if cam is None:
+            # 카메라 준비 전 -> 준비되면 시작
+            self.pending_recording = path
+            return
+        if self.capture.recorder is not None:
+            return
+        try:
+            self.capture.recorder = FrameRecorder(path, cam.width, cam.height)
+        except OSError as e:
+            print(f"녹화 시작 실패: {e}")
+
+    def stop_recording(self):
+        self.pending_recording = None
+        recorder, self.capture.recorder = self.capture.recorder, None
+        if recorder is not None:
+            recorder.close()
+            print(f"녹화 저장: {recorder.path} ({recorder.frames} 프레임, 버림 {recorder.dropped})")
+
+    def region_summary(self):
+        # (영역 수, 묶음 수, 마지막 틱 처리 픽셀 수)
+        capture = self.capture
+        return len(capture.regions), len(capture.groups), capture.pixels
+
+    def quality_level(self):
+        return self.scheduler.level
+
+    def run(self):
+        self._init_camera()
+        if self.cam is not None:
+            self.sig_ready.emit()
+            if self.pending_recording:
+                self.start_recording(self.pending_recording)
+        scheduler = self.scheduler
+        telemetry = self.telemetry
+        capture = self.capture
+        while self.running:
+            loop_start = time.perf_counter()
+            # 이번 프레임 동안 사용할 설정 (GUI 가 바꿔도 다음 프레임부터 반영)
+            cfg = self.store.current
+            
+            cam = self.cam
+            if self.paused or cam is None or not self.targets:
+                # 재개 후 첫 프레임은 변화가 없어도 다시 출력
+                capture.invalidate()
+                scheduler.reset()
+                self.streams.beat()
+                self.msleep(100)
+                continue
+            if self.mailbox.busy() and not cfg.EDGE_STREAM:
+                # GUI 가 이전 프레임도 아직 가져가지 않음 -> 처리해도 버려지므로 건너뜀 (스트림 게시 중이면 계속 처리)
+                # (변경 감지는 마지막으로 처리한 프레임과 비교하므로 그 사이 변화도 다음 처리에 반영됨)
+                telemetry.count("gui_busy")
+                scheduler.wait_for_frame(cfg.REFRESH_RATE)
+                continue
+                
+            # 프레임 캡처 + 이미지 처리 (모든 영역을 감싸는 사각형 한 번 grab, 영역 묶음별 처리)
+            try:
+                # 부하가 높으면 스케줄러가 처리 배율을 낮춤
+                scheduler.adaptive = cfg.ADAPTIVE_QUALITY
+                capture.quality_scale = scheduler.scale
+                changed = capture.update(cam, cfg)
+                if changed is None:
+                    # 새 프레임 없음 (화면 변화 없음) -> 점진적으로 길게 대기
+                    self.streams.beat()
+                    scheduler.wait_for_frame(cfg.REFRESH_RATE)
+                    continue
+                telemetry.record("grab", capture.captured_at - loop_start)
+                telemetry.frame_processed(capture.timings, changed)
+                self._sync_thresholds(capture)
+                
+                targets = self.targets
+                for key, target in targets.items():
+                    group, rect = capture.locate(key)
+                    if group is None:
+                        continue
+                    engine = group.engine
+                    if cfg.EDGE_STREAM:
+                        self.streams.publish(cfg.EDGE_STREAM, key, engine, rect, cam.width * cam.height,
+                                             capture.captured_at, cfg.version, group.changed)
+                    # RGBA 출력은 색상 / 투명도가 바뀌면 다시 칠해야 함
+                    recolor = cfg.OUTPUT_MODE == "rgba" and engine.plan.color_key != target.last_color_key
+                    
+                    # 화면 변화 없음 -> 이전 결과 유지, 시그널 생략
+                    if group.changed or recolor or target.pending_render:
+                        self._emit_frame(target, engine, rect)
+                self.streams.retain(targets if cfg.EDGE_STREAM else ())
+                
+            except Exception as e:
+                print(f"이미지 처리 오류: {e}")
+                self.msleep(50)
+                continue
+
+            # 주사율 제어 (절대 마감 시각 기준 정밀 타이밍)
+            work_time = time.perf_counter() - loop_start
+            telemetry.record("process", work_time)
+            missed = scheduler.missed_deadlines
+            scheduler.frame_done(work_time, cfg.REFRESH_RATE)
+            if scheduler.missed_deadlines != missed:
+                telemetry.count("missed_deadlines", scheduler.missed_deadlines - missed)
+
+    def _sync_thresholds(self, capture):
+        # 자동 조절 값이 움직였을 때만 슬라이더 동기화 요청 (GUI 가 설정에 반영 후 게시)
+        # 묶음이 여럿이면 가장 넓은 묶음의 값을 설정에 반영 (묶음마다 게시하면 서로 덮어씀)
+        primary = None
+        for group in capture.groups.values():
+            if primary is None or group.region[2] * group.region[3] > primary.region[2] * primary.region[3]:
+                primary = group
+        for group in capture.groups.values():
+            engine = group.engine
+            if engine.thresholds_changed:
+                engine.thresholds_changed = False
+                if group is primary:
+                    self.sig_thresholds_changed.emit(engine.low, engine.high)
+
+    def _emit_frame(self, target, engine, rect):
+        # rect: 엣지 맵 안에서 이 영역의 위치 (y0, y1, x0, x1)
+        output = engine.output_kind(rect)
+        if output == "vector":
+            # 윤곽선 -> QPainterPath (워커에서 만들고 GUI 는 그리기만 함)
+            t0 = time.perf_counter()
+            path = contours_to_path(*engine.contours(rect))
+            target.pending_render = False
+            frame = EdgeFrame(None, None, self.capture.captured_at, path, target.key, self.telemetry)
+            target.shown = None
+            self.telemetry.record("handoff", frame.emitted_at - t0)
+            self.telemetry.record("vector", engine.timings["vector"])
+            self.telemetry.count("vector_frames")
+            self.mailbox.post(frame)
+            return
+
+        y0, y1, x0, x1 = rect
+        h_img, w_img = y1 - y0, x1 - x0
+        mask_mode = output == "mask"
+        shape = (h_img, w_img) if mask_mode else (h_img, w_img, 4)
+        slot = target.ring.acquire(shape)
+        if slot is None:
+            # GUI 가 아직 모든 슬롯을 사용 중 -> 이번 프레임은 건너뛰고 다음에 출력
+            target.pending_render = True
+            self.telemetry.count("dropped")
+            return
+        
+        # 슬롯에 마지막으로 그린 이후 바뀐 영역만 다시 칠함 (색상이 바뀌었으면 전체)
+        since = slot.serial
+        key = None
+        if not mask_mode:
+            key = engine.plan.color_key
+            if slot.color_key != key:
+                since = None
+            slot.color_key = key
+            target.last_color_key = key
+        if slot.source != (engine, rect):
+            # 슬롯이 다른 묶음(엔진) / 위치의 결과를 담고 있었음 -> 전체 다시 그림
+            since = None
+            slot.source = (engine, rect)
+        slot.serial = engine.render(slot.buffer, since, rect)
+        target.pending_render = False
+        # 창은 이전 프레임과 달라진 부분만 다시 그림
+        shown, source = target.shown, (engine, rect, output, key)
+        dirty = engine.dirty_since(shown[4], rect) if shown is not None and shown[:4] == source else None
+        target.shown = source + (slot.serial,)
+        
+        # QImage 는 슬롯 메모리를 그대로 참조 (복사 없음)
+        # GUI 가 release 하기 전까지 워커는 이 슬롯에 쓰지 않으므로 화면이 깨지지 않음
+        # 마스크는 쓰기 가능한 포인터로 감싸야 색상표 설정 시 복사(detach)가 일어나지 않음
+        t0 = time.perf_counter()
+        if mask_mode:
+            image = QtGui.QImage(sip.voidptr(slot.buffer.ctypes.data), w_img, h_img, w_img,
+                                 QtGui.QImage.Format_Indexed8)
+        else:
+            image = QtGui.QImage(slot.buffer.data, w_img, h_img, w_img * 4, QtGui.QImage.Format_RGBA8888)
+        frame = EdgeFrame(slot, image, self.capture.captured_at, target=target.key, telemetry=self.telemetry,
+                          dirty=dirty)
+        self.telemetry.record("handoff", frame.emitted_at - t0)
+        self.mailbox.post(frame)
+
+    def stop(self):
+        self.running = False
+        self.wait()
+        self.mailbox.clear()
+        self.streams.close()
+        self.stop_recording()
+        self.capture.close()
+        self._release_cameras()
+
+
+class ProcessCaptureWorker(QtCore.QThread):
+    # CaptureWorker 와 같은 인터페이스. 캡처 / 엣지 처리는 별도 프로세스 (edge_processes) 에서 실행하고
+    # 이 스레드는 알림만 받아 공유 메모리 슬롯을 QImage 로 감싸 GUI 에 전달 (복사 없음)
+    sig_thresholds_changed = QtCore.pyqtSignal(int, int)
+    sig_ready = QtCore.pyqtSignal() # 프로세스 시작 완료
+
+    POLL_INTERVAL = 0.02 # 알림 대기 최대 시간 (초), 설정 변경 전달 주기
+
+    # pool 은 CaptureWorker 와 인터페이스를 맞추기 위한 인자 (카메라는 캡처 프로세스가 직접 만들고 종료 시 해제)
+    def __init__(self, outputs=0, pool=None, parent=None):
+        super().__init__(parent)
+        self.running = True
+        self._paused = False
+        self.outputs = span_outputs(outputs)
+        self.store = config_store
+        self.regions = {}       # 영역 id -> 영역
+        self.ring_names = {}    # 영역 id -> 마지막으로 받은 출력 링 이름
+        self.lost = set()       # 받기 전에 덮어써진 프레임이 있는 영역 id (다음 프레임은 전체 갱신)
+        self.remote_stats = {}  # 처리 프로세스가 보낸 마지막 통계
+        # GUI 쪽 단계 (큐 대기 / 그리기 / e2e) 는 여기에 기록하고 처리 프로세스 단계는 합쳐서 보여줌
+        self.telemetry = Telemetry()
+        self.mailbox = FrameMailbox(self.telemetry)
+        # 프로세스는 run() 에서 시작 (그 전에 보낸 명령은 파이프에 쌓였다가 처리됨)
+        self.pipeline = ProcessPipeline(span_spec(self.outputs), start=False)
+
+    @property
+    def paused(self):
+        return self._paused
+
+    @paused.setter
+    def paused(self, paused):
+        self._paused = paused
+        self.pipeline.send("pause", paused)
+
+    def set_region(self, key, region):
+        if self.regions.get(key) != region:
+            regions = dict(self.regions)
+            regions[key] = region
+            self.regions = regions
+            self.pipeline.send("region", key, region)
+
+    def remove_region(self, key):
+        regions = dict(self.regions)
+        regions.pop(key, None)
+        self.regions = regions
+        self.pipeline.send("remove", key)
+
+    def has_regions(self):
+        return bool(self.regions)
+
+    def trigger_auto_adjust(self):
+        self.pipeline.send("auto")
+
+    def start_recording(self, path):
+        print("다중 프로세스 모드에서는 녹화를 지원하지 않음")
+
+    def stop_recording(self):
+        pass
+
+    def region_summary(self):
+        return self.remote_stats.get("regions", (len(self.regions), 0, 0))
+
+    def quality_level(self):
+        return self.remote_stats.get("quality_level", 0)
+
+    def run(self):
+        pipeline = self.pipeline
+        pipeline.start()
+        self.sig_ready.emit()
+        version = None
+        busy = False
+        while self.running:
+            # 게시된 설정이 바뀌면 처리 프로세스에 스냅샷 전달
+            cfg = self.store.current
+            if cfg.version != version:
+                version = cfg.version
+                values = cfg._asdict()
+                del values["version"]
+                pipeline.send("config", values)
+            # GUI 포화 여부가 바뀌면 처리 프로세스에 알림 (포화 중에는 처리를 건너뜀)
+            if self.mailbox.busy() != busy:
+                busy = not busy
+                pipeline.send("busy", busy)
+
+            if not pipeline.poll(self.POLL_INTERVAL):
+                continue
+            # 밀린 알림은 영역별 최신 프레임만 남김
+            latest = {}
+            try:
+                while pipeline.poll():
+                    message = pipeline.recv()
+                    kind = message[0]
+                    if kind in ("frame", "vector"):
+                        older = latest.get(message[1])
+                        if kind == "frame" and older is not None:
+                            # 건너뛴 알림의 변경 영역도 포함 (벡터 다음이면 전체)
+                            dirty = older[5] if older[0] == "frame" else None
+                            message = message[:5] + (merge_dirty(dirty, message[5]),)
+                        latest[message[1]] = message
+                    elif kind == "thresholds":
+                        self.sig_thresholds_changed.emit(message[1], message[2])
+                    elif kind == "stats":
+                        self.remote_stats = message[1]
+                        self.telemetry.set_remote(message[1])
+            except (EOFError, OSError):
+                print("ProcessCaptureWorker: 처리 프로세스 연결 끊김")
+                break
+            for message in latest.values():
+                if message[1] in self.regions:
+                    self._emit_frame(message)
+
+    def _emit_frame(self, message):
+        t0 = time.perf_counter()
+        if message[0] == "vector":
+            _, key, points, counts, captured_ns = message
+            path = contours_to_path(points, counts)
+            frame = EdgeFrame(None, None, captured_ns / 1e9, path, key, self.telemetry)
+            self.telemetry.record("handoff", frame.emitted_at - t0)
+            self.telemetry.count("vector_frames")
+            self.mailbox.post(frame)
+            return
+
+        _, key, name, index, seq, dirty = message
+        if self.ring_names.get(key, name) != name:
+            # 처리 프로세스가 더 큰 링으로 교체함 (이전 링을 참조하는 프레임이 남아 있으면 그 release 때 닫힘)
+            self.pipeline.forget(self.ring_names[key])
+        self.ring_names[key] = name
+        ring = self.pipeline.attach(name)
+        slot = ring.read(index)
+        if slot is None or slot[1] != seq:
+            # 받기 전에 이미 덮어써짐 -> 더 새로운 알림이 곧 도착
+            self.telemetry.count("dropped")
+            self.lost.add(key)
+            return
+        if key in self.lost:
+            self.lost.discard(key)
+            dirty = None
+        view = slot[2]
+        captured_ns, kind = slot[3][:2]
+        h_img, w_img = view.shape[:2]
+        # 마스크는 쓰기 가능한 포인터로 감싸야 색상표 설정 시 복사(detach)가 일어나지 않음
+        if OUTPUT_KINDS[kind] == "mask":
+            image = QtGui.QImage(sip.voidptr(view.ctypes.data), w_img, h_img, w_img,
+                                 QtGui.QImage.Format_Indexed8)
+        else:
+            image = QtGui.QImage(sip.voidptr(view.ctypes.data), w_img, h_img, w_img * 4,
+                                 QtGui.QImage.Format_RGBA8888)
+        # 프레임을 release 할 때까지 링을 잡아 둠 (그 사이 링이 교체되어도 닫지 않음)
+        frame = EdgeFrame(self.pipeline.hold(name), image, captured_ns / 1e9, target=key,
+                          telemetry=self.telemetry, buffer=view, check=lambda: ring.valid(index, seq),
+                          dirty=dirty, pin=lambda: ring.pin(index, seq), unpin=lambda: ring.unpin(index))
+        self.telemetry.record("handoff", frame.emitted_at - t0)
+        self.mailbox.post(frame)
+
+    def stop(self):
+        self.running = False
+        self.wait()
+        self.mailbox.clear()
+        self.pipeline.stop()
@@ -0,0 +1,328 @@
+# 일괄 처리 (Offline Batch)
+# 동영상 / 이미지 폴더에 오버레이와 같은 엣지 처리 (임계값, 자동 조절, 두께, 색상, 투명도) 를 적용해
+# RGBA PNG 또는 알파 동영상으로 저장한다. 에셋 미리 만들기 / 설정 검증용.
+#   python edge_batch.py clip.mp4 --out edges/                -> edges/frame_000000.png ...
+#   python edge_batch.py shots/ --out edges/ --settings edge_stats_20240101_120000_m0.json
+#   python edge_batch.py clip.mp4 --out edges.mov --workers 8 --set EDGE_THICKNESS=2 --auto
+# 프레임은 프로세스 풀에 순서대로 나눠 주고 (진행 중 프레임 수 제한 -> 입력 길이와 관계없이 메모리 일정),
+# 결과도 입력 순서대로 쓴다.
+#   - 프레임마다 독립 처리: 이전 프레임에 의존하는 기능 (변경 감지, 이동 재사용, 목표 밀도 추종) 은 끄고
+#     자동 조절은 프레임마다 즉시 계산 -> 작업 프로세스 수와 관계없이 같은 결과
+#   - 픽셀은 공유 메모리 슬롯으로 주고받고 Pipe 로는 작은 메시지만 보냄, 이미지 폴더는 작업 프로세스가 직접 읽음
+#   - PNG 는 작업 프로세스가 직접 저장, 동영상은 작업 프로세스가 인코더 입력 형식으로 만들어 두면 주 프로세스가 씀
+# 알파 동영상: .mov (QuickTime RLE) / .webm (VP9) / .mkv (FFV1) 은 ffmpeg 필요
+#   .mp4 / .avi 는 OpenCV 로 색상 (위) + 알파 매트 (아래) 를 세로로 쌓은 동영상 (이 코덱들은 알파 채널이 없음)
+# Qt 비의존.
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from edge_config import SETTINGS, Config, ConfigStore
+from edge_engine import EdgeEngine
+from frame_sources import RESOLUTIONS, ImageDirSource, SyntheticSource, VideoFileSource
+from shm_ring import SharedRing
+
+FFMPEG_CODECS = {
+    ".mov": ("-c:v", "qtrle", "-pix_fmt", "argb"),
+    ".webm": ("-c:v", "libvpx-vp9", "-pix_fmt", "yuva420p", "-b:v", "0", "-crf", "30"),
+    ".mkv": ("-c:v", "ffv1", "-pix_fmt", "bgra"),
+}
+STACKED_CODECS = {".mp4": "mp4v", ".avi": "MJPG"}
+QUEUE_PER_WORKER = 2    # 작업 프로세스당 진행 중 프레임 수 (메모리 상한 = 슬롯 수 x 프레임 크기)
+REPORT_INTERVAL = 1.0   # 진행 상황 출력 주기 (초)
+
+# 프레임마다 독립 처리하도록 덮어쓰는 설정 (이전 프레임 결과에 의존하는 기능 / 실시간 품질 조절)
+BATCH_OVERRIDES = {"CHANGE_DETECT": False, "SCROLL_REUSE": False, "AUTO_TARGET_DENSITY": 0.0,
+                   "ADAPTIVE_QUALITY": False, "WORKER_THREADS": 0}
+
+
+def parse_value(text, current):
+    # 기본값 형식에 맞춰 변환 (bool: 1 / 0 / true / false, 색상: R,G,B)
+    if isinstance(current, bool):
+        return text.lower() in ("1", "true", "yes", "on")
+    if isinstance(current, (tuple, list)):
+        return tuple(int(v) for v in text.split(","))
+    return type(current)(text)
+
+
+def load_settings(path=None, overrides=()):
+    # 현재 Config <- JSON 파일 (edge_stats 의 "config" 또는 {설정 이름: 값}) <- "NAME=VALUE" 목록
+    settings = {name: getattr(Config, name) for name in SETTINGS}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data = data.get("config", data)
+        settings.update((name, value) for name, value in data.items() if name in SETTINGS)
+    for item in overrides:
+        name, _, text = item.partition("=")
+        if name not in SETTINGS:
+            raise ValueError(f"알 수 없는 설정: {name}")
+        settings[name] = parse_value(text, settings[name])
+    settings["EDGE_COLOR"] = tuple(settings["EDGE_COLOR"])
+    settings.update(BATCH_OVERRIDES)
+    return settings
+
+
+class VideoOutput:
+    # 알파 동영상 쓰기. format: "rgba" (ffmpeg 에 RGBA 그대로) / "stacked" (BGR, 색상 위 + 알파 아래)
+    # shape: write() 에 넘길 프레임 모양 (작업 프로세스가 이 모양으로 출력 링 슬롯에 씀)
+    def __init__(self, path, width, height, fps):
+        ext = os.path.splitext(path)[1].lower()
+        self.path = path
+        self.process = self.writer = None
+        if ext in FFMPEG_CODECS:
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise IOError(f"{ext} 출력에는 ffmpeg 필요 (PATH 에 없음): .mp4 / .avi (알파 세로 쌓기) 또는 PNG 사용")
+            self.format, self.shape = "rgba", (height, width, 4)
+            self.process = subprocess.Popen(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{width}x{height}", "-r", f"{fps:g}", "-i", "-", *FFMPEG_CODECS[ext], path],
+                stdin=subprocess.PIPE)
+        elif ext in STACKED_CODECS:
+            self.format, self.shape = "stacked", (height * 2, width, 3)
+            self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*STACKED_CODECS[ext]), fps,
+                                          (width, height * 2))
+            if not self.writer.isOpened():
+                raise IOError(f"동영상을 만들 수 없음: {path}")
+        else:
+            raise ValueError(f"지원하지 않는 동영상 형식: {ext}")
+
+    def write(self, frame):
+        if self.process is not None:
+            self.process.stdin.write(memoryview(frame).cast("B"))
+        else:
+            self.writer.write(frame)
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait() != 0:
+                print(f"ffmpeg 인코딩 실패 (종료 코드 {self.process.returncode}): {self.path}")
+            self.process = None
+        if self.writer is not None:
+            self.writer.release()
+            self.writer = None
+
+
+# 작업 프로세스 상태 (프로세스마다 하나: 엔진, 입력 / 출력 링, 출력 형식, 동영상 프레임 크기)
+_worker = {}
+
+
+def _init_worker(settings, input_name, output_name, output_format, size):
+    # 병렬화는 프로세스 단위 (OpenCV 내부 스레드까지 쓰면 작업 프로세스끼리 코어를 나눠 가짐)
+    cv2.setNumThreads(1)
+    store = ConfigStore()
+    store.publish(**settings)
+    _worker.update(engine=EdgeEngine(store),
+                   input=SharedRing(input_name) if input_name else None,
+                   output=SharedRing(output_name) if output_name else None,
+                   format=output_format, size=size)
+
+
+def _process(index, source, slot, shape, path):
+    # 프레임 하나 처리 -> (index, 엣지 픽셀 비율), 읽지 못한 이미지는 (index, None)
+    # source: 이미지 파일 경로 (None 이면 입력 링 slot 의 shape 프레임)
+    # path: 저장할 PNG 경로 (None 이면 출력 링 slot 에 동영상 프레임으로, 출력 형식이 None 이면 버림)
+    state = _worker
+    if source is None:
+        frame = state["input"].view(slot, shape)
+    else:
+        frame = cv2.imread(source, cv2.IMREAD_COLOR)
+        if frame is None:
+            return index, None
+    output_format = state["format"]
+    if path is None and output_format is not None and frame.shape[1::-1] != state["size"]:
+        # 동영상은 모든 프레임이 첫 프레임 크기여야 함
+        frame = cv2.resize(frame, state["size"], interpolation=cv2.INTER_AREA)
+
+    engine = state["engine"]
+    engine.invalidate()
+    if engine.store.current.REALTIME_AUTO:
+        engine.trigger_auto_adjust()
+    engine.update(frame)
+    edges = engine.edges
+    density = cv2.countNonZero(edges) / float(edges.size)
+    h, w = edges.shape
+    ws = engine.workspace
+    if path is None and output_format == "rgba":
+        engine.render(state["output"].view(slot, (h, w, 4)))
+        return index, density
+    rgba = ws.get("batch_rgba", (h, w, 4))
+    engine.render(rgba)
+    if path is not None:
+        bgra = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGRA, dst=ws.get("batch_bgra", (h, w, 4)))
+        if not cv2.imwrite(path, bgra):
+            raise IOError(f"저장 실패: {path}")
+    elif output_format == "stacked":
+        out = state["output"].view(slot, (h * 2, w, 3))
+        cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR, dst=out[:h])
+        alpha = cv2.extractChannel(rgba, 3, dst=ws.get("batch_alpha", (h, w)))
+        cv2.cvtColor(alpha, cv2.COLOR_GRAY2BGR, dst=out[h:])
+    return index, density
+
+
+def open_input(spec, resolution=(1920, 1080)):
+    # 입력 -> (소스, 이미지 파일 목록 또는 None, fps, 전체 프레임 수 또는 None)
+    # spec: 이미지 폴더, 동영상 파일, "synthetic[:kind]" (벤치마크용, 끝이 없으므로 프레임 수 지정 필요)
+    #       open_source 형식 "video:PATH" / "images:DIR" 도 허용
+    kind, _, arg = spec.partition(":")
+    if kind in ("video", "images"):
+        spec = arg
+    elif kind == "synthetic":
+        return SyntheticSource(*resolution, kind=arg or "ui"), None, 30.0, None
+    if os.path.isdir(spec):
+        source = ImageDirSource(spec, loop=False)
+        return source, source.files, 30.0, len(source.files)
+    source = VideoFileSource(spec, loop=False)
+    fps = source.cap.get(cv2.CAP_PROP_FPS) or 30.0
+    count = int(source.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    return source, None, fps, count if count > 0 else None
+
+
+def _frames(source, files, limit):
+    # (이미지 파일 경로, None) 또는 (None, 프레임) 을 입력 순서대로
+    if files is not None:
+        for path in files[:limit]:
+            yield path, None
+        return
+    count = 0
+    while limit is None or count < limit:
+        frame = source.grab()
+        if frame is None:
+            return
+        count += 1
+        yield None, frame
+
+
+def run_batch(spec, out, settings, workers=None, queue=None, frames=None, fps=None,
+              resolution=(1920, 1080), verbose=True):
+    # spec 의 프레임을 처리해 out 에 저장 (동영상 확장자면 동영상, 아니면 PNG 폴더, None 이면 저장하지 않음)
+    # workers: 작업 프로세스 수 (None = CPU 코어 수), queue: 진행 중 프레임 수 (None = 작업 프로세스당 2)
+    # frames: 처리할 최대 프레임 수, fps: 출력 동영상 fps (None = 입력 동영상 fps, 이미지는 30)
+    # 반환: {"frames", "skipped", "seconds", "fps", "density", "workers"}
+    workers = workers or os.cpu_count() or 1
+    queue = queue or workers * QUEUE_PER_WORKER
+    source, files, input_fps, total = open_input(spec, resolution)
+    if frames is not None:
+        total = frames if total is None else min(total, frames)
+    width, height = source.width, source.height
+    video = out is not None and os.path.splitext(out)[1].lower() in {**FFMPEG_CODECS, **STACKED_CODECS}
+    if out is not None and not video:
+        os.makedirs(out, exist_ok=True)
+
+    input_ring = output_ring = writer = pool = None
+    names = set()
+    pending = deque()   # (슬롯, AsyncResult) 입력 순서
+    done = skipped = 0
+    density = 0.0
+    started = time.perf_counter()
+    try:
+        if files is None:
+            input_ring = SharedRing(slots=queue, capacity=width * height * 3)
+        if video:
+            writer = VideoOutput(out, width, height, fps or input_fps)
+            output_ring = SharedRing(slots=queue, capacity=int(np.prod(writer.shape)))
+        ctx = multiprocessing.get_context("spawn")
+        pool = ctx.Pool(workers, _init_worker, (
+            settings, input_ring.name if input_ring else None, output_ring.name if output_ring else None,
+            writer.format if writer else None, (width, height)))
+        started = report = time.perf_counter()
+
+        def finish(slot, result):
+            nonlocal done, skipped, density, report
+            index, edge_density = result.get()
+            if edge_density is None:
+                skipped += 1
+                print(f"읽을 수 없는 이미지 (건너뜀): {files[index]}")
+                return
+            if writer is not None:
+                writer.write(output_ring.view(slot, writer.shape))
+            done += 1
+            density += edge_density
+            now = time.perf_counter()
+            if verbose and now >= report:
+                progress = f"{done}/{total}" if total else f"{done}"
+                print(f"{progress} 프레임 | {done / (now - started):.1f} fps")
+                report = now + REPORT_INTERVAL
+
+        for index, (path, frame) in enumerate(_frames(source, files, frames)):
+            if len(pending) >= queue:
+                finish(*pending.popleft())
+            slot = index % queue
+            shape = None
+            if frame is not None:
+                if frame.shape[:2] != (height, width):
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+                shape = frame.shape
+                np.copyto(input_ring.view(slot, shape), frame)
+            target = None
+            if out is not None and not video:
+                name = os.path.splitext(os.path.basename(path))[0] if path else f"frame_{index:06d}"
+                if name in names:
+                    name = f"{name}_{index:06d}"  # 확장자만 다른 같은 이름의 이미지
+                names.add(name)
+                target = os.path.join(out, name + ".png")
+            pending.append((slot, pool.apply_async(_process, (index, path, slot, shape, target))))
+        while pending:
+            finish(*pending.popleft())
+        pool.close()
+        pool.join()
+    finally:
+        if pool is not None:
+            pool.terminate()
+        if writer is not None:
+            writer.close()
+        for ring in (input_ring, output_ring):
+            if ring is not None:
+                ring.close()
+        source.release()
+    seconds = time.perf_counter() - started
+    return {"frames": done, "skipped": skipped, "seconds": seconds,
+            "fps": done / seconds if seconds > 0 else 0.0,
+            "density": density / done if done else 0.0, "workers": workers}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="동영상 / 이미지 폴더 엣지 일괄 처리")
+    parser.add_argument("input", help="동영상 파일, 이미지 폴더 또는 synthetic[:kind]")
+    parser.add_argument("--out", help="PNG 폴더 또는 동영상 (.mov / .webm / .mkv: ffmpeg, .mp4 / .avi: 알파 세로 쌓기), "
+                                      "생략하면 처리만 (속도 측정)")
+    parser.add_argument("--settings", help="설정 JSON (edge_stats_*.json 또는 {설정 이름: 값})")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="NAME=VALUE",
+                        help="설정 덮어쓰기 (예: EDGE_THICKNESS=2, EDGE_COLOR=255,0,0)")
+    parser.add_argument("--auto", action="store_true", help="프레임마다 자동 임계값 (REALTIME_AUTO=1 과 같음)")
+    parser.add_argument("--workers", type=int, help="작업 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--queue", type=int, help="진행 중 프레임 수 (기본: 작업 프로세스당 2)")
+    parser.add_argument("--frames", type=int, help="처리할 최대 프레임 수")
+    parser.add_argument("--fps", type=float, help="출력 동영상 fps (기본: 입력 동영상 fps, 이미지는 30)")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default="1080p", help="synthetic 입력 해상도")
+    args = parser.parse_args(argv)
+    if args.input.startswith("synthetic") and args.frames is None:
+        parser.error("synthetic 입력은 --frames 필요")
+    try:
+        settings = load_settings(args.settings, args.overrides + (["REALTIME_AUTO=1"] if args.auto else []))
+        result = run_batch(args.input, args.out, settings, args.workers, args.queue, args.frames, args.fps,
+                           RESOLUTIONS[args.resolution])
+    except (OSError, ValueError) as e:
+        print(f"일괄 처리 실패: {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 1
+    print(f"{result['frames']} 프레임 | {result['seconds']:.2f} s | {result['fps']:.1f} fps | "
+          f"작업 프로세스 {result['workers']} | 엣지 비율 평균 {result['density']:.2%}"
+          + (f" | 건너뜀 {result['skipped']}" if result["skipped"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1672 @@
+# 엣지 파이프라인 벤치마크 (Edge Pipeline Benchmark)
+# 캡처 장치 / 디스플레이 없이 EdgeEngine 의 단계별 지연 시간을 측정한다.
+#   python edge_bench.py stages --resolutions 720p 1080p 1440p 4k
+#   python edge_bench.py stages --source video:clip.mp4 --frames 300
+#   python edge_bench.py suite --out baseline.json
+#   python edge_bench.py compare baseline.json current.json --tolerance 0.1
+#   python edge_bench.py replay capture.edgerec --realtime
+import argparse
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from capture_pool import CapturePool
+from capture_regions import RegionCapture
+from capture_span import SpanSource
+from edge_batch import load_settings, run_batch
+from edge_config import SETTINGS, Config, ConfigStore
+from edge_engine import DETECTORS, DIRTY_HISTORY, STAGES, VECTOR_OUTPUTS, EdgeEngine
+from edge_processes import ProcessPipeline
+from edge_stream import EdgeStream, EdgeStreamReader, publish_main
+from frame_recording import FrameRecorder, ReplaySource
+from frame_sources import RESOLUTIONS, FrameSource, SyntheticSource, open_source
+
+SUITE_KINDS = SyntheticSource.KINDS
+SUITE_THICKNESS = (1, 2, 3, 4, 5)
+SUITE_OUTPUTS = ("rgba", "mask", "vector", "auto")
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q)) * 1000.0 if values else 0.0
+
+
+def summarize(samples):
+    # {stage: [sec, ...]} -> {stage: {"mean": ms, "p50": ms, "p95": ms}}
+    return {
+        name: {
+            "mean": float(np.mean(values)) * 1000.0,
+            "p50": percentile_ms(values, 50),
+            "p95": percentile_ms(values, 95),
+        }
+        for name, values in samples.items()
+    }
+
+
+def apply_settings(args):
+    Config.EDGE_THICKNESS = args.thickness
+    Config.REALTIME_AUTO = args.auto
+    Config.CHANGE_DETECT = args.change_detect
+    Config.WORKER_THREADS = args.threads
+    Config.PROCESSING_SCALE = args.scale
+    Config.UPSCALE_METHOD = args.upscale
+    Config.EDGE_DETECTOR = args.detector
+    Config.BLUR_SIZE = args.blur
+
+
+def private_store(**changes):
+    # 현재 Config 를 복사한 전용 설정 저장소 (publish 해도 전역 Config 는 그대로)
+    source = type("BenchConfig", (), {name: getattr(Config, name) for name in SETTINGS})
+    store = ConfigStore(source)
+    if changes:
+        store.publish(**changes)
+    return store
+
+
+def apply_output(output):
+    # 벡터 / 자동 출력은 엣지 맵에 두께를 적용하지 않는 처리 계획을 씀 (PipelinePlan 참고)
+    Config.OUTPUT_MODE = output if output in VECTOR_OUTPUTS else "mask"
+
+
+def bench_stages(source_spec, width, height, frames, warmup, hold=1, output="rgba", source=None):
+    # hold: 같은 프레임을 연속으로 넣는 횟수 (정지 화면 시뮬레이션)
+    # source: 이미 열린 소스 재사용 (처음부터 재생, 해제하지 않음)
+    owned = source is None
+    if owned:
+        source = open_source(source_spec, width, height)
+    else:
+        source.rewind()
+    engine = EdgeEngine()
+    samples = {name: [] for name in STAGES + ("total",)}
+    unchanged = 0
+    frame = None
+    try:
+        for i in range(warmup + frames):
+            if i % hold == 0:
+                frame = source.grab()
+                if frame is None:
+                    break
+                if frame.shape[:2] != (height, width):
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+            t0 = time.perf_counter()
+            result = engine.process(frame, output)
+            total = time.perf_counter() - t0
+            if i < warmup:
+                continue
+            if result is None:
+                unchanged += 1
+            for name in STAGES:
+                samples[name].append(engine.timings[name])
+            samples["total"].append(total)
+    finally:
+        if owned:
+            source.release()
+    summary = summarize(samples)
+    summary["unchanged_frames"] = unchanged
+    return summary
+
+
+def print_table(title, summary):
+    print(f"\n== {title} ==")
+    print(f"{'stage':<10}{'mean':>10}{'p50':>10}{'p95':>10}  (ms)")
+    for name, s in summary.items():
+        if not isinstance(s, dict):
+            print(f"{name}: {s}")
+            continue
+        print(f"{name:<10}{s['mean']:>10.3f}{s['p50']:>10.3f}{s['p95']:>10.3f}")
+    total = summary.get("total")
+    if total and total["mean"] > 0:
+        print(f"-> {1000.0 / total['mean']:.1f} FPS (평균 기준)")
+
+
+def cmd_stages(args):
+    apply_settings(args)
+    apply_output(args.output)
+    results = {}
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        summary = bench_stages(args.source, width, height, args.frames, args.warmup,
+                               args.hold, args.output)
+        results[res] = summary
+        print_table(f"{res} ({width}x{height}) / {args.source} / {args.output}", summary)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+def cmd_tiles(args):
+    # 단일 처리 vs 밴드 병렬 처리 비교 (속도 + 경계 일치 여부)
+    apply_settings(args)
+    Config.CHANGE_DETECT = False
+    counts = [1] + [n for n in args.thread_counts if n > 1]
+    results = {}
+    failed = False
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        source = open_source(args.source, width, height)
+        frame = source.grab()
+        source.release()
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+        print(f"\n== {res} ({width}x{height}) ==")
+        reference = None
+        base_ms = None
+        results[res] = {}
+        for n in counts:
+            Config.WORKER_THREADS = n
+            engine = EdgeEngine()
+            engine.prepare()
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            times = []
+            for i in range(args.warmup + args.frames):
+                t0 = time.perf_counter()
+                edges = engine.detect_edges(gray)
+                if i >= args.warmup:
+                    times.append(time.perf_counter() - t0)
+            engine.close()
+            ms = float(np.mean(times)) * 1000.0
+            if reference is None:
+                reference, base_ms = edges, ms
+            mismatch = int(np.count_nonzero(edges != reference))
+            failed |= mismatch > 0
+            results[res][n] = {"mean_ms": ms, "speedup": base_ms / ms, "seam_mismatch_px": mismatch}
+            print(f"threads={n:<3} {ms:8.3f} ms  x{base_ms / ms:4.2f}  경계 불일치 {mismatch} px"
+                  f"  {'OK' if mismatch == 0 else 'FAIL'}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+def edge_fidelity(result, reference, tolerance):
+    # tolerance 픽셀 이내 일치 기준 정밀도 / 재현율 / F1
+    size = 2 * tolerance + 1
+    kernel = np.ones((size, size), np.uint8)
+    ref_n = cv2.countNonZero(reference)
+    res_n = cv2.countNonZero(result)
+    if ref_n == 0 or res_n == 0:
+        return {"precision": float(ref_n == res_n), "recall": float(ref_n == res_n), "f1": float(ref_n == res_n)}
+    precision = cv2.countNonZero(cv2.bitwise_and(result, cv2.dilate(reference, kernel))) / res_n
+    recall = cv2.countNonZero(cv2.bitwise_and(reference, cv2.dilate(result, kernel))) / ref_n
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def cmd_scales(args):
+    # 처리 배율별 지연 시간과 원본 해상도 대비 엣지 충실도
+    apply_settings(args)
+    Config.CHANGE_DETECT = False
+    results = {}
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        source = open_source(args.source, width, height)
+        frames = []
+        for _ in range(4):
+            frame = source.grab()
+            if frame is None:
+                break
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        source.release()
+
+        print(f"\n== {res} ({width}x{height}) / {args.source} / 확대: {args.upscale} ==")
+        print(f"{'scale':<8}{'mean ms':>10}{'speedup':>9}{'precision':>11}{'recall':>8}{'F1':>7}")
+        results[res] = {}
+        base_ms = None
+        references = None
+        for scale in args.scales:
+            Config.PROCESSING_SCALE = scale
+            engine = EdgeEngine()
+            engine.prepare()
+            times = []
+            outputs = []
+            for i in range(args.warmup + args.frames):
+                gray = frames[i % len(frames)]
+                t0 = time.perf_counter()
+                edges = engine.detect_edges(gray)
+                if i >= args.warmup:
+                    times.append(time.perf_counter() - t0)
+                if i < len(frames):
+                    outputs.append(edges.copy())
+            engine.close()
+            ms = float(np.mean(times)) * 1000.0
+            if references is None:
+                references, base_ms = outputs, ms
+            tolerance = max(1, int(np.ceil(1.0 / scale)) - 1)
+            scores = [edge_fidelity(o, r, tolerance) for o, r in zip(outputs, references)]
+            summary = {key: float(np.mean([sc[key] for sc in scores])) for key in ("precision", "recall", "f1")}
+            summary.update(mean_ms=ms, speedup=base_ms / ms, tolerance_px=tolerance)
+            results[res][str(scale)] = summary
+            print(f"{scale:<8}{ms:>10.3f}{base_ms / ms:>8.2f}x{summary['precision']:>11.3f}"
+                  f"{summary['recall']:>8.3f}{summary['f1']:>7.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+def cmd_detectors(args):
+    # 검출기 x 사전 블러별 엣지 검출 시간 / 엣지 밀도 / Canny (기본 블러) 대비 충실도
+    # 다른 검출기는 선이 굵으므로 충실도는 --tolerance 픽셀 이내 일치 기준 (재현율이 주 지표)
+    apply_settings(args)
+    Config.CHANGE_DETECT = False
+    results = {}
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        source = open_source(args.source, width, height)
+        frames = []
+        for _ in range(4):
+            frame = source.grab()
+            if frame is None:
+                break
+            if frame.shape[:2] != (height, width):
+                frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        source.release()
+
+        print(f"\n== {res} ({width}x{height}) / {args.source} / threads {args.threads} ==")
+        print(f"{'detector':<11}{'blur':>5}{'mean ms':>10}{'speedup':>9}{'density':>9}"
+              f"{'precision':>11}{'recall':>8}{'F1':>7}")
+        results[res] = {}
+        reference = ("canny", args.blur)
+        cases = [(d, b) for d in args.detectors for b in args.blurs]
+        cases = [reference] + [case for case in cases if case != reference]
+        references = base_ms = None
+        for detector, blur in cases:
+            Config.EDGE_DETECTOR, Config.BLUR_SIZE = detector, blur
+            engine = EdgeEngine()
+            engine.prepare()
+            times = []
+            outputs = []
+            for i in range(args.warmup + args.frames):
+                gray = frames[i % len(frames)]
+                t0 = time.perf_counter()
+                edges = engine.detect_edges(gray)
+                if i >= args.warmup:
+                    times.append(time.perf_counter() - t0)
+                if i < len(frames):
+                    outputs.append(edges.copy())
+            engine.close()
+            ms = float(np.mean(times)) * 1000.0
+            if references is None:
+                # 첫 항목 = 기준 (Canny, --blur)
+                references, base_ms = outputs, ms
+            name = f"{detector}/{blur}"
+            scores = [edge_fidelity(o, r, args.tolerance) for o, r in zip(outputs, references)]
+            summary = {key: float(np.mean([sc[key] for sc in scores])) for key in ("precision", "recall", "f1")}
+            density = float(np.mean([cv2.countNonZero(o) / o.size for o in outputs]))
+            summary.update(mean_ms=ms, speedup=base_ms / ms, density=density)
+            results[res][name] = summary
+            print(f"{detector:<11}{blur:>5}{ms:>10.3f}{base_ms / ms:>8.2f}x{density:>9.4f}"
+                  f"{summary['precision']:>11.3f}{summary['recall']:>8.3f}{summary['f1']:>7.3f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+ALLOC_SEQUENCES = ("cycle", "held", "box", "scroll")
+# 정상 상태 프레임은 화면 크기에 비례하는 버퍼를 하나도 새로 만들지 않아야 함
+# 프레임당 허용: 영역 목록 / 튜플 / 정수 같은 Python 객체뿐 (해상도와 무관한 고정량)
+ALLOC_SLACK = 8 * 1024
+# 밴드 병렬 처리 (WORKER_THREADS) 는 밴드마다 스레드 풀 작업 객체 (Future / 잠금) 몫을 더 허용
+ALLOC_BAND_SLACK = 2 * 1024
+# 프레임 N 개 동안 남는 메모리 (마지막 결과 제외) 허용: 프레임 수와 무관해야 함
+# 변경 이력 (DIRTY_HISTORY 프레임) 의 영역 튜플 개수가 프레임마다 달라 생기는 차이만큼
+ALLOC_GROWTH_SLACK = 4 * 1024
+# 이름 붙은 출력은 예외: 벡터 출력의 윤곽선 배열은 프레임마다 새로 만들어져 GUI 로 넘어감
+# -> 결과 크기 2 배 (findContours 윤곽선 목록 + 이어붙인 사본) + 윤곽선마다 배열 객체 하나까지 허용
+VECTOR_CONTOUR_BYTES = 256
+
+
+def alloc_frames(sequence, spec, width, height, box=48):
+    # 할당 검사용 프레임 함수: cycle = 서로 다른 4 프레임 반복 (전체 처리), held = 같은 프레임 (변화 없음),
+    # box = 고정 화면 위 움직이는 상자 (부분 처리), scroll = 스크롤 화면 (이동 재사용)
+    if sequence == "scroll":
+        return SyntheticSource(width, height, kind="scroll").grab
+    source = open_source(spec, width, height)
+    frames = [source.grab().copy() for _ in range(4 if sequence == "cycle" else 1)]
+    source.release()
+    if sequence == "box":
+        return MovingBoxSource(frames[0], box).grab
+    return itertools.cycle(frames).__next__
+
+
+def output_allowance(result):
+    # 이름 붙은 출력 (벡터 윤곽선) 이 프레임마다 새로 만드는 바이트 수, 비트맵 출력은 0
+    if not isinstance(result, tuple):
+        return 0
+    points, counts = result
+    return 2 * (points.nbytes + counts.nbytes) + VECTOR_CONTOUR_BYTES * len(counts)
+
+
+def alloc_check(sequence, output, spec, width, height, frames=30, warmup=5, store=None):
+    # 정상 상태 (워밍업 이후) 프레임의 할당 검사 (tracemalloc, NumPy / OpenCV 결과 배열도 집계됨)
+    # -> dict: peak = 출력을 뺀 프레임당 최대 할당 (allowed 이하), growth = 첫 프레임 이후 남은 메모리,
+    #    realloc = 버퍼 재할당 수
+    # store: 설정 저장소 (없으면 현재 Config). 워밍업은 변경 이력 (DIRTY_HISTORY) 이 다 찰 때까지는 함
+    grab = alloc_frames(sequence, spec, width, height)
+    engine = EdgeEngine(store)
+    for i in range(max(warmup, DIRTY_HISTORY + 1)):
+        engine.process(grab(), output)
+    allocations = engine.workspace.allocations
+
+    tracemalloc.start()
+    peak = 0
+    base = None
+    for i in range(frames):
+        frame = grab()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        result = engine.process(frame, output)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - start - output_allowance(result))
+        # 엔진이 마지막 벡터 결과를 캐시 (engine.vector) 하므로 남은 메모리에서 그 크기는 뺌
+        held = sum(a.nbytes for a in engine.vector[1:]) if engine.vector is not None else 0
+        del frame, result
+        if base is None:
+            # 첫 프레임이 남긴 객체 (이전 영역 목록 등) 는 다음 프레임이 교체 -> 그 뒤로는 늘지 않아야 함
+            base = tracemalloc.get_traced_memory()[0] - held
+    growth = tracemalloc.get_traced_memory()[0] - held - base
+    tracemalloc.stop()
+    realloc = engine.workspace.allocations - allocations
+    allowed = ALLOC_SLACK + (ALLOC_BAND_SLACK * engine.pool_size if engine.pool is not None else 0)
+    engine.close()
+    ok = peak <= allowed and growth <= ALLOC_GROWTH_SLACK and realloc == 0
+    return {"peak": peak, "allowed": allowed, "growth": growth, "realloc": realloc, "ok": ok}
+
+
+def cmd_alloc(args):
+    # 정상 상태 프레임의 메모리 할당 검사: 버퍼 재할당 0, 프레임마다 남는 메모리 0,
+    # 프레임당 할당은 Python 객체 여유 (ALLOC_SLACK, 밴드 병렬이면 밴드별 몫 추가) + 벡터 출력 결과뿐
+    # (같은 검사: test_edge_alloc.py)
+    apply_settings(args)
+    failed = False
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        for sequence in args.sequences:
+            for output in args.outputs:
+                apply_output(output)
+                result = alloc_check(sequence, output, args.source, width, height, args.frames, args.warmup)
+                failed |= not result["ok"]
+                print(f"{res:<6}{sequence:<7}{output:<7} 프레임당 최대 {result['peak'] / 1024:6.1f} KiB"
+                      f"  누적 {result['growth'] / 1024:6.1f} KiB  버퍼 재할당 {result['realloc']}"
+                      f"  (프레임 {width * height / 1024:.0f} KiB)  {'OK' if result['ok'] else 'FAIL'}")
+    return 1 if failed else 0
+
+
+def parse_thresholds(text):
+    low, high = text.split(":")
+    return int(low), int(high)
+
+
+def cmd_vector(args):
+    # 엣지 밀도별 출력 비용 비교: 비트맵 (마스크 -> QImage -> drawImage) vs 벡터 (윤곽선 -> QPainterPath -> drawPath)
+    # 화면 대신 같은 크기의 ARGB32 QImage 에 그려서 측정 (그리기 비용 포함)
+    try:
+        from PyQt5 import QtCore, QtGui
+        from edge_vector import contours_to_path, edge_pen
+    except ImportError as e:
+        print(f"벡터 벤치마크에는 PyQt5 가 필요합니다: {e}")
+        return 1
+    apply_settings(args)
+    Config.OUTPUT_MODE = "vector"
+    Config.VECTOR_EPSILON = args.epsilon
+    key = ((0, 255, 0), 255)
+    pen = edge_pen(key, args.thickness)
+    table = [QtGui.qRgba(0, 0, 0, 0)] + [QtGui.qRgba(0, 255, 0, 255)] * 255
+    rows = []
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        target = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        mask = np.empty((height, width), np.uint8)
+        print(f"\n== {res} ({width}x{height}) / 두께 {args.thickness} / epsilon {args.epsilon} ==")
+        print(f"{'kind':<9}{'canny':>9}{'density':>9}{'points':>9}{'bitmap ms':>11}{'vector ms':>11}  선택")
+        for kind, (low, high) in itertools.product(args.kinds, args.thresholds):
+            Config.CANNY_MIN, Config.CANNY_MAX = low, high
+            source = SyntheticSource(width, height, kind, count=args.distinct, seed=args.seed)
+            frames = [source.grab() for _ in range(args.distinct)]
+            engine = EdgeEngine()
+            bitmap, vector, densities, points = [], [], [], []
+            for i in range(args.warmup + args.frames):
+                engine.invalidate()
+                engine.update(frames[i % len(frames)])
+                target.fill(0)
+                painter = QtGui.QPainter(target)
+                t0 = time.perf_counter()
+                engine.render(mask)
+                image = QtGui.QImage(mask.data, width, height, width, QtGui.QImage.Format_Indexed8)
+                image.setColorTable(table)
+                painter.drawImage(0, 0, image)
+                t1 = time.perf_counter()
+                path = contours_to_path(*engine.contours())
+                painter.setPen(pen)
+                painter.setBrush(QtCore.Qt.NoBrush)
+                painter.drawPath(path)
+                t2 = time.perf_counter()
+                painter.end()
+                if i >= args.warmup:
+                    bitmap.append(t1 - t0)
+                    vector.append(t2 - t1)
+                    densities.append(cv2.countNonZero(engine.edges) / float(width * height))
+                    points.append(path.elementCount())
+            engine.close()
+            row = {"res": res, "kind": kind, "canny": [low, high], "density": float(np.mean(densities)),
+                   "points": float(np.mean(points)), "bitmap_ms": float(np.mean(bitmap)) * 1000.0,
+                   "vector_ms": float(np.mean(vector)) * 1000.0}
+            rows.append(row)
+            choice = "vector" if row["vector_ms"] < row["bitmap_ms"] else "bitmap"
+            print(f"{kind:<9}{low:>4}:{high:<4}{row['density']:>9.4f}{row['points']:>9.0f}"
+                  f"{row['bitmap_ms']:>11.3f}{row['vector_ms']:>11.3f}  {choice}")
+
+    # 벡터가 더 빠른 가장 높은 밀도 -> 자동 선택 경계 (VECTOR_MAX_DENSITY) 참고값
+    slowest = min((r["density"] for r in rows if r["vector_ms"] >= r["bitmap_ms"]), default=float("inf"))
+    faster = [r["density"] for r in rows if r["vector_ms"] < r["bitmap_ms"] and r["density"] < slowest]
+    if faster:
+        print(f"\n벡터가 빠른 밀도 범위: <= {max(faster):.4f} (현재 VECTOR_MAX_DENSITY = {Config.VECTOR_MAX_DENSITY})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+# 영역 배치 (화면 크기 대비 x, y, w, h 비율)
+REGION_LAYOUTS = {
+    "single": [(0.1, 0.1, 0.5, 0.5)],
+    "apart": [(0.0, 0.0, 0.3, 0.3), (0.65, 0.0, 0.3, 0.3), (0.3, 0.6, 0.3, 0.3)],
+    "overlap": [(0.1, 0.1, 0.4, 0.4), (0.3, 0.2, 0.4, 0.4), (0.2, 0.35, 0.4, 0.4)],
+    "stacked": [(0.1, 0.1, 0.5, 0.5)] * 3,
+}
+
+
+def cmd_regions(args):
+    # 여러 영역: 영역마다 캡처 / 파이프라인 (이전 방식) vs 모니터당 캡처 한 번 + 영역 묶음 처리
+    apply_settings(args)
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        source = open_source(args.source, width, height)
+        print(f"\n== {res} ({width}x{height}) / {args.source} ==")
+        print(f"{'layout':<9}{'regions':>8}{'separate ms':>13}{'shared ms':>11}{'speedup':>9}"
+              f"{'separate MP':>13}{'shared MP':>11}")
+        for name in args.layouts:
+            regions = {i: (int(x * width), int(y * height), int(w * width), int(h * height))
+                       for i, (x, y, w, h) in enumerate(REGION_LAYOUTS[name])}
+            separate = {key: RegionCapture(None) for key in regions}
+            for key, capture in separate.items():
+                capture.set_region(key, regions[key])
+            shared = RegionCapture(None)
+            for key, region in regions.items():
+                shared.set_region(key, region)
+
+            times = {"separate": [], "shared": []}
+            pixels = {"separate": 0, "shared": 0}
+            for i in range(args.warmup + args.frames):
+                t0 = time.perf_counter()
+                for capture in separate.values():
+                    capture.update(source)
+                t1 = time.perf_counter()
+                shared.update(source)
+                t2 = time.perf_counter()
+                if i >= args.warmup:
+                    times["separate"].append(t1 - t0)
+                    times["shared"].append(t2 - t1)
+            pixels["separate"] = sum(c.pixels for c in separate.values())
+            pixels["shared"] = shared.pixels
+            for capture in list(separate.values()) + [shared]:
+                capture.close()
+            sep, sh = (float(np.mean(times[k])) * 1000.0 for k in ("separate", "shared"))
+            print(f"{name:<9}{len(regions):>8}{sep:>13.3f}{sh:>11.3f}{sep / sh:>8.2f}x"
+                  f"{pixels['separate'] / 1e6:>13.2f}{pixels['shared'] / 1e6:>11.2f}")
+        source.release()
+    return 0
+
+
+def cmd_record(args):
+    # 캡처 장치 없이 녹화 파일 만들기 (합성 프레임 / 동영상 / 이미지를 원래 주사율 간격으로)
+    apply_settings(args)
+    width, height = RESOLUTIONS[args.resolutions[0]]
+    source = open_source(args.source, width, height)
+    region = (0, 0, source.width, source.height)
+    recorder = FrameRecorder(args.out, source.width, source.height)
+    store = ConfigStore()
+    start = time.perf_counter()
+    for i in range(args.frames):
+        frame = source.grab()
+        if frame is None:
+            break
+        recorder.write(frame, region, start + i / args.rate, store.current)
+        # 쓰기 스레드가 밀려 프레임을 버리거나 압축을 건너뛰지 않도록 대기 (파일 생성용이므로 시간 제약 없음)
+        while recorder.queue.qsize() > 2:
+            time.sleep(0.001)
+    recorder.close()
+    source.release()
+    print(f"{args.out}: {recorder.frames} 프레임, {recorder.bytes / 2**20:.1f} MiB"
+          f" (원본 {recorder.raw_bytes / 2**20:.1f} MiB, 압축 안 함 {recorder.unpacked}), 버림 {recorder.dropped}")
+    return 0
+
+
+def cmd_replay(args):
+    # 녹화 파일을 녹화 당시 설정 / 영역으로 재생하며 단계별 시간 측정
+    #   --realtime: 원래 캡처 간격대로 (처리가 늦으면 마감 초과), 기본은 제한 없이 (처리 성능만)
+    # 녹화 당시 설정은 전용 저장소에만 적용 (전역 Config 는 그대로)
+    source = ReplaySource(args.path, realtime=args.realtime, loop=False)
+    store = private_store()
+    capture = RegionCapture(store)
+    samples = {name: [] for name in STAGES + ("total",)}
+    version = None
+    late = 0
+    processed = 0
+    print(f"{args.path}: {len(source.records)} 프레임, {source.duration:.1f}s,"
+          f" 모니터 {source.width}x{source.height}, 설정 {len(source.configs)}개")
+    start = time.perf_counter()
+    while source.index < len(source.records):
+        record = source.records[source.index]
+        if args.recorded_config and record[3] != version:
+            version = record[3]
+            config = source.configs.get(version)
+            if config is not None:
+                store.publish(**config)
+        region = record[2]
+        if capture.regions.get(0) != region:
+            capture.set_region(0, region)
+        t0 = time.perf_counter()
+        changed = capture.update(source, store.current)
+        if changed is None:
+            # realtime: 다음 프레임 시각 전
+            time.sleep(0.0005)
+            continue
+        total = time.perf_counter() - t0
+        processed += 1
+        for name in STAGES:
+            samples[name].append(capture.timings[name])
+        samples["total"].append(total)
+        if args.realtime and source.index < len(source.records):
+            # 다음 프레임 캡처 시각까지 처리를 마치지 못함
+            if time.perf_counter() - source.started > source.records[source.index][4] / 1e9:
+                late += 1
+    elapsed = time.perf_counter() - start
+    capture.close()
+    source.release()
+    summary = summarize(samples)
+    print_table(f"replay {'realtime' if args.realtime else 'unthrottled'} / {processed} 프레임", summary)
+    print(f"경과 {elapsed:.2f}s ({processed / elapsed:.1f} FPS)"
+          + (f", 다음 프레임 전에 끝내지 못함 {late}" if args.realtime else ""))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+# 새 프로세스에서 import 순서대로 누적 시간 측정 후 첫 엣지 프레임까지 (JSON 한 줄 출력)
+STARTUP_PROBE = """
+import importlib, json, sys, time
+t0 = time.perf_counter()
+marks = {}
+for name in sys.argv[1].split(","):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        continue
+    marks[name] = time.perf_counter() - t0
+from edge_engine import EdgeEngine
+from frame_sources import SyntheticSource
+import numpy as np
+width, height = int(sys.argv[2]), int(sys.argv[3])
+source = SyntheticSource(width, height, count=1)
+marks["source"] = time.perf_counter() - t0
+engine = EdgeEngine()
+engine.update(source.grab())
+engine.render(np.empty((height, width), np.uint8))
+marks["first_frame"] = time.perf_counter() - t0
+print(json.dumps(marks))
+"""
+
+STARTUP_MODULES = ("numpy", "cv2", "edge_engine", "capture_regions", "PyQt5.QtWidgets", "capture_workers")
+
+
+def cmd_startup(args):
+    # 시작 시간: 새 프로세스에서 모듈별 import 누적 시간과 첫 엣지 프레임까지의 시간 (중앙값)
+    # GUI 는 Qt / win32 만 불러온 뒤 창을 띄우고, 나머지 (capture_workers 까지) 는 백그라운드에서 불러옴
+    here = os.path.dirname(os.path.abspath(__file__))
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        runs = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, "-c", STARTUP_PROBE, ",".join(args.modules), str(width), str(height)],
+                cwd=here, capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        print(f"\n== {res} ({width}x{height}) / {args.runs}회 중앙값 (프로세스 시작 후 누적) ==")
+        previous = 0.0
+        for name in runs[0]:
+            total = float(np.median([run[name] for run in runs if name in run])) * 1000.0
+            print(f"{name:<18}{total:>9.1f} ms  (+{total - previous:.1f})")
+            previous = total
+    return 0
+
+
+class FakeCamera(FrameSource):
+    # 캡처 풀 측정용 가짜 카메라: 만들 때 open_ms 만큼 걸리고 (dxcam.create 흉내) 생성 / 해제 횟수를 기록
+    opened = 0
+    released = 0
+
+    def __init__(self, output_idx, frame, open_ms):
+        time.sleep(open_ms / 1000.0)
+        FakeCamera.opened += 1
+        self.output_idx = output_idx
+        self.frame = frame
+        self.height, self.width = frame.shape[:2]
+
+    def grab(self, region=None):
+        if self.frame is None:
+            raise RuntimeError("해제된 카메라")
+        if region is None:
+            return self.frame
+        l, t, r, b = region
+        return self.frame[t:b, l:r]
+
+    def release(self):
+        FakeCamera.released += 1
+        self.frame = None
+
+
+def check_pool_eviction(frame):
+    # 가짜 시계로 최대 개수 / 유휴 시간 해제 확인
+    now = [0.0]
+    pool = CapturePool(lambda idx: FakeCamera(idx, frame, 0), max_idle=2, idle_timeout=10.0,
+                       clock=lambda: now[0])
+    cams = [pool.acquire(idx) for idx in range(3)]
+    for idx, cam in enumerate(cams):
+        now[0] += 1.0
+        pool.release(idx, cam)
+    ok = list(pool.stats()["idle"]) == [1, 2] and cams[0].frame is None     # 가장 오래된 0 해제
+    ok &= pool.acquire(2) is cams[2] and pool.evict() == 0
+    pool.release(2, cams[2])
+    now[0] += 9.5
+    ok &= pool.evict() == 1 and pool.stats()["idle"] == [2]                 # 1 은 10초 넘게 유휴
+    now[0] += 1.0
+    ok &= pool.evict() == 1 and not pool.stats()["idle"]
+    pool.close()
+    return bool(ok)
+
+
+def cmd_pool(args):
+    # 창을 모니터 경계에서 끌고 다닐 때: 모니터가 바뀔 때마다 워커가 카메라를 반납하고 새 모니터 카메라를 빌림
+    # 풀 크기 0 (이전 방식: 매번 새로 만들고 해제) vs 유휴 카메라 보관 -> 이동 후 첫 프레임까지의 시간
+    width, height = RESOLUTIONS[args.resolutions[0]]
+    frame = np.zeros((height, width, 3), np.uint8)
+    print(f"가짜 카메라 생성 {args.open_ms:.0f} ms / 이동 {args.moves}회 / 모니터 {args.monitors}개 / 머무는 시간 {args.dwell:.0f} ms")
+    print(f"{'pool':>5}{'first p50':>11}{'first max':>11}{'opened':>8}{'released':>10}{'hits':>6}")
+    for size in args.sizes:
+        FakeCamera.opened = FakeCamera.released = 0
+        pool = CapturePool(lambda idx: FakeCamera(idx, frame, args.open_ms), max_idle=size,
+                           idle_timeout=Config.CAPTURE_IDLE_TIMEOUT)
+        waits = []
+        monitor, cam = 0, pool.acquire(0)
+        for move in range(args.moves):
+            # 0 / 1 경계를 오가다가 다섯 번에 한 번은 다른 모니터로 (monitors > 2 일 때)
+            if args.monitors > 2 and move % 5 == 4:
+                target = 2 + (move // 5) % (args.monitors - 2)
+            else:
+                target = 1 if monitor == 0 else 0
+            t0 = time.perf_counter()
+            pool.release(monitor, cam)
+            monitor, cam = target, pool.acquire(target)
+            cam.grab(region=(0, 0, 64, 64))
+            waits.append(time.perf_counter() - t0)
+            time.sleep(args.dwell / 1000.0)
+        pool.release(monitor, cam)
+        stats = pool.stats()
+        pool.close()
+        print(f"{size:>5}{percentile_ms(waits, 50):>11.2f}{percentile_ms(waits, 100):>11.2f}"
+              f"{FakeCamera.opened:>8}{FakeCamera.released:>10}{stats['hits']:>6}")
+    print(f"\n해제 규칙 (최대 개수 / 유휴 시간): {'OK' if check_pool_eviction(frame) else '실패'}")
+    return 0
+
+
+class FakeMonitor(FrameSource):
+    # 여러 모니터 측정용 가짜 모니터: 가상 데스크톱 이미지의 한 부분, grab 마다 grab_ms 걸림 (GIL 을 놓고 대기)
+    # static=True 면 첫 grab 뒤로는 None (dxcam: 화면 변화 없음)
+    def __init__(self, desktop, rect, grab_ms, static=False):
+        x, y, w, h = rect
+        self.frame = desktop[y:y + h, x:x + w]
+        self.width, self.height = w, h
+        self.grab_ms = grab_ms
+        self.static = static
+        self.grabs = 0
+
+    def grab(self, region=None):
+        time.sleep(self.grab_ms / 1000.0)
+        self.grabs += 1
+        if self.static and self.grabs > 1:
+            return None
+        l, t, r, b = region or (0, 0, self.width, self.height)
+        return self.frame[t:b, l:r].copy()  # dxcam 처럼 매번 새 배열
+
+
+class InlineExecutor:
+    # 순차 grab 비교용: submit 하면 이 스레드에서 바로 실행
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+def span_desktop(args, width, height):
+    # 왼쪽 모니터 (0, 0) + 오른쪽 모니터 (width, offset) 의 가상 데스크톱, 모니터 밖은 검은색
+    offset = args.offset
+    desktop = SyntheticSource(width * 2, height + offset, kind=args.kind).grab().copy()
+    desktop[height:, :width] = 0
+    desktop[:offset, width:] = 0
+    monitors = [(0, (0, 0, width, height)), (1, (width, offset, width, height))]
+    return desktop, monitors
+
+
+def span_edges(frame, cfg_store):
+    engine = EdgeEngine(cfg_store)
+    engine.update(frame)
+    edges = engine.edges.copy()
+    engine.close()
+    return edges
+
+
+def check_span_worker(desktop, monitors, region, grab_ms):
+    # CaptureWorker 경로: 가짜 모니터 풀로 두 모니터에 걸친 영역을 처리해 받은 마스크가 기준과 같은지
+    from PyQt5 import QtCore
+    from capture_workers import CaptureWorker
+    from edge_config import config_store
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    # 워커는 공유 저장소를 읽으므로 거기에 적용하고, 끝나면 원래 값으로 되돌림
+    store = config_store
+    previous = {name: getattr(store.source, name) for name in ("OUTPUT_MODE", "CHANGE_DETECT")}
+    store.publish(OUTPUT_MODE="mask", CHANGE_DETECT=False)
+    geometry = dict(monitors)
+    pool = CapturePool(lambda idx: FakeMonitor(desktop, geometry[idx], grab_ms))
+    worker = CaptureWorker([(idx, rect[:2]) for idx, rect in monitors], pool=pool)
+    x, y, w, h = region
+    worker.set_region(0, region)
+    worker.start()
+    frames = []
+    deadline = time.perf_counter() + 10.0
+    while not frames and time.perf_counter() < deadline:
+        app.processEvents()
+        frames = worker.mailbox.take()
+        time.sleep(0.01)
+    ok = False
+    if frames:
+        image = frames[0].image
+        mask = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), np.uint8)
+        mask = mask.reshape(image.height(), image.bytesPerLine())[:, :image.width()]
+        ok = np.array_equal(mask, span_edges(desktop[y:y + h, x:x + w], store))
+        for frame in frames:
+            frame.release()
+    worker.stop()
+    store.publish(**previous)
+    stats = pool.stats()
+    pool.close()
+    # 두 모니터 카메라 모두 풀에 반납됐는지
+    return ok and sorted(stats["idle"]) == [0, 1]
+
+
+def cmd_span(args):
+    # 모니터 경계에 걸친 영역: 모니터별 grab 을 동시에 (SpanSource) vs 차례로, 한 모니터 안의 같은 크기 영역과 비교
+    # 경계 일관성: 이어 붙인 뒤 엣지 검출 = 가상 데스크톱에서 바로 검출한 결과와 같은지, 모니터별 검출 후 붙이면 얼마나 다른지
+    apply_settings(args)
+    store = private_store(CHANGE_DETECT=False)
+    width, height = RESOLUTIONS[args.resolutions[0]]
+    desktop, monitors = span_desktop(args, width, height)
+    rw, rh = width // 2, height // 2
+    region = (width - rw // 2, height // 4 + args.offset // 2, rw, rh)    # 두 모니터에 걸침
+    x, y, w, h = region
+    print(f"모니터 2개 {width}x{height} (오른쪽 세로 위치 {args.offset}) / 영역 {w}x{h} / grab {args.grab_ms:.0f} ms")
+    print(f"{'mode':<12}{'grab p50':>10}{'grab p95':>10}{'total p50':>11}")
+
+    def measure(source, bounds):
+        capture = RegionCapture(store)
+        capture.set_region(0, bounds)
+        grabs, totals = [], []
+        for i in range(args.warmup + args.frames):
+            t0 = time.perf_counter()
+            capture.update(source)
+            if i >= args.warmup:
+                grabs.append(capture.captured_at - t0)
+                totals.append(time.perf_counter() - t0)
+        capture.close()
+        return grabs, totals
+
+    def make_span():
+        return SpanSource([(idx, FakeMonitor(desktop, rect, args.grab_ms), rect[:2]) for idx, rect in monitors])
+
+    single = FakeMonitor(desktop, monitors[0][1], args.grab_ms)
+    sequential = make_span()
+    sequential.executor.shutdown()
+    sequential.executor = InlineExecutor()
+    parallel = make_span()
+    cases = (("one monitor", single, (width // 4, height // 4, rw, rh)),
+             ("sequential", sequential, region), ("parallel", parallel, region))
+    for name, source, bounds in cases:
+        grabs, totals = measure(source, bounds)
+        print(f"{name:<12}{percentile_ms(grabs, 50):>10.2f}{percentile_ms(grabs, 95):>10.2f}"
+              f"{percentile_ms(totals, 50):>11.2f}")
+        source.release()
+
+    # 경계 일관성
+    reference = span_edges(desktop[y:y + h, x:x + w], store)
+    span = make_span()
+    stitched = span_edges(span.grab((x, y, x + w, y + h)), store)
+    span.release()
+    seam = width - x
+    separate = np.zeros_like(reference)
+    separate[:, :seam] = span_edges(desktop[y:y + h, x:width], store)
+    right_y = max(y, args.offset)
+    separate[right_y - y:, seam:] = span_edges(desktop[right_y:y + h, width:x + w], store)
+    band = slice(max(0, seam - 16), seam + 16)
+    print("\n경계 일관성 (기준 = 가상 데스크톱에서 바로 검출, 경계 ±16 px 안 다른 픽셀 수)")
+    print(f"  이어 붙인 뒤 검출: {int(np.count_nonzero(stitched != reference))} (전체)")
+    print(f"  모니터별 검출 후 붙임: {int(np.count_nonzero(separate[:, band] != reference[:, band]))}")
+
+    # 화면 변화가 없는 모니터 (None) 는 마지막 픽셀 재사용
+    parts = [(idx, FakeMonitor(desktop, rect, 0, static=idx == 1), rect[:2]) for idx, rect in monitors]
+    span = SpanSource(parts)
+    first = span.grab((x, y, x + w, y + h))
+    second = span.grab((x, y, x + w, y + h))
+    span.release()
+    static_ok = second is not None and np.array_equal(first, second)
+    print(f"\n변화 없는 모니터 재사용: {'OK' if static_ok else '실패'}")
+    print(f"CaptureWorker (가짜 모니터 풀): {'OK' if check_span_worker(desktop, monitors, region, 1.0) else '실패'}")
+    return 0
+
+
+def cmd_mailbox(args):
+    # 워커 -> GUI 전달: 큐 시그널 (이전 방식, 프레임마다 이벤트) vs 최신 프레임 우편함
+    # GUI 가 프레임마다 paint_ms 걸리면 (드래그 / 설정 창 처리 중) 시그널 방식은 큐에 프레임이 쌓여 지연 / 메모리가 계속 늘어남
+    from PyQt5 import QtCore
+    from capture_workers import EdgeFrame, FrameMailbox
+    from telemetry import Telemetry
+
+    class Emitter(QtCore.QObject):
+        sig_frame = QtCore.pyqtSignal(object)
+
+    app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    width, height = RESOLUTIONS[args.resolutions[0]]
+    frame_mb = width * height / 1e6   # 마스크 출력 한 프레임 크기
+    print(f"워커 {args.rate} Hz / 그리기 {args.paint_ms:.0f} ms / {args.seconds:.0f}s / 프레임 {frame_mb:.1f} MB")
+    print(f"{'mode':<9}{'painted':>8}{'skipped':>9}{'dropped':>9}{'lat p50':>9}{'lat p95':>9}{'lat max':>9}"
+          f"{'queued max':>12}{'peak MB':>9}{'wall s':>8}")
+    for mode in ("signal", "mailbox"):
+        telemetry = Telemetry()
+        mailbox = FrameMailbox(telemetry)
+        emitter = Emitter()
+        latency = []
+        counts = {"posted": 0, "painted": 0, "skipped": 0, "queued": 0}
+        stop = threading.Event()
+
+        def paint(frame):
+            latency.append(time.perf_counter() - frame.captured_at)
+            counts["painted"] += 1
+            spin = time.perf_counter() + args.paint_ms / 1000.0
+            while time.perf_counter() < spin:
+                pass
+
+        def on_signal(frame):
+            counts["queued"] = max(counts["queued"], counts["posted"] - counts["painted"])
+            paint(frame)
+
+        def on_mailbox(box):
+            for frame in box.take():
+                paint(frame)
+
+        emitter.sig_frame.connect(on_signal, QtCore.Qt.QueuedConnection)
+        mailbox.sig_posted.connect(on_mailbox, QtCore.Qt.QueuedConnection)
+
+        def worker():
+            period = 1.0 / args.rate
+            deadline = time.perf_counter()
+            while not stop.is_set():
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if mode == "mailbox" and mailbox.busy():
+                    counts["skipped"] += 1
+                    continue
+                frame = EdgeFrame(None, None, time.perf_counter(), target=0, telemetry=telemetry)
+                counts["posted"] += 1
+                if mode == "signal":
+                    emitter.sig_frame.emit(frame)
+                else:
+                    mailbox.post(frame)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        # 시그널 방식은 밀린 프레임 이벤트가 종료 타이머보다 먼저 처리되므로 실제 측정 시간이 더 길어짐
+        started = time.perf_counter()
+        QtCore.QTimer.singleShot(int(args.seconds * 1000), app.quit)
+        app.exec_()
+        wall = time.perf_counter() - started
+        stop.set()
+        thread.join()
+        # 남은 이벤트 버림 (다음 방식 측정에 섞이지 않도록)
+        emitter.sig_frame.disconnect()
+        mailbox.sig_posted.disconnect()
+        app.processEvents()
+        queued = counts["queued"] if mode == "signal" else 1
+        print(f"{mode:<9}{counts['painted']:>8}{counts['skipped']:>9}{telemetry.counters['dropped']:>9}"
+              f"{percentile_ms(latency, 50):>9.1f}{percentile_ms(latency, 95):>9.1f}{percentile_ms(latency, 100):>9.1f}"
+              f"{queued:>12}{queued * frame_mb:>9.1f}{wall:>8.1f}")
+    return 0
+
+
+class MovingBoxSource(FrameSource):
+    # 고정된 화면 위에서 작은 상자(커서 / 깜빡이는 글자 흉내)만 움직이는 소스 (부분 갱신 측정용)
+    def __init__(self, base, box):
+        self.base = base
+        self.box = box
+        self.height, self.width = base.shape[:2]
+        self.frame = base.copy()
+        self.index = 0
+
+    def grab(self, region=None):
+        frame = self.frame
+        np.copyto(frame, self.base)
+        self.index += 1
+        box = self.box
+        x = (self.index * 37) % max(1, self.width - box)
+        y = (self.index * 23) % max(1, self.height - box)
+        frame[y:y + box, x:x + box] = 255
+        frame[y + box // 4:y + box * 3 // 4, x + box // 4:x + box * 3 // 4] = 0
+        if region is None:
+            return frame
+        l, t, r, b = region
+        return frame[t:b, l:r]
+
+
+def cmd_repaint(args):
+    # 창 그리기 비용: 프레임마다 창 전체 (이전 방식) vs 엔진이 알려준 바뀐 영역만 + 캐시한 테두리 / 안내 문구
+    # 배경 지우기 + 이미지 + 편집 모드 장식을 ARGB 버퍼 (창 백킹 스토어 흉내) 에 그림
+    from PyQt5 import QtCore, QtGui, sip
+    app = QtGui.QGuiApplication.instance() or QtGui.QGuiApplication([])
+    apply_settings(args)
+    hint = "[Ctrl+F9] 보기 토글 | [Ctrl+F10] 편집 모드"
+    table = [QtGui.qRgba(0, 0, 0, 0)] + [QtGui.qRgba(0, 255, 0, 255)] * 255
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        source = open_source(args.source, width, height)
+        if args.box:
+            source = MovingBoxSource(source.grab().copy(), args.box)
+        engine = EdgeEngine(None)
+        mask = np.zeros((height, width), np.uint8)
+        image = QtGui.QImage(sip.voidptr(mask.ctypes.data), width, height, width, QtGui.QImage.Format_Indexed8)
+        image.setColorTable(table)
+        target = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+
+        # 장식 캐시 (창과 같은 방식)
+        decorations = QtGui.QImage(width, height, QtGui.QImage.Format_ARGB32_Premultiplied)
+        decorations.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(decorations)
+        painter.setFont(app.font())
+        painter.setPen(QtGui.QPen(QtCore.Qt.yellow))
+        painter.drawText(10, 20, hint)
+        text_rect = painter.fontMetrics().boundingRect(hint).translated(10, 20).adjusted(-2, -2, 2, 2)
+        painter.setPen(QtGui.QPen(QtCore.Qt.yellow, 5))
+        painter.drawRect(0, 0, width - 1, height - 1)
+        painter.end()
+        bounds = QtCore.QRect(0, 0, width, height)
+        area = QtGui.QRegion(bounds).subtracted(QtGui.QRegion(bounds.adjusted(4, 4, -4, -4)))
+        area = area.united(QtGui.QRegion(text_rect))
+
+        times = {"full": [], "partial": []}
+        areas = []
+        serial = None
+        for i in range(args.warmup + args.frames):
+            if not engine.update(source.grab()):
+                continue
+            dirty = engine.dirty_since(serial)
+            serial = engine.render(mask, serial)
+            region = QtGui.QRegion()
+            for y0, y1, x0, x1 in (dirty if dirty is not None else [(0, height, 0, width)]):
+                region += QtCore.QRect(x0, y0, x1 - x0, y1 - y0)
+
+            t0 = time.perf_counter()
+            painter = QtGui.QPainter(target)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+            painter.fillRect(bounds, QtCore.Qt.transparent)
+            painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+            painter.drawImage(0, 0, image)
+            painter.setPen(QtGui.QPen(QtCore.Qt.yellow))
+            painter.drawText(10, 20, hint)
+            painter.setPen(QtGui.QPen(QtCore.Qt.yellow, 5))
+            painter.drawRect(0, 0, width - 1, height - 1)
+            painter.end()
+            t1 = time.perf_counter()
+            painter = QtGui.QPainter(target)
+            for rect in region.rects():
+                painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+                painter.fillRect(rect, QtCore.Qt.transparent)
+                painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+                painter.drawImage(rect, image, rect)
+            overlap = area.intersected(region)
+            if not overlap.isEmpty():
+                painter.setClipRegion(overlap)
+                painter.drawImage(0, 0, decorations)
+            painter.end()
+            t2 = time.perf_counter()
+            if i >= args.warmup:
+                times["full"].append(t1 - t0)
+                times["partial"].append(t2 - t1)
+                areas.append(sum(r.width() * r.height() for r in region.rects()) / float(width * height))
+        engine.close()
+        source.release()
+        full, partial = (percentile_ms(times[k], 50) for k in ("full", "partial"))
+        print(f"\n== {res} ({width}x{height}) / {args.source}"
+              + (f" + 움직이는 상자 {args.box}px" if args.box else "") + f" / {len(areas)} 프레임 ==")
+        print(f"다시 그린 면적 평균 {float(np.mean(areas)) if areas else 0.0:.1%}")
+        print(f"paint p50: 전체 {full:.3f} ms / 부분 {partial:.3f} ms ({full / max(partial, 1e-9):.1f}x)")
+    return 0
+
+
+def partial_source(kind, width, height, box):
+    # 부분 처리 검사용 프레임 소스: 합성 화면 위에서 움직이는 상자, scroll 은 스크롤 화면 그대로
+    if kind == "scroll":
+        return SyntheticSource(width, height, kind="scroll", count=24)
+    return MovingBoxSource(SyntheticSource(width, height, kind=kind, count=1).grab().copy(), box)
+
+
+def cmd_partial(args):
+    # 부분 처리 (변경 감지 / 스크롤 재사용) 결과가 매 프레임 전체 처리 결과와 같은지 + 프레임당 시간
+    apply_settings(args)
+    failed = False
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        print(f"\n== {res} ({width}x{height}) / {args.detector} / 상자 {args.box}px ==")
+        print(f"{'화면':<9}{'두께':>4}{'부분 처리':>10}{'부분 ms':>9}{'전체 ms':>9}{'최대 불일치':>12}")
+        for kind in args.kinds:
+            for thickness in args.thicknesses:
+                partial = EdgeEngine(private_store(EDGE_THICKNESS=thickness, CHANGE_DETECT=True))
+                full = EdgeEngine(private_store(EDGE_THICKNESS=thickness, CHANGE_DETECT=False))
+                source = partial_source(kind, width, height, args.box)
+                times = {"partial": [], "full": []}
+                worst = partial_frames = 0
+                for i in range(args.frames):
+                    frame = source.grab()
+                    t0 = time.perf_counter()
+                    partial.update(frame)
+                    t1 = time.perf_counter()
+                    full.update(frame)
+                    t2 = time.perf_counter()
+                    if i:
+                        times["partial"].append(t1 - t0)
+                        times["full"].append(t2 - t1)
+                        partial_frames += partial.dirty_rects != [(0, height, 0, width)]
+                    worst = max(worst, int(np.count_nonzero(partial.edges != full.edges)))
+                partial.close()
+                full.close()
+                source.release()
+                failed |= worst > 0
+                print(f"{kind:<9}{thickness:>4}{partial_frames:>10}{percentile_ms(times['partial'], 50):>9.2f}"
+                      f"{percentile_ms(times['full'], 50):>9.2f}{worst:>10} px  {'OK' if not worst else 'FAIL'}")
+    return 1 if failed else 0
+
+
+def stream_reader(name, seconds, results):
+    # 스트림 읽기 프로세스: 받은 프레임마다 마스크 전체를 읽고 (countNonZero) 캡처 -> 읽기 완료 지연 측정
+    reader = EdgeStreamReader(name)
+    latency, frames, torn, edges = [], 0, 0, 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame = reader.wait(timeout=0.5)
+        if frame is None:
+            continue
+        edges += cv2.countNonZero(frame.mask)
+        if not reader.valid(frame):
+            torn += 1
+            continue
+        latency.append((time.perf_counter_ns() - frame.timestamp) / 1e9)
+        frames += 1
+    results.put({"frames": frames, "missed": reader.missed, "torn": torn, "bytes": frames * frame.mask.size,
+                 "p50": percentile_ms(latency, 50), "p95": percentile_ms(latency, 95),
+                 "max": percentile_ms(latency, 100)})
+    reader.close()
+
+
+def cmd_stream(args):
+    # 공유 메모리 엣지 스트림: 게시 프로세스 하나 + 읽기 프로세스 N 개 (복사 없이 읽고 valid 로 확인)
+    # 읽는 쪽이 늘어도 게시 / 읽기 지연이 유지되는지 확인
+    ctx = multiprocessing.get_context("spawn")
+    print(f"CPU 코어: {os.cpu_count()}")
+    failed = False
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        print(f"\n== {res} ({width}x{height}) / {args.source} / {args.rate or '제한 없음'} Hz / {args.seconds:.0f}s ==")
+        print(f"{'readers':>8}{'fps/reader':>12}{'total MB/s':>12}{'missed':>8}{'torn':>6}"
+              f"{'lat p50':>9}{'lat p95':>9}{'lat max':>9}")
+        for count in args.readers:
+            name = f"edge_bench_{os.getpid()}_{count}"
+            stop = ctx.Event()
+            publisher = ctx.Process(target=publish_main, args=(args.source, name, width, height, None,
+                                                               args.rate, None, stop), daemon=True)
+            publisher.start()
+            # 게시 프로세스가 링을 만들고 첫 프레임을 게시할 때까지 대기
+            deadline = time.perf_counter() + 10.0
+            while True:
+                try:
+                    probe = EdgeStreamReader(name)
+                except FileNotFoundError:
+                    probe = None
+                if probe is not None and probe.wait(timeout=0.5) is not None:
+                    probe.close()
+                    break
+                if probe is not None:
+                    probe.close()
+                if time.perf_counter() > deadline or not publisher.is_alive():
+                    raise RuntimeError("게시 프로세스 시작 실패")
+                time.sleep(0.05)
+            if count == args.readers[0]:
+                failed = not check_takeover(name, width * height) or failed
+            results = ctx.Queue()
+            readers = [ctx.Process(target=stream_reader, args=(name, args.seconds, results), daemon=True)
+                       for _ in range(count)]
+            for reader in readers:
+                reader.start()
+            stats = [results.get(timeout=args.seconds + 30.0) for _ in readers]
+            for reader in readers:
+                reader.join()
+            stop.set()
+            publisher.join()
+            fps = np.mean([r["frames"] for r in stats]) / args.seconds
+            mbps = sum(r["bytes"] for r in stats) / args.seconds / 1e6
+            print(f"{count:>8}{fps:>12.1f}{mbps:>12.1f}{sum(r['missed'] for r in stats):>8}"
+                  f"{sum(r['torn'] for r in stats):>6}{np.median([r['p50'] for r in stats]):>9.2f}"
+                  f"{max(r['p95'] for r in stats):>9.2f}{max(r['max'] for r in stats):>9.2f}")
+    return 1 if failed else 0
+
+
+def check_takeover(name, capacity):
+    # 같은 이름의 두 번째 게시자: 살아 있는 게시자의 링은 거부 (FileExistsError), 죽은 게시자가 남긴 링은 교체
+    try:
+        EdgeStream(name, capacity).close()
+        refused = False
+    except FileExistsError:
+        refused = True
+    replaced = True
+    if sys.platform != "win32":     # Windows 는 연결한 프로세스가 없으면 이름도 사라짐 (남은 링 없음)
+        orphan = EdgeStream(f"{name}_orphan", 64)
+        orphan.ring.header[5] = 0   # 만든 프로세스가 없는 링 (비정상 종료 흉내)
+        orphan.ring.owner = False
+        try:
+            EdgeStream(f"{name}_orphan", 64).close()
+        except FileExistsError:
+            replaced = False
+        orphan.close()
+    ok = refused and replaced
+    print(f"두 번째 게시자: 살아 있는 스트림 {'거부' if refused else '가로챔'}, "
+          f"남은 링 {'교체' if replaced else '거부'}  {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+def cmd_batch(args):
+    # 일괄 처리 (edge_batch): 작업 프로세스 수별 처리 속도 + 결과 PNG 가 모두 같은지 (순서 / 내용)
+    # 시간에는 작업 프로세스 시작 (spawn) 도 포함되므로 프레임 수를 충분히
+    apply_settings(args)
+    settings = load_settings()
+    cores = os.cpu_count() or 1
+    counts = args.workers or sorted({n for n in (1, 2, 4, 8, 16) if n <= cores} | {cores})
+    width, height = RESOLUTIONS[args.resolutions[0]]
+    print(f"CPU 코어: {cores}")
+    print(f"\n== {args.resolutions[0]} ({width}x{height}) / {args.source} / {args.frames} 프레임 ==")
+    print(f"{'workers':>8}{'fps':>9}{'speedup':>9}{'eff':>7}{'same':>6}")
+    base = reference = None
+    for count in counts:
+        with tempfile.TemporaryDirectory() as out:
+            result = run_batch(args.source, out, settings, count, frames=args.frames,
+                               resolution=(width, height), verbose=False)
+            digest = []
+            for name in sorted(os.listdir(out)):
+                with open(os.path.join(out, name), "rb") as f:
+                    digest.append((name, hashlib.sha1(f.read()).hexdigest()))
+        if base is None:
+            base, reference = result["fps"], digest
+        speedup = result["fps"] / base if base else 0.0
+        print(f"{count:>8}{result['fps']:>9.1f}{speedup:>9.2f}{speedup / count:>7.0%}"
+              f"{'yes' if digest == reference else 'NO':>6}")
+    return 0
+
+
+def gui_ticks(seconds, rate, busy, on_tick=None):
+    # GUI 스레드 흉내: 1/rate 마다 깨어나 busy 초 동안 Python 작업 (그리기 / 입력 처리, GIL 점유)
+    # -> 깨어난 시각이 마감 시각보다 늦은 정도 (ms)
+    period = 1.0 / rate
+    lateness = []
+    deadline = time.perf_counter() + period
+    end = deadline + seconds
+    while deadline < end:
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        lateness.append(max(0.0, time.perf_counter() - deadline))
+        if on_tick is not None:
+            on_tick()
+        spin = time.perf_counter() + busy
+        while time.perf_counter() < spin:
+            pass
+        deadline += period
+    return lateness
+
+
+def cmd_processes(args):
+    # GUI 응답성: 캡처 / 처리를 GUI 프로세스의 스레드에서 (기존) vs 별도 프로세스에서 (edge_processes)
+    # GIL 을 공유하는 스레드 방식은 처리 중 GUI 틱이 밀림. 코어가 부족하면 프로세스 방식도 이득이 작음
+    apply_settings(args)
+    print(f"CPU 코어: {os.cpu_count()}")
+    failed = False
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        region = (0, 0, width, height)
+        print(f"\n== {res} ({width}x{height}) / {args.source} / {args.seconds:.0f}s ==")
+        print(f"{'mode':<9}{'tick p50':>10}{'tick p95':>10}{'tick max':>10}{'proc fps':>10}")
+
+        # 스레드 방식: 같은 프로세스에서 RegionCapture + 출력 버퍼 렌더
+        source = open_source(args.source, width, height)
+        capture = RegionCapture(None)
+        capture.set_region(0, region)
+        out = np.empty((height, width), np.uint8)
+        processed = [0]
+        stop = threading.Event()
+
+        def work():
+            while not stop.is_set():
+                start = time.perf_counter()
+                if capture.update(source):
+                    group, rect = capture.locate(0)
+                    group.engine.render(out, None, rect)
+                processed[0] += 1
+                delay = 1.0 / args.rate - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+
+        thread = threading.Thread(target=work, daemon=True)
+        thread.start()
+        lateness = gui_ticks(args.seconds, args.rate, args.busy / 1000.0)
+        stop.set()
+        thread.join()
+        capture.close()
+        source.release()
+        print_ticks("thread", lateness, processed[0] / args.seconds)
+
+        # 프로세스 방식: GUI 틱마다 알림을 받아 공유 메모리 슬롯 확인
+        # GUI 처럼 표시할 슬롯을 다음 슬롯까지 잡아 두고 (pin), 그 사이 덮어써진 슬롯 (torn) 을 셈
+        pipeline = ProcessPipeline(args.source, width, height)
+        pipeline.send("config", {"OUTPUT_MODE": "mask"})
+        pipeline.send("region", 0, region)
+        frames = [0]
+        shown = [None, 0]   # [(링, 슬롯, seq), 찢어진 슬롯 수]
+
+        def receive():
+            latest = None
+            while pipeline.poll():
+                message = pipeline.recv()
+                if message[0] == "frame":
+                    latest = message
+                    frames[0] += 1
+            if latest is None:
+                return
+            ring, index, seq = pipeline.attach(latest[2]), latest[3], latest[4]
+            if ring.pin(index, seq):
+                if shown[0] is not None:
+                    old_ring, old_index, old_seq = shown[0]
+                    shown[1] += not old_ring.valid(old_index, old_seq)
+                    old_ring.unpin(old_index)
+                shown[0] = (ring, index, seq)
+
+        # 프로세스 시작 / 첫 프레임까지 기다린 뒤 측정
+        start = time.perf_counter()
+        while not frames[0] and time.perf_counter() - start < 30:
+            pipeline.poll(0.1)
+            receive()
+        frames[0] = 0
+        shown[1] = 0
+        lateness = gui_ticks(args.seconds, args.rate, args.busy / 1000.0, receive)
+        pipeline.stop()
+        print_ticks("process", lateness, frames[0] / args.seconds)
+        print(f"  표시 중 덮어써진 슬롯: {shown[1]} {'OK' if not shown[1] else 'FAIL'}")
+        failed = failed or shown[1] > 0
+    return 1 if failed else 0
+
+
+def print_ticks(mode, lateness, fps):
+    ms = np.array(lateness) * 1000.0
+    print(f"{mode:<9}{np.percentile(ms, 50):>10.2f}{np.percentile(ms, 95):>10.2f}"
+          f"{ms.max():>10.2f}{fps:>10.1f}")
+
+
+def environment_info():
+    return {
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def case_key(res, kind, thickness, auto, output):
+    return f"{res}/{kind}/t{thickness}/{'auto' if auto else 'fixed'}/{output}"
+
+
+def seam_mismatch(frames, threads):
+    # 밴드 병렬 처리 (threads) 와 단일 처리의 엣지 맵이 다른 픽셀 수 (frames 전체 합, 현재 Config 기준)
+    maps = []
+    for n in (1, threads):
+        Config.WORKER_THREADS = n
+        engine = EdgeEngine()
+        engine.prepare()
+        maps.append([engine.detect_edges(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)).copy() for frame in frames])
+        engine.close()
+    Config.WORKER_THREADS = threads
+    return sum(int(np.count_nonzero(a != b)) for a, b in zip(*maps))
+
+
+def cmd_suite(args):
+    # 합성 프레임 종류 x 해상도 x 두께 x 자동 조절 x 출력 방식 전체 조합 측정
+    # 밴드 병렬 처리 (--threads > 1) 결과가 단일 처리와 다르면 종료 코드 1
+    apply_settings(args)
+    cases = {}
+    failed = False
+    total = len(args.kinds) * len(args.resolutions) * len(args.thickness_values) * 2 * len(args.outputs)
+    done = 0
+    for res in args.resolutions:
+        width, height = RESOLUTIONS[res]
+        for kind in args.kinds:
+            source = SyntheticSource(width, height, kind, count=args.distinct, seed=args.seed)
+            for thickness, auto, output in itertools.product(
+                    args.thickness_values, (False, True), args.outputs):
+                Config.EDGE_THICKNESS = thickness
+                Config.REALTIME_AUTO = auto
+                apply_output(output)
+                summary = bench_stages(None, width, height, args.frames, args.warmup,
+                                       output=output, source=source)
+                key = case_key(res, kind, thickness, auto, output)
+                mismatch = ""
+                if args.threads > 1:
+                    summary["seam_mismatch_px"] = seam_mismatch(source.frames, args.threads)
+                    failed |= summary["seam_mismatch_px"] > 0
+                    mismatch = f"  경계 불일치 {summary['seam_mismatch_px']} px"
+                cases[key] = summary
+                done += 1
+                print(f"[{done}/{total}] {key:<32} total p50 {summary['total']['p50']:8.3f} ms"
+                      f"  p95 {summary['total']['p95']:8.3f} ms{mismatch}")
+            source.release()
+
+    result = {
+        "environment": environment_info(),
+        "settings": {"frames": args.frames, "warmup": args.warmup, "threads": args.threads,
+                     "change_detect": args.change_detect, "scale": args.scale,
+                     "upscale": args.upscale, "seed": args.seed, "distinct": args.distinct},
+        "cases": cases,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n결과 저장: {args.out} ({len(cases)} 조합)")
+    if failed:
+        print("밴드 병렬 처리 결과가 단일 처리와 다름 (FAIL)")
+    return 1 if failed else 0
+
+
+def compare_results(base, current, metric, tolerance, min_delta, stages=("total",)):
+    # 기준 대비 (1 + tolerance) 배를 넘고 min_delta ms 이상 느려진 항목 = 성능 저하
+    rows = []
+    for key in sorted(set(base["cases"]) & set(current["cases"])):
+        for stage in stages:
+            b = base["cases"][key].get(stage)
+            c = current["cases"][key].get(stage)
+            if not isinstance(b, dict) or not isinstance(c, dict):
+                continue
+            old, new = b[metric], c[metric]
+            ratio = new / old if old > 0 else 1.0
+            if new > old * (1.0 + tolerance) and new - old >= min_delta:
+                status = "REGRESSION"
+            elif old > new * (1.0 + tolerance) and old - new >= min_delta:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append((key, stage, old, new, ratio, status))
+    return rows
+
+
+def cmd_compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    stages = ("total",) + tuple(args.stages)
+    rows = compare_results(base, current, args.metric, args.tolerance, args.min_delta, stages)
+    regressions = [row for row in rows if row[5] == "REGRESSION"]
+    improved = [row for row in rows if row[5] == "improved"]
+
+    shown = rows if args.verbose else regressions + improved
+    if shown:
+        print(f"{'case':<34}{'stage':<10}{'base':>10}{'current':>10}{'ratio':>8}  ({args.metric}, ms)")
+        for key, stage, old, new, ratio, status in shown:
+            print(f"{key:<34}{stage:<10}{old:>10.3f}{new:>10.3f}{ratio:>8.2f}  {status}")
+
+    missing = sorted(set(base["cases"]) - set(current["cases"]))
+    added = sorted(set(current["cases"]) - set(base["cases"]))
+    if missing:
+        print(f"현재 결과에 없는 조합 {len(missing)} 개: {', '.join(missing[:5])}{' ...' if len(missing) > 5 else ''}")
+    if added:
+        print(f"새로 추가된 조합 {len(added)} 개")
+    if base.get("environment", {}).get("platform") != current.get("environment", {}).get("platform"):
+        print("주의: 두 결과의 측정 환경이 다름")
+
+    print(f"\n비교 {len(rows)} 항목 / 저하 {len(regressions)} / 개선 {len(improved)}"
+          f" (허용 오차 {args.tolerance * 100:.0f}%, 최소 {args.min_delta} ms)")
+    return 1 if regressions else 0
+
+
+def add_common_args(p):
+    p.add_argument("--source", default="synthetic",
+                   help="synthetic[:ui|noise], video:PATH, images:DIR, dxcam[:idx]")
+    p.add_argument("--resolutions", nargs="+", default=list(RESOLUTIONS),
+                   choices=list(RESOLUTIONS))
+    p.add_argument("--frames", type=int, default=100)
+    p.add_argument("--warmup", type=int, default=10)
+    p.add_argument("--thickness", type=int, default=Config.EDGE_THICKNESS)
+    p.add_argument("--auto", action="store_true", help="실시간 자동 임계값 사용")
+    p.add_argument("--threads", type=int, default=Config.WORKER_THREADS,
+                   help="밴드 병렬 처리 스레드 수 (0/1 = 단일 처리)")
+    p.add_argument("--no-change-detect", dest="change_detect", action="store_false",
+                   help="변경 감지 끄기")
+    p.add_argument("--scale", type=float, default=Config.PROCESSING_SCALE, help="처리 배율")
+    p.add_argument("--upscale", choices=("thin", "nearest"), default=Config.UPSCALE_METHOD,
+                   help="축소 처리 결과 확대 방식")
+    p.add_argument("--detector", choices=DETECTORS, default=Config.EDGE_DETECTOR, help="엣지 검출기")
+    p.add_argument("--blur", type=int, default=Config.BLUR_SIZE, help="사전 블러 크기 (0 = 끄기)")
+    p.add_argument("--json", help="결과를 JSON 파일로 저장")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Edge Overlay 파이프라인 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stages", help="단계별 지연 시간 측정")
+    add_common_args(p)
+    p.add_argument("--hold", type=int, default=1, help="같은 프레임 반복 횟수 (정지 화면)")
+    p.add_argument("--output", choices=list(SUITE_OUTPUTS), default="rgba", help="출력 방식")
+    p.set_defaults(func=cmd_stages)
+
+    p = sub.add_parser("tiles", help="단일 처리 vs 밴드 병렬 처리 비교")
+    add_common_args(p)
+    p.add_argument("--thread-counts", nargs="+", type=int, default=[2, 4, 8])
+    p.set_defaults(func=cmd_tiles)
+
+    p = sub.add_parser("scales", help="처리 배율별 지연 시간 / 엣지 충실도")
+    add_common_args(p)
+    p.add_argument("--scales", nargs="+", type=float, default=[1.0, 0.75, 0.5, 0.25])
+    p.set_defaults(func=cmd_scales)
+
+    p = sub.add_parser("detectors", help="엣지 검출기 / 사전 블러별 비용과 Canny 대비 충실도")
+    add_common_args(p)
+    p.set_defaults(frames=30, warmup=5, resolutions=["1080p"])
+    p.add_argument("--detectors", nargs="+", default=list(DETECTORS), choices=list(DETECTORS))
+    p.add_argument("--blurs", nargs="+", type=int, default=[0, 3, 5])
+    p.add_argument("--tolerance", type=int, default=1, help="충실도 일치 허용 거리 (px)")
+    p.set_defaults(func=cmd_detectors)
+
+    p = sub.add_parser("alloc", help="정상 상태 프레임의 메모리 할당량 검사 (tracemalloc)")
+    add_common_args(p)
+    p.set_defaults(frames=30, warmup=5, resolutions=["1080p"])
+    p.add_argument("--outputs", nargs="+", default=list(SUITE_OUTPUTS), choices=list(SUITE_OUTPUTS))
+    p.add_argument("--sequences", nargs="+", default=list(ALLOC_SEQUENCES), choices=ALLOC_SEQUENCES,
+                   help="cycle = 전체 처리, held = 변화 없음, box = 부분 처리, scroll = 이동 재사용")
+    p.set_defaults(func=cmd_alloc)
+
+    p = sub.add_parser("vector", help="엣지 밀도별 비트맵 vs 벡터(윤곽선) 출력 비용 비교")
+    add_common_args(p)
+    p.set_defaults(frames=20, warmup=3, resolutions=["1080p"])
+    p.add_argument("--kinds", nargs="+", default=list(SUITE_KINDS), choices=list(SUITE_KINDS))
+    p.add_argument("--thresholds", nargs="+", type=parse_thresholds,
+                   default=[(50, 150), (100, 250), (200, 400), (400, 800)],
+                   help="Canny 임계값 LOW:HIGH 목록 (엣지 밀도를 바꾸는 용도)")
+    p.add_argument("--epsilon", type=float, default=Config.VECTOR_EPSILON, help="윤곽선 단순화 허용 오차 (px)")
+    p.add_argument("--distinct", type=int, default=4, help="합성 프레임 수 (순환 재생)")
+    p.add_argument("--seed", type=int, default=0)
+    p.set_defaults(func=cmd_vector)
+
+    p = sub.add_parser("regions", help="여러 영역: 영역별 캡처 vs 모니터당 공유 캡처")
+    add_common_args(p)
+    p.set_defaults(frames=30, warmup=5, resolutions=["1080p"])
+    p.add_argument("--layouts", nargs="+", default=list(REGION_LAYOUTS), choices=list(REGION_LAYOUTS))
+    p.set_defaults(func=cmd_regions)
+
+    p = sub.add_parser("record", help="합성 프레임 / 동영상 / 이미지를 녹화 파일로 저장 (replay 용)")
+    add_common_args(p)
+    p.set_defaults(frames=300, resolutions=["1080p"], source="synthetic:scroll")
+    p.add_argument("--rate", type=int, default=Config.REFRESH_RATE, help="기록할 캡처 간격 (Hz)")
+    p.add_argument("--out", default="capture.edgerec", help="녹화 파일")
+    p.set_defaults(func=cmd_record)
+
+    p = sub.add_parser("replay", help="녹화 파일을 녹화 당시 설정으로 재생하며 측정")
+    p.add_argument("path", help="녹화 파일 (.edgerec)")
+    p.add_argument("--realtime", action="store_true", help="원래 캡처 간격대로 재생")
+    p.add_argument("--current-config", dest="recorded_config", action="store_false",
+                   help="녹화된 설정 대신 기본 설정 사용")
+    p.add_argument("--json", help="결과를 JSON 파일로 저장")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("startup", help="시작 시간: 모듈 import / 첫 엣지 프레임까지")
+    p.add_argument("--resolutions", nargs="+", default=["1080p"], choices=list(RESOLUTIONS))
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--modules", nargs="+", default=list(STARTUP_MODULES), help="import 순서")
+    p.set_defaults(func=cmd_startup)
+
+    p = sub.add_parser("pool", help="창이 모니터를 옮겨 다닐 때 카메라 재사용 (가짜 카메라)")
+    p.add_argument("--resolutions", nargs="+", default=["1080p"], choices=list(RESOLUTIONS))
+    p.add_argument("--sizes", type=int, nargs="+", default=[0, Config.CAPTURE_POOL_SIZE], help="유휴 카메라 보관 수")
+    p.add_argument("--open-ms", dest="open_ms", type=float, default=150.0, help="카메라 생성 시간 (ms)")
+    p.add_argument("--moves", type=int, default=20, help="모니터 이동 횟수")
+    p.add_argument("--monitors", type=int, default=2)
+    p.add_argument("--dwell", type=float, default=50.0, help="이동 사이 머무는 시간 (ms)")
+    p.set_defaults(func=cmd_pool)
+
+    p = sub.add_parser("span", help="모니터 경계에 걸친 영역: 동시 grab / 경계 일관성 (가짜 모니터)")
+    add_common_args(p)
+    p.set_defaults(frames=60, warmup=5, resolutions=["1080p"], change_detect=False)
+    p.add_argument("--kind", choices=SyntheticSource.KINDS, default="ui", help="가상 데스크톱 합성 화면")
+    p.add_argument("--grab-ms", dest="grab_ms", type=float, default=8.0, help="모니터별 grab 시간 (ms)")
+    p.add_argument("--offset", type=int, default=120, help="오른쪽 모니터 세로 위치 (px, 모니터 사이 빈 공간)")
+    p.set_defaults(func=cmd_span)
+
+    p = sub.add_parser("stream", help="공유 메모리 엣지 스트림: 읽는 프로세스 수별 처리량 / 지연")
+    p.add_argument("--source", default="synthetic:ui")
+    p.add_argument("--resolutions", nargs="+", default=["1080p"], choices=list(RESOLUTIONS))
+    p.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8], help="동시에 읽는 프로세스 수")
+    p.add_argument("--rate", type=int, default=Config.REFRESH_RATE, help="게시 주기 (Hz, 0 = 제한 없음)")
+    p.add_argument("--seconds", type=float, default=3.0, help="읽는 시간")
+    p.set_defaults(func=cmd_stream)
+
+    p = sub.add_parser("batch", help="일괄 처리: 작업 프로세스 수별 처리 속도 / 결과 일치")
+    add_common_args(p)
+    p.set_defaults(frames=120, resolutions=["1080p"], source="synthetic:ui")
+    p.add_argument("--workers", type=int, nargs="+", help="작업 프로세스 수 목록 (기본: 1, 2, 4 ... CPU 코어 수)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("repaint", help="창 그리기: 매 프레임 전체 vs 바뀐 영역만")
+    add_common_args(p)
+    p.set_defaults(frames=60, warmup=5, resolutions=["1080p"], source="synthetic:ui")
+    p.add_argument("--box", type=int, default=64, help="고정 화면 위에서 움직이는 상자 크기 (px, 0 = 소스 그대로)")
+    p.set_defaults(func=cmd_repaint)
+
+    p = sub.add_parser("partial", help="부분 처리 결과 = 전체 처리 결과 검사 (움직이는 상자 / 스크롤)")
+    add_common_args(p)
+    p.set_defaults(frames=40, resolutions=["1080p"])
+    p.add_argument("--kinds", nargs="+", default=list(SUITE_KINDS), choices=SUITE_KINDS)
+    p.add_argument("--thicknesses", nargs="+", type=int, default=[1, 3])
+    p.add_argument("--box", type=int, default=48, help="움직이는 상자 크기 (px)")
+    p.set_defaults(func=cmd_partial)
+
+    p = sub.add_parser("mailbox", help="GUI 가 느릴 때 프레임 전달: 큐 시그널 vs 최신 프레임 우편함")
+    p.add_argument("--resolutions", nargs="+", default=["1080p"], choices=list(RESOLUTIONS))
+    p.add_argument("--rate", type=int, default=Config.REFRESH_RATE, help="워커 출력 주기 (Hz)")
+    p.add_argument("--paint-ms", dest="paint_ms", type=float, default=40.0, help="GUI 의 프레임당 처리 시간 (ms)")
+    p.add_argument("--seconds", type=float, default=3.0, help="방식별 측정 시간")
+    p.set_defaults(func=cmd_mailbox)
+
+    p = sub.add_parser("processes", help="GUI 틱 지연: 스레드 처리 vs 다중 프로세스 처리")
+    add_common_args(p)
+    p.set_defaults(resolutions=["1080p"], source="synthetic:noise")
+    p.add_argument("--seconds", type=float, default=5.0, help="방식별 측정 시간")
+    p.add_argument("--rate", type=int, default=Config.REFRESH_RATE, help="GUI 틱 / 처리 주기 (Hz)")
+    p.add_argument("--busy", type=float, default=2.0, help="GUI 틱마다 Python 작업 시간 (ms)")
+    p.set_defaults(func=cmd_processes)
+
+    p = sub.add_parser("suite", help="합성 프레임 / 두께 / 자동 조절 / 출력 방식 전체 조합 측정")
+    add_common_args(p)
+    p.set_defaults(frames=30, warmup=5, resolutions=["720p", "1080p"])
+    p.add_argument("--kinds", nargs="+", default=list(SUITE_KINDS), choices=list(SUITE_KINDS))
+    p.add_argument("--thickness-values", nargs="+", type=int, default=list(SUITE_THICKNESS))
+    p.add_argument("--outputs", nargs="+", default=list(SUITE_OUTPUTS), choices=list(SUITE_OUTPUTS))
+    p.add_argument("--distinct", type=int, default=4, help="합성 프레임 수 (순환 재생)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default="bench_results.json", help="결과 JSON 파일")
+    p.set_defaults(func=cmd_suite)
+
+    p = sub.add_parser("compare", help="두 suite 결과 비교 (성능 저하 시 종료 코드 1)")
+    p.add_argument("base", help="기준 결과 JSON")
+    p.add_argument("current", help="현재 결과 JSON")
+    p.add_argument("--metric", choices=("mean", "p50", "p95"), default="p50")
+    p.add_argument("--tolerance", type=float, default=0.10, help="허용 비율 (0.10 = 10%%)")
+    p.add_argument("--min-delta", type=float, default=0.2, help="무시할 절대 차이 (ms)")
+    p.add_argument("--stages", nargs="*", default=[], help="total 외에 비교할 단계")
+    p.add_argument("-v", "--verbose", action="store_true", help="모든 항목 출력")
+    p.set_defaults(func=cmd_compare)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
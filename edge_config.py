@@ -0,0 +1,100 @@
+# 공용 설정 (Shared Settings)
+# Qt / dxcam / win32 에 의존하지 않으므로 엔진, 벤치마크 등 어디서든 import 가능
+import threading
+from collections import namedtuple
+
+
+class Config:
+    CANNY_MIN = 50
+    CANNY_MAX = 150
+    EDGE_COLOR = (0, 255, 0)  # 초록색 (RGB)
+    EDGE_THICKNESS = 1
+    EDGE_OPACITY = 255
+    REFRESH_RATE = 60
+    AUTO_SIGMA = 0.33
+    REALTIME_AUTO = False
+
+    # 엣지 검출기 (Detector): "canny" / "sobel" / "scharr" / "laplacian" / "morph"
+    #   Canny 외에는 히스테리시스 없이 임계값 하나 (CANNY_MAX 기준) 로 판정 -> 더 저렴하지만 선이 굵음
+    EDGE_DETECTOR = "canny"
+    BLUR_SIZE = 5           # 사전 가우시안 블러 크기 (0 = 끄기, 3 / 5)
+
+    # 변경 감지 (Change Detection)
+    CHANGE_DETECT = True
+    CHANGE_TILE = 128       # 타일 크기 (px)
+    CHANGE_THRESHOLD = 4    # 축소 프레임 기준 픽셀 차이 임계값 (0~255)
+    SCROLL_REUSE = True     # 스크롤 / 이동이면 이전 엣지 맵을 밀고 드러난 부분만 계산
+
+    # 타일 병렬 처리 (Tiled Parallel): 0/1 = 단일 처리
+    WORKER_THREADS = 0
+
+    # 다중 프로세스 (Multi-process): 캡처 / 엣지 처리를 별도 프로세스에서 실행 (새로 만드는 워커부터 적용)
+    MULTIPROCESS = False
+
+    # 캡처 소스 풀 (Capture Pool): 창이 모니터를 옮겨 다닐 때 카메라를 다시 만들지 않도록 반납된 카메라를 보관
+    CAPTURE_POOL_SIZE = 2       # 보관할 유휴 카메라 수 (0 = 반납 즉시 해제)
+    CAPTURE_IDLE_TIMEOUT = 30.0 # 이 시간 (초) 넘게 쓰이지 않은 카메라는 해제
+
+    # 출력 방식 (Output): "mask" = 8비트 마스크 전달 후 화면에서 색상 적용, "rgba" = 워커에서 색상 적용
+    #   "vector" = 윤곽선을 경로(QPainterPath)로 전달해 펜으로 그림, "auto" = 엣지 밀도에 따라 vector / mask
+    OUTPUT_MODE = "mask"
+    VECTOR_EPSILON = 0.0        # 윤곽선 단순화 허용 오차 (px, 0 = 단순화 없음)
+    VECTOR_MAX_DENSITY = 0.01   # 자동 선택 시 엣지 픽셀 비율이 이 값 이하이면 벡터
+    PARTIAL_REPAINT = True      # 창은 바뀐 영역만 다시 그림 (False = 프레임마다 창 전체)
+
+    # 엣지 스트림 (Edge Stream): 영역별 엣지 마스크를 공유 메모리 "<이름>_<영역 id>" 로 게시 (edge_stream.py 로 읽음)
+    EDGE_STREAM = ""            # 이름 접두사, "" = 끄기
+
+    # 실시간 자동 조절 안정화 (Auto Threshold Smoothing)
+    AUTO_SMOOTHING = 0.2        # EMA 계수 (1.0 = 평활화 없음)
+    AUTO_HYSTERESIS = 3         # 이 값 이상 움직였을 때만 임계값 반영
+    AUTO_TARGET_DENSITY = 0.0   # 목표 엣지 픽셀 비율 (0 = 끄기, 예: 0.05)
+
+    # 부하가 높을 때 처리 배율 -> 처리 주기 순으로 품질 자동 조절
+    ADAPTIVE_QUALITY = True
+
+    # 축소 처리 (Processing Scale): 엣지 검출 해상도 배율 (1.0 / 0.75 / 0.5 / 0.25)
+    PROCESSING_SCALE = 1.0
+    UPSCALE_METHOD = "thin"     # "thin" = 얇은 선 유지 (정수 배율), "nearest" = 최근접
+
+    # 성능 측정 표시 (HUD): 오버레이 좌상단에 FPS / 지연 / 단계별 시간 표시
+    SHOW_HUD = False
+
+
+def color_key(cfg):
+    # 출력 색상 설정 (바뀌면 RGBA 출력은 다시 칠해야 함, 화면은 색상표 / 펜을 다시 만듦)
+    return tuple(cfg.EDGE_COLOR), cfg.EDGE_OPACITY
+
+
+# 설정 스냅샷 (Config Snapshot)
+# Config 는 GUI 스레드만 수정하고, 다른 스레드는 publish() 로 게시된 불변 스냅샷만 읽는다.
+# 한 프레임 동안 같은 스냅샷을 사용하므로 이전 값과 새 값이 섞이지 않음.
+SETTINGS = tuple(name for name in vars(Config) if name.isupper())
+
+ConfigSnapshot = namedtuple("ConfigSnapshot", ("version",) + SETTINGS)
+
+
+class ConfigStore:
+    def __init__(self, source=Config):
+        self.source = source
+        self.lock = threading.Lock()
+        self.version = 0
+        self.current = self._capture()
+
+    def _capture(self):
+        values = {name: getattr(self.source, name) for name in SETTINGS}
+        values["EDGE_COLOR"] = tuple(values["EDGE_COLOR"])
+        return ConfigSnapshot(version=self.version, **values)
+
+    def publish(self, **changes):
+        # source 에 changes 를 반영한 뒤 새 스냅샷을 만들어 참조를 한 번에 교체
+        with self.lock:
+            for name, value in changes.items():
+                setattr(self.source, name, value)
+            self.version += 1
+            self.current = self._capture()
+            return self.current
+
+
+# GUI 와 캡처 워커가 공유하는 기본 저장소
+config_store = ConfigStore()
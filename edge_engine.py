@@ -0,0 +1,1406 @@
+# 엣지 파이프라인 엔진 (Headless Edge Pipeline)
+# Qt / dxcam / win32 에 의존하지 않는 순수 OpenCV + NumPy 구현.
+# CaptureWorker, 벤치마크(edge_bench.py) 가 같은 코드를 사용한다.
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from edge_config import ConfigStore, color_key
+
+# 단계 이름 (벤치마크 / 통계 출력 순서)
+STAGES = ("gray", "change", "motion", "auto", "scale", "blur", "canny", "dilate", "colorize", "vector")
+
+BLUR_KSIZE = 5     # 블러 크기 상한 (Config.BLUR_SIZE, 여유 픽셀 계산 기준)
+
+# 엣지 검출기 (Config.EDGE_DETECTOR)
+#   canny = 블러 -> Canny (NMS + 히스테리시스, 얇은 선), 나머지는 한 번의 필터 + 임계값 (굵은 선, 더 저렴)
+#   sobel / scharr = 기울기 크기 (L1), laplacian = 2차 미분 크기, morph = 형태학적 기울기 (팽창 - 침식)
+# 임계값은 모두 Canny 기준 (3x3 Sobel L1 기울기 크기) 으로 맞춰 같은 슬라이더 / 자동 조절 값을 그대로 사용
+#   높이 d 인 계단에서 Sobel 4d, Scharr 16d, Laplacian / morph d -> 배율로 4d 에 맞춘 뒤 high 와 비교
+DETECTORS = ("canny", "sobel", "scharr", "laplacian", "morph")
+DETECTOR_GAIN = {"sobel": 1.0, "scharr": 0.25, "laplacian": 4.0, "morph": 4.0}
+MORPH_KERNEL = np.ones((3, 3), np.uint8)
+
+
+def detector_gain(detector, blur):
+    # 블러한 계단 (시그마 s) 에서 Laplacian 최대값은 기울기 최대값의 1 / (s * sqrt(e)) 로 줄어듦
+    # Sobel 은 기울기의 8배이므로 배율 8 * s * sqrt(e) (다른 검출기는 기울기에 비례하므로 그대로)
+    if detector == "laplacian" and blur:
+        sigma = 0.3 * ((blur - 1) * 0.5 - 1) + 0.8 # OpenCV 가 ksize 로 정하는 시그마
+        return 8.0 * sigma * np.sqrt(np.e)
+    return DETECTOR_GAIN.get(detector, 1.0)
+
+# 부분 처리 시 경계 보정용 여유 픽셀: 블러 반경 + Sobel 1 + NMS 1
+# 엣지 후보 (Canny 의 NMS 통과 + low 초과, 다른 검출기의 결과) 는 이 거리 안의 픽셀로만 정해진다.
+# Canny 히스테리시스 연결은 거리 제한이 없으므로 상태 맵으로 따로 처리 (_relink 참고)
+EDGE_RADIUS = BLUR_KSIZE // 2 + 2
+
+# Canny 부분 처리용 상태 맵 값 (EdgeEngine._hysteresis_map)
+# 약한 후보 = NMS 통과 + low 초과, 강한 후보 = 그중 high 초과 (Canny(low, low) / Canny(high, high))
+# 약한 후보끼리 8-연결로 이어진 덩어리는 강한 후보와 맞닿아 있으면 엣지 (Canny 히스테리시스와 같은 결과)
+WEAK, WEAK_EDGE, STRONG = 2, 3, 255
+PENDING, DONE, DONE_EDGE = 1, 5, 6  # 판정 중 / 판정 끝 (영역 하나를 마치면 WEAK / WEAK_EDGE 로 되돌림)
+HYST_EDGE_LUT = np.zeros(256, np.uint8)
+HYST_EDGE_LUT[[WEAK_EDGE, STRONG]] = 255
+HYST_DONE_LUT = np.arange(256, dtype=np.uint8)
+HYST_DONE_LUT[[DONE, DONE_EDGE]] = WEAK, WEAK_EDGE
+HYST_FLOOD = 8 | cv2.FLOODFILL_FIXED_RANGE | (1 << 8)
+
+# 밴드 병렬 처리 시 여유 픽셀 (블러 / Sobel / NMS 경계 효과가 밴드 안쪽에 닿지 않도록)
+BAND_HALO = BLUR_KSIZE // 2 + 8
+
+# 병렬 처리 시 밴드 최소 높이 (이보다 작으면 스레드 오버헤드가 더 큼)
+MIN_BAND_HEIGHT = 128
+
+# 처리 배율 하한
+MIN_SCALE = 0.25
+
+# 출력 버퍼별 부분 갱신을 위해 보관하는 최근 변경 이력 수
+DIRTY_HISTORY = 8
+
+# 화면 부분 갱신: 바뀐 사각형이 이보다 많으면 감싸는 사각형 하나로 합쳐서 전달
+MAX_DIRTY_RECTS = 32
+
+# 변경 영역이 이 비율을 넘으면 부분 처리 대신 전체 처리
+FULL_REPROCESS_RATIO = 0.5
+
+# 스크롤 재사용 (Motion Reuse)
+SCROLL_EST_WIDTH = 256      # 위상 상관 추정에 사용할 최대 폭 (px)
+SCROLL_MIN_RESPONSE = 0.3   # 위상 상관 응답이 이 값 미만이면 신뢰하지 않음
+SCROLL_MAX_MISMATCH = 0.25  # 이동 후에도 다른 픽셀 비율이 이보다 크면 스크롤이 아님
+SCROLL_SAMPLE_STEP = 8      # 원본 해상도 검증 시 행 간격
+
+
+# 윤곽선(벡터)으로 출력할 수 있는 출력 방식 ("auto" = 엣지 밀도에 따라 벡터 / 마스크 선택)
+VECTOR_OUTPUTS = ("vector", "auto")
+
+
+def edge_map(src, detector, low, high, dst=None, scratch=None, gain=None):
+    # (블러한) 그레이 -> 엣지 마스크 (0 / 255)
+    # scratch: Canny 외 검출기의 중간 버퍼 (int16, int16, uint8), 없으면 새로 할당
+    # gain: 응답을 Canny 기준으로 맞추는 배율 (없으면 블러 없는 기준, detector_gain 참고)
+    if detector == "canny":
+        return cv2.Canny(src, low, high, dst)
+    if dst is None:
+        dst = np.empty(src.shape, np.uint8)
+    if gain is None:
+        gain = DETECTOR_GAIN[detector]
+    if detector == "morph":
+        cv2.morphologyEx(src, cv2.MORPH_GRADIENT, MORPH_KERNEL, dst=dst)
+        cv2.threshold(dst, high / gain, 255, cv2.THRESH_BINARY, dst=dst)
+        return dst
+    if scratch is None:
+        scratch = (np.empty(src.shape, np.int16), np.empty(src.shape, np.int16), np.empty(src.shape, np.uint8))
+    gx, gy, mag = scratch
+    if detector == "laplacian":
+        cv2.Laplacian(src, cv2.CV_16S, dst=gx, ksize=1)
+        cv2.convertScaleAbs(gx, dst=dst, alpha=gain)
+    else:
+        if detector == "sobel":
+            cv2.Sobel(src, cv2.CV_16S, 1, 0, dst=gx, ksize=3)
+            cv2.Sobel(src, cv2.CV_16S, 0, 1, dst=gy, ksize=3)
+        else:
+            cv2.Scharr(src, cv2.CV_16S, 1, 0, dst=gx)
+            cv2.Scharr(src, cv2.CV_16S, 0, 1, dst=gy)
+        cv2.convertScaleAbs(gx, dst=mag, alpha=gain)
+        cv2.convertScaleAbs(gy, dst=dst, alpha=gain)
+        cv2.add(mag, dst, dst=dst)
+    cv2.threshold(dst, high, 255, cv2.THRESH_BINARY, dst=dst)
+    return dst
+
+
+def tiles_to_rects(dirty, tile, pad, height, width, oy=0, ox=0):
+    # 타일 격자 (bool, ty x tx) -> 사각형 목록 (같은 행에서 이웃한 타일은 하나로 병합)
+    # tile: 원본 좌표 타일 크기, pad: 사방으로 넓힐 픽셀, (oy, ox): 격자 원점
+    rects = []
+    ty, tx = dirty.shape
+    for y in range(ty):
+        row = dirty[y]
+        x = 0
+        while x < tx:
+            if not row[x]:
+                x += 1
+                continue
+            x_start = x
+            while x < tx and row[x]:
+                x += 1
+            rects.append((
+                max(0, oy + y * tile - pad), min(height, oy + (y + 1) * tile + pad),
+                max(0, ox + x_start * tile - pad), min(width, ox + x * tile + pad),
+            ))
+    return rects
+
+
+def dirty_tiles(padded, tile, threshold, ws, name):
+    # 타일 배수 크기 버퍼 -> 타일별 최대값이 threshold 보다 큰 타일 (bool 격자, ws 버퍼 재사용)
+    ty, tx = padded.shape[0] // tile, padded.shape[1] // tile
+    peak = ws.get(name, (ty, tx))
+    np.max(padded.reshape(ty, tile, tx, tile), axis=(1, 3), out=peak)
+    return np.greater(peak, threshold, out=ws.get(name + "_dirty", (ty, tx), np.bool_))
+
+
+def clip_rects(rects, region):
+    # 사각형 목록을 region (y0, y1, x0, x1) 안으로 자르고 region 기준 좌표로 변환
+    ry0, ry1, rx0, rx1 = region
+    clipped = []
+    for y0, y1, x0, x1 in rects:
+        y0, y1 = max(y0, ry0) - ry0, min(y1, ry1) - ry0
+        x0, x1 = max(x0, rx0) - rx0, min(x1, rx1) - rx0
+        if y1 > y0 and x1 > x0:
+            clipped.append((y0, y1, x0, x1))
+    return clipped
+
+
+def shift_image(image, dx, dy, tmp):
+    # image 내용을 (dx, dy) 만큼 제자리 이동: new[y, x] = old[y - dy, x - dx]
+    # 드러난 영역은 이전 값이 남으므로 호출한 쪽에서 다시 계산. tmp: image 크기 이상의 버퍼
+    h, w = image.shape[:2]
+    src = image[max(0, -dy):h - max(0, dy), max(0, -dx):w - max(0, dx)]
+    tmp = tmp[:src.shape[0], :src.shape[1]]
+    np.copyto(tmp, src)
+    image[max(0, dy):h - max(0, -dy), max(0, dx):w - max(0, -dx)] = tmp
+
+
+def split_bands(height, count):
+    # 높이를 count 개의 가로 밴드 (y0, y1) 로 분할
+    step = -(-height // count)
+    return [(y, min(height, y + step)) for y in range(0, height, step)]
+
+
+def upscale_thin(small, f, shape, out=None, workspace=None):
+    # 얇은 선 유지 확대 (Thin-line Upscaling, 정수 배율 f)
+    # 최근접 확대는 1px 선을 f px 두께로 만들므로, 대신 각 엣지 픽셀을 블록 중심에 찍고
+    # 8-이웃 엣지끼리 중심을 잇는 1px 선분을 그린다.
+    # out / workspace: 결과 / 중간 버퍼 재사용 (없으면 새로 할당)
+    if out is None:
+        out = np.zeros(shape, np.uint8)
+    else:
+        out.fill(0)
+    o = f // 2
+    sh, sw = small.shape
+    ws = workspace if workspace is not None else Workspace()
+
+    def put(y, x, mask):
+        # out[y::f, x::f] 에 mask 를 OR (크기는 겹치는 만큼만)
+        view = out[y::f, x::f]
+        hh, ww = min(view.shape[0], mask.shape[0]), min(view.shape[1], mask.shape[1])
+        np.bitwise_or(view[:hh, :ww], mask[:hh, :ww], out=view[:hh, :ww])
+
+    put(o, o, small)
+    right = cv2.bitwise_and(small[:, :-1], small[:, 1:], dst=ws.get("thin_right", (sh, sw - 1)))
+    down = cv2.bitwise_and(small[:-1, :], small[1:, :], dst=ws.get("thin_down", (sh - 1, sw)))
+    diag = cv2.bitwise_and(small[:-1, :-1], small[1:, 1:], dst=ws.get("thin_diag", (sh - 1, sw - 1)))
+    anti = cv2.bitwise_and(small[:-1, 1:], small[1:, :-1], dst=ws.get("thin_anti", (sh - 1, sw - 1)))
+    for k in range(1, f):
+        put(o, o + k, right)
+        put(o + k, o, down)
+        put(o + k, o + k, diag)
+        put(o + k, o + f - k, anti)
+    return out
+
+
+def extract_contours(edges, epsilon=0.0):
+    # 엣지 마스크 -> 윤곽선 (points: 모든 윤곽선의 점 N x 2 int32 를 이어붙임, counts: 윤곽선별 점 수)
+    # epsilon > 0 이면 approxPolyDP 로 단순화 (허용 오차 px)
+    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    if epsilon > 0:
+        contours = [cv2.approxPolyDP(c, epsilon, True) for c in contours]
+    if not contours:
+        return np.empty((0, 2), np.int32), np.empty(0, np.int32)
+    counts = np.fromiter((len(c) for c in contours), np.int32, len(contours))
+    return np.concatenate(contours).reshape(-1, 2), counts
+
+
+class PipelinePlan:
+    # 설정 스냅샷 하나에 대해 미리 계산해 둔 처리 계획
+    # 스냅샷 버전이나 처리 배율이 바뀔 때만 다시 만들고, 프레임마다 설정을 다시 읽지 않는다.
+    def __init__(self, cfg, quality_scale=1.0):
+        self.cfg = cfg
+        self.version = cfg.version
+        self.quality_scale = quality_scale
+        self.threads = cfg.WORKER_THREADS
+
+        # 팽창 커널 (두께 1 = 팽창 없음)
+        thickness = cfg.EDGE_THICKNESS
+        self.kernel = np.ones((thickness, thickness), np.uint8) if thickness > 1 else None
+        # 벡터 / 자동 출력: 윤곽선은 얇은 선에서 뽑으므로 엣지 맵에는 팽창을 적용하지 않고
+        # 두께는 출력할 때 적용 (벡터 = 펜 두께, 비트맵 = output_kernel 로 팽창)
+        self.output_kernel = None
+        if cfg.OUTPUT_MODE in VECTOR_OUTPUTS:
+            self.output_kernel, self.kernel = self.kernel, None
+        self.detector = cfg.EDGE_DETECTOR if cfg.EDGE_DETECTOR in DETECTORS else "canny"
+        self.halo = EDGE_RADIUS
+        # 사전 블러 (0 = 끄기, 홀수 / 상한 BLUR_KSIZE 로 맞춤)
+        blur = min(BLUR_KSIZE, cfg.BLUR_SIZE | 1) if cfg.BLUR_SIZE > 1 else 0
+        self.blur_ksize = (blur, blur) if blur else None
+        self.gain = detector_gain(self.detector, blur)
+
+        # 처리 배율: 정수 배율 + 얇은 선 유지면 factor > 0
+        scale = cfg.PROCESSING_SCALE * quality_scale
+        self.scale = 1.0 if scale >= 1.0 else max(MIN_SCALE, scale)
+        factor = 1.0 / self.scale
+        thin = cfg.UPSCALE_METHOD == "thin" and abs(factor - round(factor)) < 1e-6
+        self.factor = int(round(factor)) if thin and self.scale < 1.0 else 0
+        # 비정수 배율에서 INTER_AREA 는 느리므로 선형 보간 사용 (배율 > 0.5 에서는 앨리어싱 영향 작음)
+        self.interp = cv2.INTER_AREA if self.factor or self.scale <= 0.5 else cv2.INTER_LINEAR
+
+        # 색상표: 마스크 값 -> RGBA 채널별 LUT (0 = 투명)
+        self.color_key = color_key(cfg)
+        (r, g, b), a = self.color_key
+        self.color_luts = []
+        for value in (r, g, b, a):
+            lut = np.full(256, value, np.uint8)
+            lut[0] = 0
+            self.color_luts.append(lut)
+
+        # 엣지 맵을 다시 계산해야 하는 설정 (임계값은 자동 조절이 바꾸므로 엔진에서 추가)
+        self.edge_params = (thickness, self.scale, cfg.UPSCALE_METHOD, self.output_kernel is not None,
+                            self.detector, self.blur_ksize)
+
+        # 실행할 단계 목록
+        stages = ["gray"]
+        if cfg.CHANGE_DETECT:
+            stages.append("change")
+            if cfg.SCROLL_REUSE and self.scale >= 1.0:
+                stages.append("motion")
+        if cfg.REALTIME_AUTO:
+            stages.append("auto")
+        if self.scale < 1.0:
+            stages.append("scale")
+        if self.blur_ksize is not None:
+            stages.append("blur")
+        stages.append("canny")
+        if self.kernel is not None:
+            stages.append("dilate")
+        stages.append("colorize")
+        self.stages = tuple(stages)
+
+
+def to_gray(frame, dst=None):
+    # 입력 채널 수에 맞춰 그레이스케일 변환 (dst: 결과 버퍼 재사용)
+    if frame.ndim == 2:
+        return frame
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=dst)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=dst)
+
+
+class Workspace:
+    # 미리 할당한 중간 버퍼 (Preallocated Intermediates)
+    # 이름별로 한 번 할당해 두고 크기가 바뀔 때만 다시 할당 -> 정상 상태에서는 프레임마다 할당 없음
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0 # 누적 할당 횟수 (측정용)
+
+    def get(self, name, shape, dtype=np.uint8):
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(shape, dtype)
+            self.allocations += 1
+        return buffer
+
+    def region(self, name, shape, capacity, dtype=np.uint8):
+        # capacity 크기 버퍼의 왼쪽 위 shape 부분 (부분 처리처럼 크기가 매번 다른 경우, 재할당 없음)
+        return self.get(name, capacity, dtype)[:shape[0], :shape[1]]
+
+    def clear(self):
+        self.buffers.clear()
+
+
+class ChangeDetector:
+    # 축소 프레임 비교로 변경된 타일 찾기
+    SCALE = 4
+
+    def __init__(self):
+        self.prev_small = None
+        self.before = None # 직전 프레임의 축소 프레임 (이동 추정용)
+        # 축소 프레임은 두 버퍼를 번갈아 사용 (현재 / 이전)
+        self.workspace = Workspace()
+        self.flip = False
+
+    def reset(self):
+        self.prev_small = None
+
+    def update(self, gray, tile, threshold):
+        # 반환값: None = 비교 기준 없음 (전체 처리), [] = 변화 없음,
+        #         [(y0, y1, x0, x1), ...] = 변경된 영역 (원본 좌표)
+        h, w = gray.shape
+        s = self.SCALE
+        ws = self.workspace
+        sh, sw = -(-h // s), -(-w // s)
+        self.flip = not self.flip
+        small = ws.get("small_a" if self.flip else "small_b", (sh, sw))
+        cv2.resize(gray, (sw, sh), dst=small, interpolation=cv2.INTER_AREA)
+        prev, self.prev_small = self.prev_small, small
+        self.before = prev
+        if prev is None or prev.shape != small.shape:
+            return None
+
+        # 타일별 최대 차이 (축소 좌표 기준, 타일 배수로 맞춘 버퍼의 여백은 0 으로 유지)
+        ts = max(1, tile // s)
+        ty, tx = -(-sh // ts), -(-sw // ts)
+        padded = ws.get("diff", (ty * ts, tx * ts))
+        padded[sh:] = 0
+        padded[:, sw:] = 0
+        diff = padded[:sh, :sw]
+        cv2.absdiff(small, prev, dst=diff)
+        if not cv2.countNonZero(diff):
+            return []
+
+        dirty = dirty_tiles(padded, ts, threshold, ws, "tiles")
+
+        # 축소 보간 오차를 덮기 위해 원본 좌표에서 s 픽셀 확장
+        return tiles_to_rects(dirty, ts * s, s, h, w)
+
+
+class ScrollDetector:
+    # 전역 이동 추정 (Global Translation)
+    # 축소 프레임의 위상 상관으로 대략적인 이동량을 구한 뒤, 원본 해상도에서 주변 정수 이동량을
+    # 비교해 확정한다. 문서 / 코드 편집기 / 지도처럼 화면 전체가 밀리는 경우를 찾는 용도.
+    def __init__(self):
+        self.workspace = Workspace()
+        self.window = None
+
+    def estimate(self, prev_small, small, scale, prev_gray, gray):
+        # 반환: (dx, dy) 원본 좌표 정수 이동량 (new[y, x] = old[y - dy, x - dx]), 신뢰할 수 없으면 None
+        ws = self.workspace
+        sh, sw = small.shape
+        k = max(1, -(-sw // SCROLL_EST_WIDTH))
+        # DFT 가 빠른 크기 (2, 3, 5 의 곱) 로 잘라서 사용
+        ew, eh = self._dft_size(sw // k), self._dft_size(sh // k)
+        if ew < 16 or eh < 16:
+            return None
+        pair = []
+        for name, src in (("prev", prev_small), ("cur", small)):
+            reduced = src if k == 1 else cv2.resize(
+                src, (sw // k, sh // k), dst=ws.get(name, (sh // k, sw // k)),
+                interpolation=cv2.INTER_AREA)
+            f32 = ws.get(name + "_f32", (eh, ew), np.float32)
+            np.copyto(f32, reduced[:eh, :ew])
+            pair.append(f32)
+        if self.window is None or self.window.shape != (eh, ew):
+            self.window = cv2.createHanningWindow((ew, eh), cv2.CV_32F)
+        (dx, dy), response = cv2.phaseCorrelate(pair[0], pair[1], self.window)
+        if response < SCROLL_MIN_RESPONSE:
+            return None
+
+        # 정수 이동량 확정: 축소 프레임에서 한 번, 원본 해상도에서 한 번 주변을 비교
+        shift = (int(round(dx * k)), int(round(dy * k)))
+        if k > 1:
+            shift = self._refine(prev_small, small, shift, k // 2 + 1, 2)
+        if shift is None:
+            return None
+        shift = self._refine(prev_gray, gray, (shift[0] * scale, shift[1] * scale),
+                             scale // 2 + 1, SCROLL_SAMPLE_STEP)
+        if shift is None or shift == (0, 0):
+            return None
+        ex, ey = shift
+
+        # 이동 후 다른 픽셀 비율이 크면 스크롤이 아닌 화면 전환
+        h, w = gray.shape
+        m = max(abs(ex), abs(ey))
+        cur = gray[m:h - m:SCROLL_SAMPLE_STEP, m:w - m]
+        diff = ws.get("verify", (-(-h // SCROLL_SAMPLE_STEP), w))[:cur.shape[0], :cur.shape[1]]
+        cv2.absdiff(cur, prev_gray[m - ey:h - m - ey:SCROLL_SAMPLE_STEP, m - ex:w - m - ex], dst=diff)
+        cv2.threshold(diff, 8, 255, cv2.THRESH_BINARY, dst=diff)
+        if cv2.countNonZero(diff) > diff.size * SCROLL_MAX_MISMATCH:
+            return None
+        return ex, ey
+
+    @staticmethod
+    def _refine(prev, cur, shift, r, step):
+        # shift 주변 ±r 정수 이동량 중 차이(L1)가 가장 작은 값 (세로 -> 가로 순서), 이동이 너무 크면 None
+        h, w = cur.shape
+        ex, ey = shift
+        m = max(abs(ex), abs(ey)) + r + 1
+        if 2 * m >= min(h, w) // 2:
+            return None
+        target = cur[m:h - m:step, m:w - m]
+
+        def error(x, y):
+            return cv2.norm(target, prev[m - y:h - m - y:step, m - x:w - m - x], cv2.NORM_L1)
+
+        ey = min(range(ey - r, ey + r + 1), key=lambda y: error(ex, y))
+        ex = min(range(ex - r, ex + r + 1), key=lambda x: error(x, ey))
+        return ex, ey
+
+    @staticmethod
+    def _dft_size(n):
+        # n 이하에서 가장 큰 DFT 최적 크기
+        while n > 1 and cv2.getOptimalDFTSize(n) != n:
+            n -= 1
+        return n
+
+
+class EdgeEngine:
+    def __init__(self, store=None):
+        # store: 설정 스냅샷 저장소 (없으면 현재 Config 로 새로 만듦)
+        self.store = store if store is not None else ConfigStore()
+        self.plan = None
+        self.request_one_shot_auto = False # 1회성 자동 조절 요청 플래그
+        self.change_detector = ChangeDetector()
+        self.scroll_detector = ScrollDetector()
+        self.gray = self.prev_gray = None # 이동 추정용 현재 / 직전 그레이 프레임
+        self.auto_threshold = AutoThreshold()
+        self.thresholds_changed = False # 자동 조절로 low / high 가 바뀜 (GUI 동기화용)
+
+        # 중간 결과 버퍼 (영역 크기가 바뀔 때만 재할당)
+        self.workspace = Workspace()
+
+        # 이번 프레임에 사용하는 Canny 임계값
+        # 자동 조절 결과는 GUI 가 다시 게시하기 전까지 auto_thresholds 로 스냅샷 값보다 우선
+        self.low = self.high = None
+        self.auto_thresholds = None
+        self.recent_auto = deque(maxlen=4)
+
+        # 최적화 변수 (이전 프레임 결과 유지)
+        self.edges = None
+        self.outputs = {} # process() 용 출력 버퍼 {output: (buffer, serial, color)}
+        self.vector = None # 마지막으로 추출한 윤곽선 ((serial, epsilon, region), points, counts)
+        self.last_edge_params = None
+        self.force_full = True
+        self.hysteresis = None # Canny 부분 처리용 상태 맵 (_hysteresis_map)
+
+        # 타일 병렬 처리용 스레드 풀 (OpenCV 는 GIL 을 해제함)
+        self.pool = None
+        self.pool_size = 0
+
+        # 마지막 프레임에서 갱신된 영역 [(y0, y1, x0, x1), ...]
+        self.dirty_rects = []
+
+        # 변경 일련번호 / 최근 변경 이력 [(serial, rects), ...]
+        # 출력 버퍼마다 마지막으로 그린 serial 이후의 변경 영역만 다시 칠함
+        self.serial = 0
+        self.history = deque(maxlen=DIRTY_HISTORY)
+
+        # 부하에 따른 추가 처리 배율 (스케줄러가 조절, 1.0 = 조절 없음)
+        # 실제 배율 = PROCESSING_SCALE * quality_scale
+        self.quality_scale = 1.0
+
+        # 마지막 프레임의 단계별 소요 시간 (초)
+        self.timings = dict.fromkeys(STAGES, 0.0)
+
+    def trigger_auto_adjust(self):
+        self.request_one_shot_auto = True
+
+    def invalidate(self):
+        # 다음 프레임은 변경 여부와 관계없이 전체 처리 후 출력
+        self.force_full = True
+
+    def prepare(self, cfg=None):
+        # 이번 프레임에 사용할 스냅샷과 계획 확정 (버전 / 처리 배율이 바뀔 때만 다시 만듦)
+        if cfg is None:
+            cfg = self.store.current
+        plan = self.plan
+        if plan is None or plan.version != cfg.version or plan.quality_scale != self.quality_scale:
+            thresholds = (cfg.CANNY_MIN, cfg.CANNY_MAX)
+            if (plan is not None and thresholds != (plan.cfg.CANNY_MIN, plan.cfg.CANNY_MAX)
+                    and thresholds not in self.recent_auto):
+                # 자동 조절 결과가 되돌아온 것이 아니라 사용자가 바꾼 값 -> 그 값을 우선
+                self.auto_thresholds = None
+            plan = self.plan = PipelinePlan(cfg, self.quality_scale)
+        if self.auto_thresholds is not None:
+            self.low, self.high = self.auto_thresholds
+        else:
+            self.low, self.high = cfg.CANNY_MIN, cfg.CANNY_MAX
+        return plan
+
+    def process(self, frame, output="rgba"):
+        # BGR(A)/Gray 프레임 -> 출력 버퍼 (다음 호출에서 덮어써짐)
+        #   output="rgba": H x W x 4 RGBA, output="mask": H x W 8비트 마스크
+        #   output="vector": 윤곽선 (points, counts), extract_contours 참고
+        #   output="auto": 엣지 밀도에 따라 "vector" 또는 "mask" (output_kind 참고)
+        # 화면과 설정 모두 변하지 않았으면 None 반환 (재출력 불필요)
+        changed = self.update(frame)
+        if output == "auto":
+            output = self.output_kind(mode="auto")
+        if output == "vector":
+            if not changed and self.vector is not None:
+                return None
+            return self.contours()
+        color = self.plan.color_key if output == "rgba" else None
+        buffer, serial, last_color = self.outputs.get(output, (None, None, None))
+        if not changed and color == last_color and buffer is not None:
+            return None
+        shape = self.edges.shape + ((4,) if output == "rgba" else ())
+        if buffer is None or buffer.shape != shape:
+            buffer = np.empty(shape, dtype=np.uint8)
+            serial = None
+        if color != last_color:
+            serial = None
+        serial = self.render(buffer, serial)
+        self.outputs[output] = (buffer, serial, color)
+        return buffer
+
+    def update(self, frame, cfg=None):
+        # 엣지 맵 갱신. 화면과 엣지 설정 모두 변하지 않았으면 False
+        # (색상 / 투명도는 출력 단계의 일이므로 여기서는 보지 않음)
+        # cfg: 이번 프레임의 설정 스냅샷 (없으면 저장소의 최신 스냅샷)
+        plan = self.prepare(cfg)
+        cfg = plan.cfg
+        stages = plan.stages
+        timings = self.timings
+        clock = time.perf_counter
+        for name in STAGES:
+            timings[name] = 0.0
+
+        t0 = clock()
+        gray = self._to_gray(frame, "motion" in stages)
+        t1 = clock()
+        timings["gray"] = t1 - t0
+
+        # 변경 감지 (Change Detection)
+        shape = gray.shape
+        if "change" in stages:
+            rects = self.change_detector.update(gray, cfg.CHANGE_TILE, cfg.CHANGE_THRESHOLD)
+        else:
+            rects = None
+        t2 = clock()
+        timings["change"] = t2 - t1
+
+        full = (rects is None or self.force_full or self.edges is None
+                or self.edges.shape != shape)
+        changed = full or bool(rects)
+
+        # 자동 조절 로직 (화면이 바뀐 경우에만 다시 계산, 1회성 요청은 즉시 반영)
+        if self.request_one_shot_auto or ("auto" in stages and changed):
+            if self.calculate_auto_threshold(gray, instant=self.request_one_shot_auto):
+                self.thresholds_changed = True
+            self.request_one_shot_auto = False
+        timings["auto"] = clock() - t2
+
+        edge_params = (self.low, self.high) + plan.edge_params
+        if edge_params != self.last_edge_params:
+            full = True
+
+        if not full and not rects:
+            self.dirty_rects = []
+            return False
+
+        moved = False
+        if not full:
+            # 축소 처리 중에는 부분 갱신 대신 (이미 저렴한) 전체 처리
+            area = sum((y1 - y0) * (x1 - x0) for y0, y1, x0, x1 in rects)
+            full = "scale" in stages or area > shape[0] * shape[1] * FULL_REPROCESS_RATIO
+            if full and "motion" in stages:
+                # 변경 영역이 넓으면 스크롤 / 이동인지 확인 -> 이전 엣지 맵을 밀고 드러난 부분만 계산
+                t0 = clock()
+                motion = self._reuse_motion(gray)
+                timings["motion"] = clock() - t0
+                if motion is not None:
+                    full, moved, rects = False, True, motion
+        if full:
+            if self.edges is None or self.edges.shape != shape:
+                self.history.clear()
+            # 엣지 맵도 workspace 버퍼에 직접 씀 (부분 처리는 이 버퍼를 그대로 갱신)
+            self.edges = self.detect_edges(gray)
+            self.hysteresis = None
+            rects = [(0, shape[0], 0, shape[1])]
+        else:
+            rects = self._compute_rects(gray, rects, moved)
+            if moved:
+                # 화면 전체가 이동했으므로 출력은 전체 갱신
+                rects = [(0, shape[0], 0, shape[1])]
+
+        # 폐루프 자동 조절: 목표 엣지 밀도에 맞춰 다음 프레임 임계값 보정
+        if "auto" in stages and cfg.AUTO_TARGET_DENSITY > 0:
+            density = cv2.countNonZero(self.edges) / float(shape[0] * shape[1])
+            self.auto_threshold.track_density(density, cfg.AUTO_TARGET_DENSITY)
+
+        self.last_edge_params = edge_params
+        self.force_full = False
+        self.dirty_rects = rects
+        self.serial += 1
+        self.history.append((self.serial, rects))
+        return True
+
+    def _to_gray(self, frame, keep_previous):
+        # 그레이스케일 변환 (workspace 버퍼)
+        # keep_previous: 두 버퍼를 번갈아 써서 직전 프레임(prev_gray)을 유지 (이동 추정용)
+        ws = self.workspace
+        shape = frame.shape[:2]
+        if not keep_previous:
+            self.gray = self.prev_gray = None
+            return to_gray(frame, ws.get("gray", shape) if frame.ndim == 3 else None)
+        buffer = ws.get("gray_b" if self.gray is ws.buffers.get("gray_a") else "gray_a", shape)
+        if frame.ndim == 2:
+            np.copyto(buffer, frame)
+        else:
+            to_gray(frame, buffer)
+        self.prev_gray, self.gray = self.gray, buffer
+        return buffer
+
+    def _reuse_motion(self, gray):
+        # 전역 이동이면 엣지 맵을 밀고 다시 계산할 영역 목록 반환, 아니면 None
+        prev_gray = self.prev_gray
+        detector = self.change_detector
+        if prev_gray is None or prev_gray.shape != gray.shape or detector.before is None:
+            return None
+        shift = self.scroll_detector.estimate(
+            detector.before, detector.prev_small, detector.SCALE, prev_gray, gray)
+        if shift is None:
+            return None
+        dx, dy = shift
+        h, w = gray.shape
+        plan = self.plan
+        halo = plan.halo
+
+        # 드러난 띠 + 이전 프레임 경계였던 부분 (블러 / 히스테리시스 경계 효과) 다시 계산
+        rects = []
+        if dy > 0:
+            rects += [(0, min(h, dy + halo), 0, w), (max(0, h - halo), h, 0, w)]
+        elif dy < 0:
+            rects += [(max(0, h + dy - halo), h, 0, w), (0, min(h, halo), 0, w)]
+        if dx > 0:
+            rects += [(0, h, 0, min(w, dx + halo)), (0, h, max(0, w - halo), w)]
+        elif dx < 0:
+            rects += [(0, h, max(0, w + dx - halo), w), (0, h, 0, min(w, halo))]
+
+        # 이동으로 설명되지 않는 변화 (고정 헤더, 스크롤바 등) -> 타일 단위로 추가
+        cfg = plan.cfg
+        ws = self.workspace
+        oy0, oy1 = max(0, dy), h + min(0, dy)
+        ox0, ox1 = max(0, dx), w + min(0, dx)
+        oh, ow = oy1 - oy0, ox1 - ox0
+        tile = cfg.CHANGE_TILE
+        ty, tx = -(-h // tile), -(-w // tile)
+        # 타일 배수 크기 버퍼의 여백은 0 으로 유지 (ChangeDetector 와 같은 방식)
+        padded = ws.get("motion_diff", (ty * tile, tx * tile))
+        padded[oh:] = 0
+        padded[:, ow:] = 0
+        diff = padded[:oh, :ow]
+        cv2.absdiff(gray[oy0:oy1, ox0:ox1], prev_gray[oy0 - dy:oy1 - dy, ox0 - dx:ox1 - dx], dst=diff)
+        dirty = dirty_tiles(padded, tile, cfg.CHANGE_THRESHOLD, ws, "motion_tiles")
+        rects += tiles_to_rects(dirty, tile, 0, h, w, oy0, ox0)
+
+        area = sum((y1 - y0) * (x1 - x0) for y0, y1, x0, x1 in rects)
+        if area > h * w * FULL_REPROCESS_RATIO:
+            return None
+        # 팽창 전 엣지 맵 (과 Canny 상태 맵) 을 밀고, 팽창은 _compute_rects 뒤에 전체를 다시 적용
+        shift_image(self._base_edges(), dx, dy, ws.get("shift", (h, w)))
+        if self.hysteresis is not None:
+            shift_image(self.hysteresis, dx, dy, ws.get("shift", (h, w)))
+        return rects
+
+    def rects_since(self, since):
+        # since 이후 변경된 영역 목록. 이력이 부족하면 None (전체 갱신)
+        if since == self.serial:
+            return []
+        if since is None or not self.history or since < self.history[0][0] - 1:
+            return None
+        rects = []
+        for serial, changed in self.history:
+            if serial > since:
+                rects.extend(changed)
+        return rects
+
+    def dirty_since(self, since, region=None):
+        # 화면 부분 갱신용: since 이후 출력이 바뀐 영역 [(y0, y1, x0, x1), ...] (region 기준 좌표)
+        # 알 수 없으면 (이력 부족, 출력 단계에서 두께 적용) None = 전체
+        rects = self.rects_since(since)
+        if rects is None or (rects and self.plan.output_kernel is not None):
+            return None
+        if region is not None:
+            rects = clip_rects(rects, region)
+        if len(rects) > MAX_DIRTY_RECTS:
+            rects = [(min(r[0] for r in rects), max(r[1] for r in rects),
+                      min(r[2] for r in rects), max(r[3] for r in rects))]
+        return rects
+
+    def render(self, out, since=None, region=None):
+        # 엣지 맵을 out 에 출력하고 현재 serial 반환
+        #   out (H x W x 4): RGBA 로 색 입히기
+        #   out (H x W)    : 8비트 마스크 그대로 복사 (색상은 화면에서 적용)
+        # since: out 에 마지막으로 그린 serial (해당 시점 이후 변경 영역만 갱신)
+        # region: 엣지 맵의 일부 (y0, y1, x0, x1) 만 출력 (여러 창이 한 엣지 맵을 나눠 쓰는 경우)
+        rects = self.rects_since(since)
+        edges = self.edges
+        kernel = self.plan.output_kernel
+        if kernel is not None and rects != []:
+            # 벡터 / 자동 출력에서 비트맵으로 낼 때는 여기서 두께 적용 (전체)
+            t0 = time.perf_counter()
+            edges = cv2.dilate(edges, kernel, dst=self.workspace.get("thick", edges.shape))
+            self.timings["dilate"] += time.perf_counter() - t0
+            rects = None
+        if region is not None:
+            y0, y1, x0, x1 = region
+            edges = edges[y0:y1, x0:x1]
+            if rects:
+                rects = clip_rects(rects, region)
+        if out.ndim == 2:
+            self.copy_mask(edges, out, rects)
+        else:
+            self.colorize(edges, out, rects)
+        return self.serial
+
+    def output_kind(self, region=None, mode=None):
+        # 이번 프레임의 출력 방식 ("vector" / "mask" / "rgba"), mode 를 주지 않으면 설정의 OUTPUT_MODE
+        # 자동: 엣지가 드물면 윤곽선, 많으면 마스크 (경계는 edge_bench.py vector 로 측정)
+        cfg = self.plan.cfg
+        mode = mode or cfg.OUTPUT_MODE
+        if mode == "auto":
+            edges = self.edges if region is None else self.edges[region[0]:region[1], region[2]:region[3]]
+            density = cv2.countNonZero(edges) / float(edges.size)
+            mode = "vector" if density <= cfg.VECTOR_MAX_DENSITY else "mask"
+        return mode
+
+    def contours(self, region=None):
+        # 현재 엣지 맵 (또는 region 부분)의 윤곽선 (points, counts), 좌표는 region 기준
+        # 엣지 맵이 바뀌지 않았으면 이전 결과 재사용
+        epsilon = self.plan.cfg.VECTOR_EPSILON
+        key = (self.serial, epsilon, region)
+        vector = self.vector
+        if vector is None or vector[0] != key:
+            t0 = time.perf_counter()
+            edges = self.edges if region is None else self.edges[region[0]:region[1], region[2]:region[3]]
+            points, counts = extract_contours(edges, epsilon)
+            self.timings["vector"] += time.perf_counter() - t0
+            vector = self.vector = (key, points, counts)
+        return vector[1], vector[2]
+
+    def _get_pool(self, threads):
+        if self.pool is None or self.pool_size != threads:
+            if self.pool is not None:
+                self.pool.shutdown(wait=False)
+            self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="edge")
+            self.pool_size = threads
+        return self.pool
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    def _run_stages(self, gray, kernel, blurred=None, canny=None, out=None, scratch=None):
+        # 블러 -> 엣지 검출 -> 팽창, (결과, (blur, canny, dilate) 소요 시간) 반환
+        # kernel: 팽창 커널 (None = 팽창 없음)
+        # blurred / canny / out: 중간 / 결과 버퍼 (없으면 새로 할당, 팽창이 없으면 canny 가 결과)
+        # scratch: Canny 외 검출기의 중간 버퍼 (edge_map 참고)
+        clock = time.perf_counter
+        plan = self.plan
+
+        # 가우시안 블러 (끄면 그레이 그대로) -> 엣지 검출
+        t0 = clock()
+        if plan.blur_ksize is not None:
+            blurred = cv2.GaussianBlur(gray, plan.blur_ksize, 0, dst=blurred)
+        else:
+            blurred = gray
+        t1 = clock()
+        if kernel is None and out is not None:
+            canny = out
+        edges = edge_map(blurred, plan.detector, self.low, self.high, canny, scratch, plan.gain)
+        t2 = clock()
+
+        # 팽창 (Thickness)
+        if kernel is not None:
+            edges = cv2.dilate(edges, kernel, dst=out, iterations=1)
+        return edges, (t1 - t0, t2 - t1, clock() - t2)
+
+    def _base_edges(self):
+        # 팽창 전 엣지 맵: 팽창이 없으면 엣지 맵 자체, 있으면 전체 처리가 남긴 workspace "canny" 버퍼
+        if self.plan.kernel is None:
+            return self.edges
+        return self.workspace.get("canny", self.edges.shape)
+
+    def _hysteresis_map(self, gray, base):
+        # Canny 부분 처리용 화면 크기 상태 맵 (0 / WEAK / WEAK_EDGE / STRONG), 전체 처리 뒤 처음 부분 처리할 때 만듦
+        # 약한 / 강한 후보는 현재 프레임, 엣지 여부는 직전 엣지 맵 기준 -> 바뀐 영역 밖에서는 둘이 일치하고
+        # 바뀐 영역과 닿는 부분은 곧바로 _compute_rect 가 다시 판정
+        clock = time.perf_counter
+        plan = self.plan
+        ws = self.workspace
+        shape = gray.shape
+        t0 = clock()
+        blurred = gray
+        if plan.blur_ksize is not None:
+            blurred = cv2.GaussianBlur(gray, plan.blur_ksize, 0, dst=ws.get("blurred", shape))
+        t1 = clock()
+        hyst = ws.get("hysteresis", shape)
+        tmp = cv2.Canny(blurred, self.high, self.high, ws.get("hysteresis_tmp", shape))
+        cv2.Canny(blurred, self.low, self.low, hyst)
+        cv2.bitwise_and(hyst, WEAK, dst=hyst)
+        cv2.bitwise_or(hyst, tmp, dst=hyst)
+        cv2.bitwise_or(hyst, cv2.bitwise_and(base, 1, dst=tmp), dst=hyst)
+        # floodFill 마스크는 판정이 끝날 때마다 사용한 부분만 다시 0 으로 (여기서 한 번 전체 초기화)
+        ws.get("hysteresis_mask", (shape[0] + 2, shape[1] + 2)).fill(0)
+        # _relink 용 버퍼도 여기서 미리 (처음 덩어리를 다시 판정하는 프레임에서 할당하지 않도록)
+        ws.get("relink_pending", shape)
+        ws.get("relink_lut", (256,))
+        ws.get("relink_bits", (max(shape) + 2,))
+        ws.get("relink_seeds", (max(shape) + 2,), np.bool_)
+        self.timings["blur"] += t1 - t0
+        self.timings["canny"] += clock() - t1
+        self.hysteresis = hyst
+        return hyst
+
+    def _relink(self, hyst, region):
+        # region (y0, y1, x0, x1) 의 약한 / 강한 후보가 바뀐 뒤, 그 바깥으로 이어지는 약한 후보 덩어리의 엣지 여부를 다시 판정
+        # -> 상태 맵에서 바뀔 수 있는 범위 (y0, y1, x0, x1)
+        # region 을 한 픽셀 둘러싼 테두리의 약한 후보에서 floodFill (약한 후보만 따라감, 강한 후보에서 멈춤)
+        # -> 덩어리 전체를 PENDING 으로 바꾸고, 그 주변에 강한 후보가 있으면 엣지
+        # region 안에만 있는 덩어리는 _compute_rect 가 창 안의 Canny 결과로 이미 정확히 판정함
+        ws = self.workspace
+        h, w = hyst.shape
+        y0, y1, x0, x1 = region
+        bounds = [y0, y1, x0, x1]
+        fill_mask = ws.get("hysteresis_mask", (h + 2, w + 2))
+        xa, xb = max(0, x0 - 1), min(w, x1 + 1)
+        ring = [] # (테두리 한 줄, 그 줄의 i 번째 픽셀 좌표 (x, y))
+        if y0 > 0:
+            ring.append((hyst[y0 - 1, xa:xb], lambda i: (xa + i, y0 - 1)))
+        if y1 < h:
+            ring.append((hyst[y1, xa:xb], lambda i: (xa + i, y1)))
+        if x0 > 0:
+            ring.append((hyst[y0:y1, x0 - 1], lambda i: (x0 - 1, y0 + i)))
+        if x1 < w:
+            ring.append((hyst[y0:y1, x1], lambda i: (x1, y0 + i)))
+        # 테두리 줄의 약한 후보 찾기: WEAK (2) / WEAK_EDGE (3) 만 1 과 OR 하면 3 (줄 크기 버퍼 재사용)
+        size = max(h, w) + 2
+        bits, seeds = ws.get("relink_bits", (size,)), ws.get("relink_seeds", (size,), np.bool_)
+        for line, point in ring:
+            n = line.shape[0]
+            np.bitwise_or(line, 1, out=bits[:n])
+            for i in np.flatnonzero(np.equal(bits[:n], WEAK_EDGE, out=seeds[:n])):
+                x, y = point(int(i))
+                value = int(hyst[y, x])
+                if value != WEAK and value != WEAK_EDGE:
+                    continue # 앞의 시드에서 이미 판정한 덩어리
+                _, _, _, (fx, fy, fw, fh) = cv2.floodFill(hyst, fill_mask, (x, y), PENDING,
+                                                          value - WEAK, WEAK_EDGE - value, HYST_FLOOD)
+                # 덩어리를 한 픽셀 넓힌 범위에서 강한 후보와 맞닿는지 확인
+                sy0, sy1, sx0, sx1 = max(0, fy - 1), min(h, fy + fh + 1), max(0, fx - 1), min(w, fx + fw + 1)
+                sub = hyst[sy0:sy1, sx0:sx1]
+                shape = sub.shape
+                pending = cv2.inRange(sub, PENDING, PENDING, dst=ws.region("relink_pending", shape, (h, w)))
+                cv2.dilate(pending, MORPH_KERNEL, dst=pending)
+                touching = cv2.bitwise_and(pending, sub, dst=pending)
+                edge = cv2.minMaxLoc(touching)[1] == STRONG
+                lut = ws.get("relink_lut", (256,))
+                np.copyto(lut, HYST_DONE_LUT)
+                lut[PENDING] = DONE_EDGE if edge else DONE
+                cv2.LUT(sub, lut, dst=sub)
+                bounds = [min(bounds[0], sy0), max(bounds[1], sy1), min(bounds[2], sx0), max(bounds[3], sx1)]
+
+        # 판정 끝 표시를 되돌리고 floodFill 마스크 정리
+        y0, y1, x0, x1 = bounds
+        sub = hyst[y0:y1, x0:x1]
+        cv2.LUT(sub, HYST_DONE_LUT, dst=sub)
+        fill_mask[y0:y1 + 2, x0:x1 + 2].fill(0)
+        return y0, y1, x0, x1
+
+    def _compute_rect(self, gray, base, rect, times):
+        # rect (변경된 영역) 때문에 바뀔 수 있는 팽창 전 엣지 맵 base 를 전체 처리와 같게 다시 계산
+        # -> 실제로 바뀐 부분 (y0, y1, x0, x1), 바뀐 것이 없으면 None
+        # 엣지 후보는 rect 를 EDGE_RADIUS 만큼 넓힌 R 안에서만 바뀌므로 R 을 다시 계산하고,
+        # Canny 는 R 밖으로 이어지는 약한 후보 덩어리의 엣지 여부를 상태 맵에서 다시 판정 (_relink)
+        # 중간 버퍼는 화면 크기 workspace 버퍼의 일부를 사용 (영역 크기가 매번 달라도 재할당 없음)
+        clock = time.perf_counter
+        plan = self.plan
+        ws = self.workspace
+        h, w = gray.shape
+        r = EDGE_RADIUS
+        y0, y1, x0, x1 = rect
+        ry0, ry1, rx0, rx1 = max(0, y0 - r), min(h, y1 + r), max(0, x0 - r), min(w, x1 + r)
+        # Canny 는 R 을 한 픽셀 둘러싼 강한 후보까지 정확해야 R 안의 덩어리를 창 안에서 판정할 수 있음
+        m = r + 1 if plan.detector == "canny" else r
+        sy0, sy1, sx0, sx1 = max(0, ry0 - m), min(h, ry1 + m), max(0, rx0 - m), min(w, rx1 + m)
+        shape = (sy1 - sy0, sx1 - sx0)
+        t0 = clock()
+        blurred = gray[sy0:sy1, sx0:sx1]
+        if plan.blur_ksize is not None:
+            blurred = cv2.GaussianBlur(blurred, plan.blur_ksize, 0, dst=ws.region("rect_blur", shape, (h, w)))
+        t1 = clock()
+        edges = edge_map(blurred, plan.detector, self.low, self.high, ws.region("rect_edges", shape, (h, w)),
+                         self._scratch("rect_", shape, (h, w)), plan.gain)
+        oy, ox = ry0 - sy0, rx0 - sx0
+        edges = edges[oy:oy + ry1 - ry0, ox:ox + rx1 - rx0]
+        if plan.detector == "canny":
+            # R 의 상태 맵 = 약한 후보 | 강한 후보 | 창 안의 Canny 결과 (R 안에만 있는 덩어리는 이것으로 정확)
+            hyst = self.hysteresis
+            target = hyst[ry0:ry1, rx0:rx1]
+            crop = (slice(oy, oy + ry1 - ry0), slice(ox, ox + rx1 - rx0))
+            weak = cv2.Canny(blurred, self.low, self.low, ws.region("rect_weak", shape, (h, w)))[crop]
+            strong = cv2.Canny(blurred, self.high, self.high, ws.region("rect_strong", shape, (h, w)))[crop]
+            cv2.bitwise_and(weak, WEAK, dst=target)
+            cv2.bitwise_or(target, strong, dst=target)
+            cv2.bitwise_or(target, cv2.bitwise_and(edges, 1, dst=weak), dst=target)
+            ry0, ry1, rx0, rx1 = self._relink(hyst, (ry0, ry1, rx0, rx1))
+            edges = cv2.LUT(hyst[ry0:ry1, rx0:rx1], HYST_EDGE_LUT,
+                            dst=ws.region("rect_relinked", (ry1 - ry0, rx1 - rx0), (h, w)))
+        times[0] += t1 - t0
+        times[1] += clock() - t1
+
+        # 바뀐 부분만 반영
+        old = base[ry0:ry1, rx0:rx1]
+        diff = cv2.absdiff(edges, old, dst=ws.region("rect_diff", old.shape, (h, w)))
+        x, y, bw, bh = cv2.boundingRect(diff)
+        if not bw:
+            return None
+        old[y:y + bh, x:x + bw] = edges[y:y + bh, x:x + bw]
+        return ry0 + y, ry0 + y + bh, rx0 + x, rx0 + x + bw
+
+    def _compute_rects(self, gray, rects, moved=False):
+        # 변경 영역들로 엣지 맵 갱신 -> 엣지 맵이 실제로 바뀐 영역 목록 (전체 처리와 같은 결과)
+        # 영역끼리 계산 범위가 겹칠 수 있으므로 차례로 처리 (앞 영역이 갱신한 값을 뒤 영역이 그대로 사용)
+        # moved: 팽창 전 엣지 맵 (과 상태 맵) 을 밀었음 -> 팽창은 전체를 다시 적용
+        base = self._base_edges()
+        if self.plan.detector == "canny" and self.hysteresis is None:
+            self._hysteresis_map(gray, base)
+        times = [0.0, 0.0]
+        changed = []
+        for rect in rects:
+            result = self._compute_rect(gray, base, rect, times)
+            if result is not None:
+                changed.append(result)
+        timings = self.timings
+        timings["blur"] += times[0]
+        timings["canny"] += times[1]
+
+        # 두께: 팽창 전 엣지 맵이 바뀐 부분 + 커널 크기 만큼 다시 팽창
+        kernel = self.plan.kernel
+        if kernel is None:
+            return changed
+        t0 = time.perf_counter()
+        h, w = gray.shape
+        out = self.edges
+        if moved:
+            cv2.dilate(base, kernel, dst=out)
+            changed = [(0, h, 0, w)]
+        else:
+            k = kernel.shape[0]
+            dilated = []
+            for y0, y1, x0, x1 in changed:
+                dy0, dy1, dx0, dx1 = max(0, y0 - k), min(h, y1 + k), max(0, x0 - k), min(w, x1 + k)
+                sy0, sy1, sx0, sx1 = max(0, dy0 - k), min(h, dy1 + k), max(0, dx0 - k), min(w, dx1 + k)
+                window = cv2.dilate(base[sy0:sy1, sx0:sx1], kernel,
+                                    dst=self.workspace.region("rect_dilate", (sy1 - sy0, sx1 - sx0), (h, w)))
+                out[dy0:dy1, dx0:dx1] = window[dy0 - sy0:dy1 - sy0, dx0 - sx0:dx1 - sx0]
+                dilated.append((dy0, dy1, dx0, dx1))
+            changed = dilated
+        timings["dilate"] += time.perf_counter() - t0
+        return changed
+
+    def detect_edges(self, gray):
+        # 현재 계획(prepare)으로 전체 엣지 맵 계산, 결과는 workspace 의 "edges" 버퍼
+        plan = self.plan
+        ws = self.workspace
+        out = ws.get("edges", gray.shape)
+        if plan.scale >= 1.0:
+            return self._detect(gray, plan.kernel, "", out)
+
+        # 축소 처리 (Reduced Resolution): 축소 -> 엣지 검출 -> 원본 크기로 확대 -> 팽창
+        clock = time.perf_counter
+        h, w = gray.shape
+        f = plan.factor
+        t0 = clock()
+        if f:
+            # 정수 배율: 블록 단위로 정확히 대응되도록 내림 크기 사용
+            size = (max(1, w // f), max(1, h // f))
+        else:
+            size = (max(1, round(w * plan.scale)), max(1, round(h * plan.scale)))
+        small = cv2.resize(gray, size, dst=ws.get("small", size[::-1]), interpolation=plan.interp)
+        self.timings["scale"] += clock() - t0
+
+        edges = self._detect(small, None, "small_", ws.get("small_edges", small.shape))
+
+        # 팽창이 있으면 확대 결과는 중간 버퍼에, 없으면 바로 결과 버퍼에
+        up = out if plan.kernel is None else ws.get("canny", gray.shape)
+        t0 = clock()
+        if f:
+            upscale_thin(edges, f, (h, w), up, ws)
+        else:
+            cv2.resize(edges, (w, h), dst=up, interpolation=cv2.INTER_NEAREST)
+        t1 = clock()
+        self.timings["scale"] += t1 - t0
+        if plan.kernel is not None:
+            cv2.dilate(up, plan.kernel, dst=out, iterations=1)
+            self.timings["dilate"] += clock() - t1
+        return out
+
+    def _detect(self, gray, kernel, prefix, out):
+        # gray 전체 엣지 검출 -> out (prefix: workspace 버퍼 이름 구분용)
+        h, w = gray.shape
+        ws = self.workspace
+        plan = self.plan
+        blurred = ws.get(prefix + "blurred", gray.shape) if plan.blur_ksize is not None else gray
+        canny = ws.get(prefix + "canny", gray.shape) if kernel is not None else out
+        threads = min(plan.threads, h // MIN_BAND_HEIGHT)
+        if threads <= 1:
+            # 단일 처리 (Single Pass)
+            edges, times = self._run_stages(gray, kernel, blurred, canny, out,
+                                            self._scratch(prefix, gray.shape))
+            self.timings["blur"] += times[0]
+            self.timings["canny"] += times[1]
+            self.timings["dilate"] += times[2]
+            return edges
+        return self._detect_edges_tiled(gray, threads, kernel, blurred, canny, out)
+
+    def _scratch(self, prefix, shape, capacity=None):
+        # Canny 외 검출기의 중간 버퍼 (workspace, Canny 는 None)
+        # capacity: 크기가 매번 다른 경우 이 크기 버퍼의 일부를 사용 (Workspace.region)
+        if self.plan.detector == "canny":
+            return None
+        ws = self.workspace
+        if capacity is not None:
+            return (ws.region(prefix + "grad_x", shape, capacity, np.int16),
+                    ws.region(prefix + "grad_y", shape, capacity, np.int16),
+                    ws.region(prefix + "grad_mag", shape, capacity))
+        return (ws.get(prefix + "grad_x", shape, np.int16), ws.get(prefix + "grad_y", shape, np.int16),
+                ws.get(prefix + "grad_mag", shape))
+
+    def _detect_edges_tiled(self, gray, threads, kernel, blurred, edges, out):
+        # 밴드 병렬 처리 (Tiled)
+        # 1. 밴드별로 여유 영역을 포함해 블러 + 엣지 검출 후 이어 붙임
+        # 2. Canny 는 밴드별로 약한 후보 덩어리를 만들고 (_label_band) 경계 너머로 합쳐서 판정 (_link_bands, 이음새 없음)
+        #    (다른 검출기는 국소 필터이므로 여유 영역만으로 정확함)
+        # 3. 팽창도 밴드 단위로 병렬 처리
+        clock = time.perf_counter
+        h, w = gray.shape
+        ws = self.workspace
+        ksize = self.plan.blur_ksize
+        detector, gain = self.plan.detector, self.plan.gain
+        low, high = self.low, self.high
+        pool = self._get_pool(threads)
+        bands = split_bands(h, threads)
+        halo = BAND_HALO
+
+        # 밴드별 작업 버퍼는 스레드에 넘기기 전에 준비 (dict 동시 수정 방지)
+        windows = []
+        for i, (y0, y1) in enumerate(bands):
+            ey0, ey1 = max(0, y0 - halo), min(h, y1 + halo)
+            shape = (ey1 - ey0, w)
+            windows.append((ws.get(f"band_blur{i}", shape) if ksize is not None else gray[ey0:ey1],
+                            ws.get(f"band_canny{i}", shape),
+                            self._scratch(f"band{i}_", shape)))
+        bases = [0]
+        if detector == "canny":
+            # 약한 후보 = band_canny, 강한 후보 / 약한 후보만 / 덩어리 번호 (+ NumPy 색인용 사본) /
+            # 강한 후보 접촉 (밴드 위아래 한 행 포함)
+            # 덩어리 번호는 밴드마다 고정 구간 (밴드에 생길 수 있는 최대 덩어리 수, 2x2 칸마다 하나) 을 나눠 써서
+            # 밴드 사이에 겹치지 않게 함 -> 번호별 버퍼 (_link_bands) 를 미리 할당해 둘 수 있음
+            for i, (y0, y1) in enumerate(bands):
+                ey0, ey1 = max(0, y0 - halo), min(h, y1 + halo)
+                windows[i] += (ws.get(f"band_strong{i}", (ey1 - ey0, w)), ws.get(f"band_only{i}", (y1 - y0, w)),
+                               ws.get(f"band_labels{i}", (y1 - y0, w), np.int32),
+                               ws.get(f"band_index{i}", (y1 - y0, w), np.intp),
+                               ws.get(f"band_touch{i}", (min(h, y1 + 1) - max(0, y0 - 1), w)))
+                bases.append(bases[-1] + -(-(y1 - y0) // 2) * -(-w // 2) + 1)
+            links = self._link_buffers(bases[-1] + 1, 3 * w * (len(bands) - 1), w)
+        labelled = [None] * len(bands)
+
+        def canny_band(i):
+            y0, y1 = bands[i]
+            ey0, ey1 = max(0, y0 - halo), min(h, y1 + halo)
+            window, window_edges, scratch = windows[i][:3]
+            t0 = clock()
+            if ksize is not None:
+                cv2.GaussianBlur(gray[ey0:ey1], ksize, 0, dst=window)
+                blurred[y0:y1] = window[y0 - ey0:y1 - ey0]
+            t1 = clock()
+            if detector == "canny":
+                labelled[i] = self._label_band(window, y0 - ey0, y1 - ey0, window_edges, *windows[i][3:],
+                                               links[3], bases[i])
+            else:
+                edge_map(window, detector, low, high, window_edges, scratch, gain)
+                edges[y0:y1] = window_edges[y0 - ey0:y1 - ey0]
+            return t1 - t0, clock() - t1
+
+        results = list(pool.map(canny_band, range(len(bands))))
+        # 병렬 실행이므로 단계별 시간은 가장 오래 걸린 작업 기준
+        self.timings["blur"] += max(r[0] for r in results)
+        t0 = clock()
+        if detector == "canny":
+            self._link_bands(edges, bands, labelled, bases, links, pool)
+        self.timings["canny"] += max(r[1] for r in results) + clock() - t0
+
+        # 팽창 (Thickness): 밴드 경계에서 r 행씩 겹쳐 읽고 out 의 자기 밴드에만 씀
+        if kernel is not None:
+            t0 = clock()
+            r = kernel.shape[0]
+            spans = [(max(0, y0 - r), min(h, y1 + r)) for y0, y1 in bands]
+            dilated = [ws.get(f"band_dilate{i}", (ey1 - ey0, w)) for i, (ey0, ey1) in enumerate(spans)]
+
+            def dilate_band(i):
+                (y0, y1), (ey0, ey1) = bands[i], spans[i]
+                cv2.dilate(edges[ey0:ey1], kernel, dst=dilated[i])
+                out[y0:y1] = dilated[i][y0 - ey0:y1 - ey0]
+
+            list(pool.map(dilate_band, range(len(bands))))
+            self.timings["dilate"] += clock() - t0
+        return out
+
+    def _label_band(self, window, a, b, weak, strong, only, labels, index, touching, flags, base):
+        # 밴드 하나 (창 안 a..b 행) 의 히스테리시스 재료
+        # -> (덩어리 번호 (intp, base 부터 시작하는 전체 번호), 덩어리 수, 밴드 행의 강한 후보)
+        # 덩어리별 강한 후보 접촉 여부는 flags[base:base + 덩어리 수] 에 씀 (0 번 = 배경)
+        # 약한 후보 = Canny(low, low), 강한 후보 = Canny(high, high) (강한 후보는 약한 후보에 포함됨)
+        # 약한 후보끼리 8-연결로 이어진 덩어리는 강한 후보와 맞닿아 있으면 엣지 (_hysteresis_map 과 같은 기준)
+        # 창의 여유 영역 덕분에 밴드 위아래 한 행까지 후보가 정확하므로, 밴드 밖 강한 후보와의 접촉도 여기서 판정
+        cv2.Canny(window, self.low, self.low, weak)
+        cv2.Canny(window, self.high, self.high, strong)
+        cv2.subtract(weak[a:b], strong[a:b], dst=only)
+        count, labels = cv2.connectedComponents(only, labels, 8, cv2.CV_32S)
+        ta = max(0, a - 1)
+        cv2.dilate(strong[ta:ta + len(touching)], MORPH_KERNEL, dst=touching)
+        near = touching[a - ta:a - ta + b - a]
+        cv2.bitwise_and(near, only, dst=near)
+        cv2.bitwise_and(near, 1, dst=near)
+        # 색인은 intp 사본으로 (int32 그대로 쓰면 NumPy 가 매번 intp 배열을 새로 만듦)
+        index.fill(0)
+        np.copyto(index, labels, where=near.view(bool))
+        touch = flags[base:base + count]
+        touch.fill(0)
+        touch[index] = 1
+        touch[0] = 0
+        np.copyto(index, labels)
+        if base:
+            np.add(index, base, out=index)
+        return index, count, strong[a:b]
+
+    def _link_buffers(self, size, pairs, w):
+        # _link_bands 버퍼 (스레드에 넘기기 전에 준비): 번호 0, 1, 2, ... / 번호별 뿌리 / 최종 뿌리 (intp),
+        # 강한 후보 접촉 / 합친 접촉 (uint8), 비교 결과 (bool),
+        # 경계 짝 [위, 아래, 위 뿌리, 아래 뿌리, 임시, 작은 뿌리, 큰 뿌리] (intp), 경계 한 줄 (bool x2)
+        ws = self.workspace
+        allocations = ws.allocations
+        iota = ws.get("link_iota", (size,), np.intp)
+        if ws.allocations != allocations:
+            iota[:] = np.arange(size)   # 새로 할당했을 때만 채움
+        return (iota, ws.get("link_roots", (size,), np.intp), ws.get("link_final", (size,), np.intp),
+                ws.get("link_flags", (size,)), ws.get("link_hit", (size,)),
+                ws.get("link_same", (max(size, pairs),), np.bool_), ws.get("link_pairs", (7, pairs), np.intp),
+                ws.get("link_row", (2, w), np.bool_))
+
+    def _link_bands(self, edges, bands, labelled, bases, links, pool):
+        # 밴드별 덩어리를 경계 너머로 합쳐 엣지 맵을 씀 (전체 Canny 와 같은 결과)
+        # 경계 위 / 아래 행에서 8-방향으로 맞닿은 덩어리 쌍마다 큰 뿌리를 작은 뿌리에 잇고, 바뀌는 것이 없을 때까지 반복
+        # -> 합쳐진 덩어리 중 하나라도 강한 후보와 맞닿았으면 전체가 엣지
+        # 모두 미리 할당한 버퍼에서 처리 (맞닿지 않은 경계 위치는 어느 픽셀도 쓰지 않는 dummy 번호끼리의 짝)
+        iota, roots, final, flags, hit, same, (pa, pb, ga, gb, tmp, small, large), rows = links
+        w = edges.shape[1]
+        dummy = bases[-1]
+        spans = [(bases[k], bases[k] + labelled[k][1]) for k in range(len(bands))]
+        for lo, hi in spans:
+            np.copyto(roots[lo:hi], iota[lo:hi])
+        roots[dummy] = dummy
+
+        # 경계 짝: (위 밴드 마지막 행 번호, 아래 밴드 첫 행 번호), 세 방향 (dx = -1, 0, 1)
+        n = 0
+        for k in range(1, len(bands)):
+            upper, lower = labelled[k - 1][0][-1], labelled[k][0][0]
+            for dx in (-1, 0, 1):
+                above = upper[max(0, -dx):w - max(0, dx)]
+                below = lower[max(0, dx):w - max(0, -dx)]
+                m = len(above)
+                linked, other = rows[0, :m], rows[1, :m]
+                np.greater(above, bases[k - 1], out=linked)
+                np.greater(below, bases[k], out=other)
+                np.logical_and(linked, other, out=linked)
+                np.logical_not(linked, out=linked)
+                np.copyto(pa[n:n + m], above)
+                np.copyto(pb[n:n + m], below)
+                np.copyto(pa[n:n + m], dummy, where=linked)
+                np.copyto(pb[n:n + m], dummy, where=linked)
+                n += m
+        pa, pb, ga, gb, tmp, small, large, same_pairs = pa[:n], pb[:n], ga[:n], gb[:n], tmp[:n], small[:n], large[:n], same[:n]
+
+        def find(ids, out):
+            # ids 의 뿌리 (포인터 점프, 바뀌지 않을 때까지)
+            np.take(roots, ids, out=out, mode="clip")
+            while True:
+                np.take(roots, out, out=tmp, mode="clip")
+                if np.equal(tmp, out, out=same_pairs).all():
+                    return
+                np.copyto(out, tmp)
+
+        while True:
+            find(pa, ga)
+            find(pb, gb)
+            if np.equal(ga, gb, out=same_pairs).all():
+                break
+            # 큰 뿌리 -> 작은 뿌리 (한 뿌리에 여러 짝이 있으면 그중 하나만 반영되지만 모두 더 작은 번호라 반복하면 수렴)
+            # 이미 합쳐진 짝은 dummy 에 써서 같은 뿌리의 다른 짝을 덮어쓰지 않게 함
+            np.minimum(ga, gb, out=small)
+            np.maximum(ga, gb, out=large)
+            np.copyto(small, dummy, where=same_pairs)
+            np.copyto(large, dummy, where=same_pairs)
+            roots[large] = small
+
+        # 모든 번호의 최종 뿌리 (final) -> 강한 후보와 맞닿은 번호의 뿌리에 표시 (hit) -> 번호별 엣지 값
+        for lo, hi in spans:
+            while True:
+                np.take(roots, roots[lo:hi], out=final[lo:hi], mode="clip")
+                if np.equal(final[lo:hi], roots[lo:hi], out=same[lo:hi]).all():
+                    break
+                np.copyto(roots[lo:hi], final[lo:hi])
+            hit[lo:hi].fill(0)
+        for lo, hi in spans:
+            targets = roots[lo:hi]
+            np.copyto(targets, dummy, where=np.equal(flags[lo:hi], 0, out=same[lo:hi]))
+            hit[targets] = 1
+        for lo, hi in spans:
+            values = flags[lo:hi]
+            np.take(hit, final[lo:hi], out=values, mode="clip")
+            np.multiply(values, np.uint8(255), out=values)
+
+        def write_band(k):
+            (y0, y1), (index, _, strong) = bands[k], labelled[k]
+            np.take(flags, index, out=edges[y0:y1], mode="clip")
+            cv2.bitwise_or(edges[y0:y1], strong, dst=edges[y0:y1])
+
+        list(pool.map(write_band, range(len(bands))))
+
+    def copy_mask(self, edges, out, rects=None):
+        t0 = time.perf_counter()
+        if rects is None:
+            out[:] = edges
+        else:
+            for y0, y1, x0, x1 in rects:
+                out[y0:y1, x0:x1] = edges[y0:y1, x0:x1]
+        self.timings["colorize"] += time.perf_counter() - t0
+        return out
+
+    def colorize(self, edges, out, rects=None):
+        # 채널별 LUT 로 마스크 -> RGBA (0 은 투명이므로 이전 잔상도 함께 지워짐)
+        t0 = time.perf_counter()
+        luts = self.plan.color_luts
+        ws = self.workspace
+        planes = [ws.get(f"plane{i}", edges.shape) for i in range(4)]
+        if rects is None:
+            for plane, lut in zip(planes, luts):
+                cv2.LUT(edges, lut, dst=plane)
+            cv2.merge(planes, dst=out)
+        else:
+            # 영역별로 채널 버퍼의 같은 위치에 쓴 뒤 합침 (부분 뷰도 dst 로 직접 사용)
+            for y0, y1, x0, x1 in rects:
+                region = edges[y0:y1, x0:x1]
+                views = [plane[y0:y1, x0:x1] for plane in planes]
+                for view, lut in zip(views, luts):
+                    cv2.LUT(region, lut, dst=view)
+                cv2.merge(views, dst=out[y0:y1, x0:x1])
+
+        self.timings["colorize"] += time.perf_counter() - t0
+        return out
+
+    def calculate_auto_threshold(self, gray_image, instant=False):
+        # 자동 임계값 갱신. 실제로 값이 바뀌었으면 True (슬라이더 동기화 필요)
+        # 설정(Config)에는 쓰지 않음: 결과는 low / high 로 바로 사용하고 GUI 가 다시 게시
+        cfg = self.plan.cfg
+        auto = self.auto_threshold
+        if cfg.AUTO_TARGET_DENSITY <= 0:
+            auto.gain = 1.0
+        # 사용자가 슬라이더로 바꾼 값도 기준으로 삼음
+        auto.lower, auto.upper = self.low, self.high
+        changed = auto.update(
+            gray_image, cfg.AUTO_SIGMA,
+            1.0 if instant else cfg.AUTO_SMOOTHING,
+            0 if instant else cfg.AUTO_HYSTERESIS,
+        )
+        if changed:
+            self.low, self.high = auto.lower, auto.upper
+            self.auto_thresholds = (self.low, self.high)
+            self.recent_auto.append(self.auto_thresholds)
+        return changed
+
+
+class AutoThreshold:
+    # 히스토그램 기반 자동 임계값 (Histogram Median + EMA + Hysteresis)
+    # 중앙값: 행 간격 샘플의 256-bin 히스토그램 누적합에서 찾음 (정렬 없이 O(256))
+    SAMPLE_PIXELS = 1 << 18 # 히스토그램에 사용할 대략적인 픽셀 수
+
+    def __init__(self):
+        self.level = None # 평활화된 중앙값 (EMA)
+        self.gain = 1.0 # 목표 엣지 밀도 제어용 배율
+        self.lower = None
+        self.upper = None
+
+    def reset(self):
+        self.level = None
+        self.gain = 1.0
+
+    @classmethod
+    def median(cls, gray):
+        # 행 간격 뷰는 복사 없이 OpenCV 에 그대로 전달 가능
+        h, w = gray.shape
+        step = max(1, min(h // 16, h * w // cls.SAMPLE_PIXELS))
+        sample = gray[::step] if step > 1 else gray
+        hist = cv2.calcHist([sample], [0], None, [256], [0, 256]).ravel()
+        cdf = np.cumsum(hist)
+        return int(np.searchsorted(cdf, cdf[-1] * 0.5))
+
+    def update(self, gray, sigma, alpha, hysteresis):
+        v = self.median(gray)
+        if self.level is None or alpha >= 1.0:
+            self.level = float(v)
+        else:
+            self.level += alpha * (v - self.level)
+
+        base = self.level * self.gain
+        lower = int(max(0, min(255, (1.0 - sigma) * base)))
+        upper = int(max(0, min(255, (1.0 + sigma) * base)))
+
+        # 히스테리시스: 작은 흔들림은 무시하고 충분히 움직였을 때만 반영
+        if self.lower is not None:
+            if lower == self.lower and upper == self.upper:
+                return False
+            if abs(lower - self.lower) < hysteresis and abs(upper - self.upper) < hysteresis:
+                return False
+        self.lower, self.upper = lower, upper
+        return True
+
+    def track_density(self, density, target, rate=0.5):
+        # 폐루프 모드: 엣지 밀도가 목표보다 높으면 임계값을 올리고 낮으면 내림
+        if target <= 0 or density <= 0:
+            return
+        error = (density - target) / target
+        self.gain = float(np.clip(self.gain * (1.0 + rate * np.clip(error, -0.5, 0.5)), 0.25, 4.0))
+
+
+class BufferSlot:
+    def __init__(self, ring, index, buffer, generation):
+        self.ring = ring
+        self.index = index
+        self.buffer = buffer
+        self.generation = generation
+        self.serial = None # 이 버퍼에 마지막으로 그린 엔진 serial
+        self.color_key = None # RGBA 버퍼에 칠한 색상
+        self.source = None # serial 을 만든 (엔진, 영역), 바뀌면 serial 비교 불가
+
+    def release(self):
+        self.ring.release(self)
+
+
+class BufferRing:
+    # 미리 할당한 출력 버퍼 링 (Triple Buffering)
+    # 워커가 빈 슬롯을 acquire 해서 쓰고, 화면 쪽이 그린 뒤 release 로 반환한다.
+    # 소유권이 명확하므로 복사 없이 공유해도 쓰는 도중의 버퍼가 화면에 그려지지 않음.
+    def __init__(self, count=3):
+        self.count = max(3, count)
+        self.lock = threading.Lock()
+        self.shape = None
+        self.generation = 0
+        self.slots = []
+        self.free = deque()
+
+    def acquire(self, shape, dtype=np.uint8):
+        # 빈 슬롯 반환. 모든 슬롯이 사용 중이면 None (프레임 건너뛰기)
+        with self.lock:
+            if self.shape != shape:
+                # 크기가 바뀔 때만 재할당. 이전 세대 슬롯은 반환되어도 무시
+                self.generation += 1
+                self.shape = shape
+                self.slots = [BufferSlot(self, i, np.zeros(shape, dtype), self.generation)
+                              for i in range(self.count)]
+                self.free = deque(self.slots)
+            if not self.free:
+                return None
+            return self.free.popleft()
+
+    def release(self, slot):
+        with self.lock:
+            if slot.generation == self.generation and slot not in self.free:
+                self.free.append(slot)
@@ -0,0 +1,409 @@
+# 다중 프로세스 파이프라인 (Multi-process Pipeline)
+# 캡처 프로세스 -> (프레임 링) -> 처리 프로세스 -> (영역별 출력 링) -> GUI 프로세스
+# 프로세스마다 GIL 이 따로 있으므로 캡처 / 엣지 처리가 GUI 스레드의 그리기와 입력 처리를 막지 않는다.
+# 데이터는 공유 메모리 링 (shm_ring) 으로, 알림은 Pipe 로 (슬롯 번호, seq) 같은 작은 메시지만 보낸다.
+# Qt 비의존: GUI 쪽은 ProcessPipeline 으로 프로세스를 시작하고 메시지를 주고받는다.
+# Windows 의 spawn 방식에서도 동작하도록 프로세스 진입 함수는 모두 모듈 최상위에 둔다.
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+
+from capture_regions import RegionCapture
+from edge_config import ConfigStore
+from edge_stream import StreamSet
+from frame_scheduler import FrameScheduler
+from frame_sources import FrameSource, open_source
+from shm_ring import SharedRing
+from telemetry import Telemetry
+
+FRAME_SLOTS = 3         # 캡처 -> 처리 프레임 링 슬롯 수
+OUTPUT_SLOTS = 4        # 처리 -> GUI 출력 링 슬롯 수 (GUI 가 그리는 동안 덮어쓰지 않도록 여유)
+OUTPUT_GROWTH = 1.5     # 출력 링이 작아 다시 만들 때 여유 배율
+STATS_INTERVAL = 0.5    # 처리 프로세스 -> GUI 성능 통계 전송 주기 (초)
+POLL_TIMEOUT = 0.1      # 명령 대기 최대 시간 (초)
+
+# 출력 링 슬롯의 extra 값: (캡처 시각 ns, 출력 종류)
+OUTPUT_KINDS = ("mask", "rgba")
+
+
+def capture_main(spec, width, height, conn):
+    # 캡처 프로세스: 처리 프로세스가 알려준 범위(bounds)를 주사율에 맞춰 grab -> 프레임 링
+    # conn (처리 프로세스와 연결): 받는 명령 ("bounds", (x, y, w, h)) / ("rate", hz) / ("pause", bool) / ("stop",)
+    #                             보내는 알림 ("ring", 이름, 너비, 높이) / ("frame", 게시 횟수)
+    try:
+        source = open_source(spec, width, height)
+    except Exception as e:
+        print(f"캡처 프로세스: 소스 초기화 실패: {e}")
+        conn.close()
+        return
+    ring = SharedRing(slots=FRAME_SLOTS, capacity=source.width * source.height * 3)
+    scheduler = FrameScheduler()
+    scheduler.adaptive = False
+    bounds = None
+    rate = 60
+    paused = False
+    try:
+        conn.send(("ring", ring.name, source.width, source.height))
+        while True:
+            while conn.poll():
+                message = conn.recv()
+                kind = message[0]
+                if kind == "stop":
+                    return
+                if kind == "bounds":
+                    bounds = message[1]
+                elif kind == "rate":
+                    rate = message[1]
+                elif kind == "pause":
+                    paused = message[1]
+                    scheduler.reset()
+            if paused or bounds is None:
+                conn.poll(POLL_TIMEOUT)
+                continue
+
+            start = time.perf_counter()
+            x, y, w, h = bounds
+            frame = source.grab(region=(x, y, x + w, y + h))
+            captured = time.perf_counter_ns()
+            if frame is None:
+                scheduler.wait_for_frame(rate)
+                continue
+            index, view = ring.begin_write(frame.shape)
+            np.copyto(view, frame)
+            ring.end_write(index, x, y, captured)
+            conn.send(("frame", ring.published()))
+            scheduler.frame_done(time.perf_counter() - start, rate)
+    except (EOFError, BrokenPipeError, OSError):
+        pass
+    finally:
+        source.release()
+        ring.close()
+
+
+class SharedFrameSource(FrameSource):
+    # 캡처 프로세스가 프레임 링에 게시한 최신 프레임 (RegionCapture 의 소스)
+    # grab() 은 새 프레임이 없거나 요청 범위가 캡처 범위 밖이면 None
+    # 돌려준 프레임의 슬롯은 다음 grab() 까지 잡아 두어 (pin) 처리 중에 덮어써지지 않게 함
+    # 처리 후 intact() 로 그 사이 프레임이 덮어써지지 않았는지 확인
+    def __init__(self, ring, width, height):
+        self.ring = ring
+        self.width = width
+        self.height = height
+        self.seen = 0
+        self.current = None
+        self.captured_at = 0.0
+
+    def grab(self, region=None):
+        published = self.ring.published()
+        if published == self.seen:
+            return None
+        latest = self.ring.latest()
+        if latest is None:
+            return None
+        self.seen = published
+        index, seq, view, (x, y, captured, _) = latest
+        if not self.ring.pin(index, seq):
+            self.current = None
+            return None
+        self.current = (index, seq)
+        self.captured_at = captured / 1e9
+        if region is None:
+            return view
+        l, t, r, b = region
+        h, w = view.shape[:2]
+        if l < x or t < y or r > x + w or b > y + h:
+            # 범위를 바꾼 직후 아직 이전 범위로 캡처된 프레임
+            return None
+        return view[t - y:b - y, l - x:r - x]
+
+    def intact(self):
+        return self.current is not None and self.ring.valid(*self.current)
+
+
+class OutputRing:
+    # 처리 프로세스가 영역 하나에 쓰는 출력 링 (슬롯별로 마지막에 그린 serial 기억 -> 바뀐 영역만 다시 그림)
+    def __init__(self, capacity, previous=None):
+        self.ring = SharedRing(slots=OUTPUT_SLOTS, capacity=capacity)
+        self.sources = [None] * OUTPUT_SLOTS # 슬롯별 (엔진, 영역, 모양, 색상, serial)
+        self.color_key = None # 마지막으로 쓴 RGBA 색상
+        self.shown = None # 마지막으로 알린 프레임 (엔진, 영역, 모양, 색상, serial) -> 다음 알림의 변경 영역
+        # 교체된 이전 링: GUI 가 새 링으로 옮겨갈 때까지 한 세대 더 유지
+        self.previous = previous.ring if previous is not None else None
+        if previous is not None and previous.previous is not None:
+            previous.previous.close()
+
+    def close(self):
+        self.ring.close()
+        if self.previous is not None:
+            self.previous.close()
+
+
+def pipeline_main(spec, width, height, conn, capture_conn):
+    # 처리 프로세스: 프레임 링의 최신 프레임 -> 영역 묶음별 엣지 처리 -> 영역별 출력 링
+    # conn (GUI 와 연결): 받는 명령 ("config", {설정}) / ("region", id, 영역) / ("remove", id)
+    #                     / ("pause", bool) / ("busy", bool) / ("auto",) / ("stop",)
+    #   보내는 알림 ("frame", id, 링 이름, 슬롯, seq, 변경 영역 또는 None) / ("vector", id, points, counts, 캡처 시각 ns)
+    #               / ("thresholds", low, high) / ("stats", stats)
+    store = ConfigStore()
+    capture = RegionCapture(store)
+    scheduler = FrameScheduler()
+    telemetry = Telemetry()
+    outputs = {}    # id -> OutputRing
+    streams = StreamSet()   # 외부 프로세스용 엣지 스트림 (Config.EDGE_STREAM)
+    frames = None
+    bounds = None
+    rate = None
+    paused = False
+    busy = False    # GUI 가 이전 프레임을 아직 가져가지 않음 -> 처리 건너뜀
+    last_stats = time.perf_counter()
+    try:
+        message = capture_conn.recv()
+        frames = SharedFrameSource(SharedRing(message[1]), message[2], message[3])
+        while True:
+            # GUI 명령 처리
+            while conn.poll():
+                message = conn.recv()
+                kind = message[0]
+                if kind == "stop":
+                    return
+                if kind == "config":
+                    store.publish(**message[1])
+                elif kind == "region":
+                    capture.set_region(message[1], message[2])
+                elif kind == "remove":
+                    capture.remove_region(message[1])
+                    output = outputs.pop(message[1], None)
+                    if output is not None:
+                        output.close()
+                elif kind == "pause":
+                    paused = message[1]
+                    capture_conn.send(("pause", paused))
+                    capture.invalidate()
+                    scheduler.reset()
+                elif kind == "busy":
+                    busy = message[1]
+                elif kind == "auto":
+                    capture.trigger_auto_adjust()
+
+            cfg = store.current
+            if cfg.REFRESH_RATE != rate:
+                rate = cfg.REFRESH_RATE
+                capture_conn.send(("rate", rate))
+            area = capture.bounds(frames.width, frames.height)
+            if area != bounds:
+                bounds = area
+                capture_conn.send(("bounds", bounds))
+            if paused or bounds is None:
+                streams.beat()
+                conn.poll(POLL_TIMEOUT)
+                continue
+
+            # 새 프레임 알림 대기 (밀린 알림은 버리고 최신 프레임만 처리)
+            if not capture_conn.poll(POLL_TIMEOUT):
+                streams.beat()
+                continue
+            while capture_conn.poll():
+                capture_conn.recv()
+            if busy and not cfg.EDGE_STREAM:
+                telemetry.count("gui_busy")
+                continue
+
+            start = time.perf_counter()
+            scheduler.adaptive = cfg.ADAPTIVE_QUALITY
+            capture.quality_scale = scheduler.scale
+            changed = capture.update(frames, cfg)
+            if changed is None:
+                streams.beat()
+                continue
+            if not frames.intact():
+                # 처리하는 동안 캡처가 링을 한 바퀴 돌아 프레임이 덮어써짐 -> 다음 프레임에서 전체 재처리
+                capture.invalidate()
+                telemetry.count("torn")
+                continue
+            telemetry.frame_processed(capture.timings, changed)
+
+            primary = max(capture.groups.values(), key=lambda g: g.region[2] * g.region[3])
+            for group in capture.groups.values():
+                engine = group.engine
+                if engine.thresholds_changed:
+                    # 묶음이 여럿이면 가장 넓은 묶음의 값만 GUI 설정에 반영
+                    engine.thresholds_changed = False
+                    if group is primary:
+                        conn.send(("thresholds", engine.low, engine.high))
+                for key, rect in group.members.items():
+                    if cfg.EDGE_STREAM:
+                        streams.publish(cfg.EDGE_STREAM, key, engine, rect, frames.width * frames.height,
+                                        frames.captured_at, cfg.version, group.changed)
+                    output = outputs.get(key)
+                    # RGBA 출력은 색상 / 투명도가 바뀌면 다시 칠해야 함
+                    recolor = cfg.OUTPUT_MODE == "rgba" and (
+                        output is None or output.color_key != engine.plan.color_key)
+                    if group.changed or recolor:
+                        _publish(conn, outputs, key, engine, rect, frames.captured_at)
+            streams.retain(capture.regions if cfg.EDGE_STREAM else ())
+
+            work_time = time.perf_counter() - start
+            telemetry.record("process", work_time)
+            missed = scheduler.missed_deadlines
+            scheduler.frame_done(work_time, rate)
+            if scheduler.missed_deadlines != missed:
+                telemetry.count("missed_deadlines", scheduler.missed_deadlines - missed)
+
+            now = time.perf_counter()
+            if now - last_stats >= STATS_INTERVAL:
+                last_stats = now
+                stats = telemetry.stats()
+                stats["quality_level"] = scheduler.level
+                stats["regions"] = (len(capture.regions), len(capture.groups), capture.pixels)
+                conn.send(("stats", stats))
+    except (EOFError, BrokenPipeError, OSError):
+        pass
+    finally:
+        try:
+            capture_conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        capture.close()
+        streams.close()
+        for output in outputs.values():
+            output.close()
+        if frames is not None:
+            frames.ring.close()
+
+
+def _publish(conn, outputs, key, engine, rect, captured_at):
+    # 영역 하나의 결과를 출력 링에 쓰고 GUI 에 알림
+    captured_ns = int(captured_at * 1e9)
+    output_kind = engine.output_kind(rect)
+    if output_kind == "vector":
+        points, counts = engine.contours(rect)
+        conn.send(("vector", key, points, counts, captured_ns))
+        if key in outputs:
+            outputs[key].shown = None
+        return
+
+    y0, y1, x0, x1 = rect
+    shape = (y1 - y0, x1 - x0) if output_kind == "mask" else (y1 - y0, x1 - x0, 4)
+    color = engine.plan.color_key if output_kind == "rgba" else None
+    output = outputs.get(key)
+    size = int(np.prod(shape))
+    if output is None or output.ring.capacity < size:
+        # 더 큰 링으로 교체 (GUI 는 frame 알림의 링 이름이 바뀌면 새로 연결)
+        output = outputs[key] = OutputRing(int(size * OUTPUT_GROWTH), output)
+
+    ring = output.ring
+    index, view = ring.begin_write(shape)
+    # 같은 엔진 / 위치 / 모양 / 색상으로 그린 슬롯이면 그 이후 바뀐 영역만 다시 그림
+    last = output.sources[index]
+    since = last[4] if last is not None and last[:4] == (engine, rect, shape, color) else None
+    serial = engine.render(view, since, rect)
+    output.sources[index] = (engine, rect, shape, color, serial)
+    output.color_key = color
+    # 창은 이전 알림의 프레임과 달라진 부분만 다시 그림
+    shown, source = output.shown, (engine, rect, shape, color)
+    dirty = engine.dirty_since(shown[4], rect) if shown is not None and shown[:4] == source else None
+    output.shown = source + (serial,)
+    ring.end_write(index, captured_ns, OUTPUT_KINDS.index(output_kind))
+    conn.send(("frame", key, ring.name, index, int(ring.meta[index, 0]), dirty))
+
+
+class ProcessPipeline:
+    # GUI 쪽 핸들: 캡처 / 처리 프로세스를 시작하고 명령 전송, 알림 수신
+    # start=False 이면 start() 를 따로 호출 (그 전에 보낸 명령은 파이프에 쌓임)
+    def __init__(self, spec, width=1920, height=1080, start=True):
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, pipeline_conn = ctx.Pipe()
+        capture_conn, child_conn = ctx.Pipe()
+        self.capture = ctx.Process(target=capture_main, args=(spec, width, height, child_conn),
+                                   name="edge-capture", daemon=True)
+        self.pipeline = ctx.Process(target=pipeline_main,
+                                    args=(spec, width, height, pipeline_conn, capture_conn),
+                                    name="edge-pipeline", daemon=True)
+        self.lock = threading.Lock() # GUI 스레드와 수신 스레드가 함께 보냄
+        self.rings = {} # 링 이름 -> SharedRing (GUI 쪽 연결)
+        self.holds = {} # 링 이름 -> 아직 release 하지 않은 GUI 프레임 수
+        self.retired = {} # forget 했지만 프레임이 아직 참조 중인 링 (마지막 프레임 release 때 닫음)
+        self.ring_lock = threading.Lock() # 수신 스레드 (forget) 와 GUI 스레드 (release) 가 함께 사용
+        if start:
+            self.start()
+
+    def start(self):
+        self.capture.start()
+        self.pipeline.start()
+
+    def send(self, *message):
+        with self.lock:
+            try:
+                self.conn.send(message)
+            except (BrokenPipeError, OSError):
+                pass
+
+    def poll(self, timeout=0.0):
+        try:
+            return self.conn.poll(timeout)
+        except (EOFError, OSError):
+            return False
+
+    def recv(self):
+        return self.conn.recv()
+
+    def attach(self, name):
+        ring = self.rings.get(name)
+        if ring is None:
+            ring = self.rings[name] = SharedRing(name)
+        return ring
+
+    def hold(self, name):
+        # GUI 프레임이 링을 참조하는 동안 닫지 않도록 잡음 -> 프레임 release 때 반환할 RingHold
+        with self.ring_lock:
+            self.holds[name] = self.holds.get(name, 0) + 1
+        return RingHold(self, name)
+
+    def unhold(self, name):
+        with self.ring_lock:
+            count = self.holds.get(name, 0) - 1
+            if count > 0:
+                self.holds[name] = count
+                return
+            self.holds.pop(name, None)
+            ring = self.retired.pop(name, None)
+        if ring is not None:
+            ring.close()
+
+    def forget(self, name):
+        # 처리 프로세스가 링을 교체함: 참조 중인 프레임이 없을 때만 바로 닫음
+        with self.ring_lock:
+            ring = self.rings.pop(name, None)
+            if ring is not None and self.holds.get(name):
+                self.retired[name], ring = ring, None
+        if ring is not None:
+            ring.close()
+
+    def stop(self, timeout=2.0):
+        self.send("stop")
+        for process in (self.pipeline, self.capture):
+            if process.pid is None:
+                continue # 시작하지 않음
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.conn.close()
+        with self.ring_lock:
+            rings = list(self.rings.values()) + list(self.retired.values())
+            self.rings, self.retired, self.holds = {}, {}, {}
+        for ring in rings:
+            ring.close()
+
+
+class RingHold:
+    # EdgeFrame.slot 자리에 두는 링 참조 (release() 로 반환, 두 번 불러도 한 번만 반환)
+    def __init__(self, pipeline, name):
+        self.pipeline = pipeline
+        self.name = name
+
+    def release(self):
+        pipeline, self.pipeline = self.pipeline, None
+        if pipeline is not None:
+            pipeline.unhold(self.name)
@@ -0,0 +1,262 @@
+# 엣지 스트림 (Shared-memory Edge Stream)
+# 엣지 마스크를 이름 있는 공유 메모리 링에 게시해 같은 기기의 다른 프로세스 (녹화 / 분석 / 다른 렌더러) 가
+# 캡처 / 엣지 검출을 다시 하지 않고 복사 없이 읽게 한다.
+#   - 게시: 오버레이 워커 (Config.EDGE_STREAM 이름 접두사 + "_" + 영역 id) 또는 창 없는 게시 모드
+#       python edge_stream.py publish --source dxcam:0 --name edges
+#   - 읽기 (참조 구현): EdgeStreamReader, python edge_stream.py read --name edges
+# 링 형식은 shm_ring 과 같음 (헤더에 게시자 pid / heartbeat). 슬롯 extra 값: (sequence, 캡처 시각 ns, 설정 버전)
+#   sequence: 1 부터 게시할 때마다 1 증가 (건너뛴 프레임 확인용)
+#   캡처 시각: time.perf_counter_ns() 기준 (같은 기기의 다른 프로세스에서 비교 가능)
+# 마스크는 1채널 uint8 (0 = 엣지 아님, 255 = 엣지), 영역이 바뀌면 모양도 바뀜
+# Qt 비의존.
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from shm_ring import SharedRing
+
+STREAM_SLOTS = 4    # 읽는 쪽이 프레임을 쓰는 동안 (slots - 1) 번 게시까지는 덮어쓰이지 않음
+STREAM_STALE = 30.0 # 게시자 heartbeat 가 이보다 오래 (초) 멈춘 같은 이름의 링은 남은 링으로 보고 교체 (pid 재사용 대비)
+
+StreamFrame = namedtuple("StreamFrame", "sequence timestamp version mask index seq")
+
+
+class EdgeStream:
+    # 쓰는 쪽: 영역 하나의 엣지 마스크 게시. capacity = 가장 큰 마스크 바이트 수 (보통 모니터 크기)
+    def __init__(self, name, capacity, slots=STREAM_SLOTS):
+        self.name = name
+        try:
+            self.ring = SharedRing(name, slots, capacity, create=True)
+        except FileExistsError:
+            if sys.platform == "win32":
+                # Windows 는 연결한 프로세스가 남아 있는 동안만 이름이 존재 -> 다른 게시자가 사용 중
+                raise
+            # 이전 게시자가 비정상 종료해 남은 링이면 지우고 다시 만듦 (연결해 있던 읽는 쪽은 다시 연결해야 함)
+            # 게시자가 살아 있으면 (실수로 두 번 실행) 가로채지 않음
+            stale = SharedRing(name)
+            pid = stale.owner_pid()
+            if _alive(pid) and stale.idle() < STREAM_STALE:
+                stale.close()
+                raise FileExistsError(f"다른 게시자 (pid {pid}) 가 사용 중인 스트림: {name}")
+            stale.owner = True
+            stale.close()
+            self.ring = SharedRing(name, slots, capacity, create=True)
+        self.sources = [None] * self.ring.slots # 슬롯별 (엔진, 영역, serial) -> 바뀐 부분만 다시 씀
+
+    def beat(self):
+        # 게시할 프레임이 없는 동안에도 이 이름을 쓰고 있음을 알림
+        self.ring.beat()
+
+    def publish(self, engine, rect, captured_at, version):
+        # engine 의 엣지 맵 중 rect (y0, y1, x0, x1) 를 다음 슬롯에 쓰고 게시, sequence 반환
+        y0, y1, x0, x1 = rect
+        ring = self.ring
+        index, view = ring.begin_write((y1 - y0, x1 - x0))
+        last = self.sources[index]
+        since = last[2] if last is not None and last[:2] == (engine, rect) else None
+        self.sources[index] = (engine, rect, engine.render(view, since, rect))
+        sequence = ring.published() + 1
+        ring.end_write(index, sequence, int(captured_at * 1e9), version)
+        return sequence
+
+    def close(self):
+        self.ring.close()
+
+
+def _alive(pid):
+    # POSIX: pid 프로세스가 있는지 (신호는 보내지 않음)
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class StreamSet:
+    # 영역별 스트림 묶음 (캡처 워커 / 처리 프로세스에서 사용)
+    def __init__(self):
+        self.streams = {}   # 영역 id -> EdgeStream
+        self.failed = set() # 만들지 못한 이름 (매 프레임 다시 시도하지 않음)
+
+    def publish(self, prefix, key, engine, rect, capacity, captured_at, version, changed):
+        # 스트림이 새로 생기면 엣지 맵이 바뀌지 않았어도 게시
+        name = f"{prefix}_{key}"
+        stream = self.streams.get(key)
+        if stream is not None and stream.name != name:
+            self.streams.pop(key).close()
+            stream = None
+        if stream is None:
+            if name in self.failed:
+                return
+            try:
+                stream = self.streams[key] = EdgeStream(name, capacity)
+            except (OSError, ValueError) as e:
+                self.failed.add(name)
+                print(f"엣지 스트림 생성 실패 ({name}): {e}")
+                return
+            changed = True
+        if changed:
+            stream.publish(engine, rect, captured_at, version)
+        else:
+            stream.beat()
+
+    def beat(self):
+        # 처리할 프레임이 없는 동안 (일시 정지 / 화면 변화 없음) 열린 스트림의 heartbeat 갱신
+        for stream in self.streams.values():
+            stream.beat()
+
+    def retain(self, keys):
+        # keys 에 없는 영역의 스트림 닫기 (영역 제거 / 스트림 끄기)
+        for key in [key for key in self.streams if key not in keys]:
+            self.streams.pop(key).close()
+
+    def close(self):
+        self.retain(())
+
+
+class EdgeStreamReader:
+    # 읽는 쪽 (참조 구현). 잠금이 없으므로 여러 프로세스가 동시에 읽을 수 있음
+    # read() 의 mask 는 링 슬롯의 뷰 (복사 없음): 다 쓴 뒤 valid(frame) 이 False 면 그 사이 덮어써진 것
+    # 오래 보관하려면 read(copy=True)
+    def __init__(self, name):
+        self.ring = SharedRing(name)
+        self.last = 0       # 마지막으로 읽은 sequence
+        self.missed = 0     # 읽기 전에 지나간 프레임 수
+        self.torn = 0       # 읽는 중 덮어써진 프레임 수 (copy=True 일 때)
+
+    def poll(self):
+        return self.ring.published() != self.last
+
+    def read(self, copy=False):
+        # 마지막으로 게시된 프레임 (StreamFrame), 새 프레임이 없거나 쓰는 중이면 None
+        if not self.poll():
+            return None
+        latest = self.ring.latest()
+        if latest is None:
+            return None
+        index, seq, view, extra = latest
+        sequence, timestamp, version = extra[:3]
+        if sequence <= self.last:
+            return None
+        if self.last:
+            self.missed += sequence - self.last - 1
+        self.last = sequence
+        if copy:
+            view = view.copy()
+            if not self.ring.valid(index, seq):
+                self.torn += 1
+                return None
+        return StreamFrame(sequence, timestamp, version, view, index, seq)
+
+    def wait(self, timeout=None, interval=0.0005):
+        # 새 프레임이 게시될 때까지 대기 (폴링), timeout 초가 지나면 None
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            frame = self.read()
+            if frame is not None:
+                return frame
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            time.sleep(interval)
+
+    def valid(self, frame):
+        return self.ring.valid(frame.index, frame.seq)
+
+    def close(self):
+        self.ring.close()
+
+
+def publish_main(spec, name, width=1920, height=1080, region=None, rate=None, seconds=None, stop=None):
+    # 창 없는 게시 모드: 소스 캡처 -> 엣지 처리 -> 스트림 게시 (seconds=None 이면 중단할 때까지)
+    # region: (x, y, w, h), None 이면 소스 전체. rate: 처리 주기 (Hz), None 이면 설정값 (0 = 제한 없음)
+    # stop: 설정되면 끝내는 Event (다른 프로세스에서 실행할 때)
+    from capture_regions import RegionCapture
+    from edge_config import config_store
+    from frame_scheduler import FrameScheduler
+    from frame_sources import open_source
+
+    source = open_source(spec, width, height)
+    capture = RegionCapture(config_store)
+    capture.set_region(0, region or (0, 0, source.width, source.height))
+    scheduler = FrameScheduler()
+    stream = EdgeStream(name, source.width * source.height)
+    end = None if seconds is None else time.perf_counter() + seconds
+    published = 0
+    try:
+        while (end is None or time.perf_counter() < end) and not (stop is not None and stop.is_set()):
+            cfg = config_store.current
+            refresh = cfg.REFRESH_RATE if rate is None else rate
+            start = time.perf_counter()
+            scheduler.adaptive = cfg.ADAPTIVE_QUALITY
+            capture.quality_scale = scheduler.scale
+            changed = capture.update(source, cfg)
+            if changed is None:
+                stream.beat()
+                scheduler.wait_for_frame(refresh)
+                continue
+            for group in capture.groups.values():
+                for rect in group.members.values():
+                    if group.changed or not published:
+                        stream.publish(group.engine, rect, capture.captured_at, cfg.version)
+                        published += 1
+            scheduler.frame_done(time.perf_counter() - start, refresh)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        capture.close()
+        stream.close()
+        source.release()
+    return published
+
+
+def read_main(name, seconds=None):
+    # 참조 읽기: 초마다 받은 프레임 수 / 건너뛴 수 / 지연 (캡처 -> 읽기) 출력
+    reader = EdgeStreamReader(name)
+    end = None if seconds is None else time.perf_counter() + seconds
+    frames, latency, report = 0, 0.0, time.perf_counter() + 1.0
+    try:
+        while end is None or time.perf_counter() < end:
+            frame = reader.wait(timeout=1.0)
+            if frame is not None:
+                frames += 1
+                latency = (time.perf_counter_ns() - frame.timestamp) / 1e6
+            now = time.perf_counter()
+            if now >= report:
+                print(f"{frames} fps | 건너뜀 {reader.missed} | 지연 {latency:.1f} ms | seq {reader.last}")
+                frames, report = 0, now + 1.0
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="공유 메모리 엣지 스트림")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("publish", help="창 없이 캡처 / 엣지 처리 후 스트림 게시")
+    p.add_argument("--source", default="dxcam:0", help="dxcam[:idx], synthetic[:kind], video:PATH, replay:PATH")
+    p.add_argument("--name", default="edge_stream", help="공유 메모리 이름")
+    p.add_argument("--region", type=int, nargs=4, metavar=("X", "Y", "W", "H"), help="처리할 영역 (기본: 전체)")
+    p.add_argument("--rate", type=int, help="처리 주기 (Hz, 0 = 제한 없음, 기본: 설정값)")
+    p.add_argument("--seconds", type=float, help="게시 시간 (기본: 중단할 때까지)")
+    p = sub.add_parser("read", help="스트림 읽기 (참조 구현)")
+    p.add_argument("--name", default="edge_stream")
+    p.add_argument("--seconds", type=float)
+    args = parser.parse_args(argv)
+    if args.command == "publish":
+        region = tuple(args.region) if args.region else None
+        count = publish_main(args.source, args.name, region=region, rate=args.rate, seconds=args.seconds)
+        print(f"게시 {count} 프레임")
+    else:
+        read_main(args.name, args.seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
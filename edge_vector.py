@@ -0,0 +1,42 @@
+# 벡터 출력 (Vector Output)
+# 엔진이 추출한 윤곽선 (extract_contours) -> QPainterPath
+# QPainterPath 는 QObject 가 아니므로 워커 스레드에서 만들어 GUI 로 넘겨도 됨.
+# 점마다 moveTo / lineTo 를 호출하면 느리므로 QDataStream 직렬화 형식으로 만들어 한 번에 읽어 들인다.
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+# QDataStream 의 QPainterPath 요소 형식 (빅 엔디언): 종류 (0 = moveTo, 1 = lineTo), x, y
+PATH_ELEMENT = np.dtype([("type", ">i4"), ("x", ">f8"), ("y", ">f8")])
+
+
+def contours_to_path(points, counts):
+    # 윤곽선마다 시작점으로 돌아와 닫음, 좌표는 픽셀 중심 (+0.5)
+    path = QtGui.QPainterPath()
+    if len(counts) == 0:
+        return path
+    total = len(points) + len(counts)
+    ends = np.cumsum(counts + 1) - 1  # 윤곽선별 닫는 점 위치
+    starts = ends - counts
+
+    elements = np.empty(total, PATH_ELEMENT)
+    body = np.ones(total, bool)
+    body[ends] = False
+    elements["type"] = 1
+    elements["type"][starts] = 0
+    elements["x"][body] = points[:, 0] + 0.5
+    elements["y"][body] = points[:, 1] + 0.5
+    elements["x"][ends] = elements["x"][starts]
+    elements["y"][ends] = elements["y"][starts]
+
+    # 요소 수 + 요소 + (cStart, fillRule)
+    data = np.array([total], ">i4").tobytes() + elements.tobytes() + np.zeros(2, ">i4").tobytes()
+    stream = QtCore.QDataStream(QtCore.QByteArray(data))
+    stream >> path
+    return path
+
+
+def edge_pen(key, thickness):
+    # 엣지 색상 / 투명도 / 두께로 그리는 펜 (비트맵 팽창과 비슷하도록 사각 끝 처리)
+    (r, g, b), a = key
+    return QtGui.QPen(QtGui.QColor(r, g, b, a), thickness, QtCore.Qt.SolidLine,
+                      QtCore.Qt.SquareCap, QtCore.Qt.MiterJoin)
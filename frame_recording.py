@@ -0,0 +1,269 @@
+# 프레임 녹화 / 재생 (Frame Recording & Replay)
+# 사용자 환경에서 캡처한 프레임을 그대로 저장했다가 어느 기기에서나 (캡처 장치 없는 Linux 포함) 같은 순서 / 간격으로 재생한다.
+# 파일 형식: 파일 헤더 + 레코드 (헤더 + 프레임 또는 설정 JSON), 모두 64바이트 정렬
+#   프레임은 직전 프레임에서 바뀐 TILE x TILE 타일만 저장 (무손실, 위치 / 크기가 바뀌면 전체 타일)
+#   쓰기 스레드가 따라가는 동안은 타일을 zlib 으로 압축하고, 큐가 밀리면 압축 없이 씀 (프레임을 버리지 않도록)
+#   원본 BGR 을 그대로 쓰면 1080p 한 장이 6 MiB 라 사용자 환경에서 받아오기 어려움
+#   재생 시 열 때 한 번 원본 픽셀로 풀어 임시 파일에 쓰고, 그 파일을 메모리 매핑해 매핑 위의 뷰로 돌려줌
+#   -> 복사 / 디코딩 비용이 측정에 섞이지 않음 (EDGEREC1 의 원본 프레임 레코드도 그대로 읽음)
+# 녹화는 별도 스레드에서 쓰므로 캡처 루프는 큐에 넣기만 함 (큐가 가득 차면 그 프레임은 버리고 dropped 로 기록)
+import json
+import queue
+import tempfile
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from frame_sources import FrameSource
+
+MAGIC = b"EDGEREC2"
+MAGIC_RAW = b"EDGEREC1"  # 원본 프레임만 있는 이전 형식
+ALIGN = 64
+TILE = 64
+LEVEL = 1   # zlib 압축 수준 (쓰기 스레드가 캡처 속도를 따라가야 하므로 가장 빠른 수준)
+
+FILE_HEADER = np.dtype([("magic", "S8"), ("width", "<u4"), ("height", "<u4"), ("pad", "V48")])
+
+# kind: RECORD_FRAME = 원본 픽셀 (h, w, c), RECORD_CONFIG = 설정 스냅샷 JSON (version 에 해당)
+#       RECORD_TILES = 직전 프레임 대비 바뀐 타일: 타일 수 n (u4), 타일 번호 (u4 x n), 타일 픽셀을 차례로
+#                      타일 번호는 행 우선, 가장자리 타일은 잘린 크기 그대로, packed = 1 이면 전체가 zlib 압축
+# x, y: 프레임이 캡처된 위치 (모니터 로컬), timestamp: 첫 프레임 기준 캡처 시각 (ns)
+RECORD = np.dtype([("kind", "<u4"), ("height", "<u4"), ("width", "<u4"), ("channels", "<u4"),
+                   ("x", "<i4"), ("y", "<i4"), ("version", "<i8"), ("timestamp", "<i8"),
+                   ("size", "<u8"), ("packed", "<u4"), ("pad", "V12")])
+RECORD_FRAME = 1
+RECORD_CONFIG = 2
+RECORD_TILES = 3
+
+
+def _padding(size):
+    return -size % ALIGN
+
+
+def _tiles(shape):
+    # 프레임 모양 -> (타일 행 수, 타일 열 수)
+    return -(-shape[0] // TILE), -(-shape[1] // TILE)
+
+
+def _tile(frame, index, columns):
+    y, x = divmod(int(index), columns)
+    return frame[y * TILE:(y + 1) * TILE, x * TILE:(x + 1) * TILE]
+
+
+class FrameRecorder:
+    # write(frame, (x, y, w, h), 캡처 시각, 설정 스냅샷) 을 캡처 루프에서 호출
+    def __init__(self, path, width, height, queue_size=16):
+        self.path = path
+        self.file = open(path, "wb")
+        header = np.zeros(1, FILE_HEADER)
+        header["magic"], header["width"], header["height"] = MAGIC, width, height
+        self.file.write(header.tobytes())
+        self.queue = queue.Queue(queue_size)
+        self.version = None # 마지막으로 기록한 설정 버전
+        self.started = None
+        self.frames = 0
+        self.dropped = 0
+        self.bytes = 0
+        self.raw_bytes = 0  # 원본 그대로 저장했다면의 크기 (압축률 확인용)
+        self.unpacked = 0   # 압축하지 않고 쓴 프레임 수 (큐가 밀렸거나 압축해도 줄지 않음)
+        self.previous = None    # 쓰기 스레드 전용: 마지막 프레임의 복사본 (위치, 픽셀)
+        self.thread = threading.Thread(target=self._writer, name="frame-recorder", daemon=True)
+        self.thread.start()
+
+    def write(self, frame, region, captured_at, cfg=None):
+        # frame 은 녹화가 끝날 때까지 바뀌지 않아야 함 (dxcam grab 결과는 매번 새 배열)
+        if self.started is None:
+            self.started = captured_at
+        version = -1 if cfg is None else cfg.version
+        config = None
+        if cfg is not None and version != self.version:
+            config = {name: value for name, value in cfg._asdict().items() if name != "version"}
+        try:
+            self.queue.put_nowait((frame, region, int((captured_at - self.started) * 1e9), version, config))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.version = version
+        return True
+
+    def _writer(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            frame, (x, y, _, _), timestamp, version, config = item
+            if config is not None:
+                self._record(RECORD_CONFIG, (0, 0, 0), 0, 0, version, timestamp,
+                             json.dumps(config).encode("utf-8"))
+            shape = frame.shape + (0,) * (3 - frame.ndim)
+            payload, packed = self._encode(frame, (x, y), self.queue.qsize() < self.queue.maxsize // 2)
+            self._record(RECORD_TILES, shape, x, y, version, timestamp, payload, packed)
+            self.unpacked += not packed
+            self.frames += 1
+            self.raw_bytes += RECORD.itemsize + frame.nbytes + _padding(frame.nbytes)
+
+    def _encode(self, frame, position, packed):
+        # 직전 프레임과 비교해 바뀐 타일만 모음 -> (데이터, 압축 여부)
+        # packed 이면 압축하되 줄지 않으면 (영상 / 노이즈) 압축하지 않은 쪽을 씀
+        rows, columns = _tiles(frame.shape)
+        previous = self.previous
+        if previous is None or previous[0] != position or previous[1].shape != frame.shape:
+            changed = np.arange(rows * columns, dtype="<u4")
+            previous = (position, np.empty_like(frame))
+            self.previous = previous
+        else:
+            # 채널 축으로 any 를 하면 느리므로 행을 바이트로 펴서 타일 폭 (TILE * 채널) 단위로 묶음
+            diff = (frame != previous[1]).reshape(frame.shape[0], -1)
+            step = TILE * diff.shape[1] // frame.shape[1]
+            diff = np.logical_or.reduceat(diff, np.arange(0, frame.shape[0], TILE), axis=0)
+            diff = np.logical_or.reduceat(diff, np.arange(0, diff.shape[1], step), axis=1)
+            changed = np.flatnonzero(diff).astype("<u4")
+        np.copyto(previous[1], frame)
+        parts = [np.uint32(len(changed)).tobytes(), changed.tobytes()]
+        parts.extend(np.ascontiguousarray(_tile(frame, index, columns)).tobytes() for index in changed)
+        payload = b"".join(parts)
+        if packed:
+            compressed = zlib.compress(payload, LEVEL)
+            if len(compressed) < len(payload) * 0.9:
+                return compressed, True
+        return payload, False
+
+    def _record(self, kind, shape, x, y, version, timestamp, payload, packed=False):
+        header = np.zeros(1, RECORD)
+        header[0] = (kind, *shape, x, y, version, timestamp, len(payload), packed, bytes(12))
+        self.file.write(header.tobytes())
+        self.file.write(payload)
+        self.file.write(bytes(_padding(len(payload))))
+        self.bytes += RECORD.itemsize + len(payload) + _padding(len(payload))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        self.previous = None
+
+
+class ReplaySource(FrameSource):
+    # 녹화 파일 재생. realtime=True 이면 원래 캡처 간격대로 (다음 프레임 시각 전에는 grab() -> None)
+    # realtime=False 이면 grab() 마다 다음 프레임 (처리 속도 측정용)
+    # grab(region) 은 녹화된 위치 안의 영역만 잘라서 돌려줌 (벗어나면 None), 뷰는 읽기 전용
+    def __init__(self, path, realtime=False, loop=True):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.data = np.memmap(path, np.uint8, "r").view(np.ndarray)
+        self.expanded = None    # 타일 레코드를 풀어 쓴 임시 파일 (닫으면 삭제)
+        header = np.frombuffer(self.data, FILE_HEADER, 1)[0]
+        if header["magic"] not in (MAGIC, MAGIC_RAW):
+            raise IOError(f"녹화 파일 형식이 아님: {path}")
+        self.width, self.height = int(header["width"]), int(header["height"])
+
+        # 레코드 색인 (헤더만 읽음)
+        self.records = []   # (오프셋, 모양, (x, y, w, h), 설정 버전, 시각 ns)
+        self.configs = {}   # 설정 버전 -> {설정}
+        tiles = []  # 타일 레코드: (records 의 번호, 데이터 위치, 크기, 압축 여부)
+        offset = FILE_HEADER.itemsize
+        while offset + RECORD.itemsize <= len(self.data):
+            record = np.frombuffer(self.data, RECORD, 1, offset)[0]
+            start = offset + RECORD.itemsize
+            size = int(record["size"])
+            if start + size > len(self.data):
+                break   # 녹화 중 끊긴 마지막 레코드
+            if record["kind"] in (RECORD_FRAME, RECORD_TILES):
+                h, w, c = int(record["height"]), int(record["width"]), int(record["channels"])
+                region = (int(record["x"]), int(record["y"]), w, h)
+                if record["kind"] == RECORD_TILES:
+                    tiles.append((len(self.records), start, size, bool(record["packed"])))
+                self.records.append((start, (h, w, c) if c else (h, w), region,
+                                     int(record["version"]), int(record["timestamp"])))
+            elif record["kind"] == RECORD_CONFIG:
+                self.configs[int(record["version"])] = json.loads(bytes(self.data[start:start + size]))
+            offset = start + size + _padding(size)
+        if not self.records:
+            raise IOError(f"녹화된 프레임이 없음: {path}")
+        if tiles:
+            self._expand(tiles)
+        self.index = 0
+        self.started = None
+        self.current = None # 마지막으로 돌려준 레코드
+
+    def _expand(self, tiles):
+        # 타일 레코드를 원본 픽셀로 풀어 임시 파일에 차례로 쓰고, records 의 위치를 그 파일 기준으로 바꿈
+        # (녹화기는 한 파일에 타일 레코드만 쓰므로 원본 프레임 레코드와 섞이지 않음)
+        self.expanded = tempfile.TemporaryFile(prefix="edgerec-")
+        frame = None
+        position = None
+        offset = 0
+        for number, start, size, packed in tiles:
+            _, shape, region, version, timestamp = self.records[number]
+            if frame is None or frame.shape != shape or position != region[:2]:
+                frame = np.zeros(shape, np.uint8)
+                position = region[:2]
+            payload = self.data[start:start + size]
+            if packed:
+                payload = zlib.decompress(payload)
+            count = int(np.frombuffer(payload, "<u4", 1)[0])
+            cursor = 4 + 4 * count
+            columns = _tiles(shape)[1]
+            for index in np.frombuffer(payload, "<u4", count, 4):
+                tile = _tile(frame, index, columns)
+                tile[...] = np.frombuffer(payload, np.uint8, tile.size, cursor).reshape(tile.shape)
+                cursor += tile.size
+            self.expanded.write(memoryview(frame).cast("B"))
+            self.expanded.write(bytes(_padding(frame.nbytes)))
+            self.records[number] = (offset, shape, region, version, timestamp)
+            offset += frame.nbytes + _padding(frame.nbytes)
+        self.expanded.flush()
+        self.data = np.memmap(self.expanded, np.uint8, "r").view(np.ndarray)
+
+    @property
+    def duration(self):
+        return self.records[-1][4] / 1e9
+
+    def grab(self, region=None):
+        if self.index >= len(self.records):
+            if not self.loop:
+                return None
+            self.index = 0
+            self.started = None
+        record = self.records[self.index]
+        offset, shape, (x, y, w, h), _, timestamp = record
+        if self.realtime:
+            now = time.perf_counter()
+            if self.started is None:
+                self.started = now - timestamp / 1e9
+            elif now < self.started + timestamp / 1e9:
+                return None
+        self.index += 1
+        self.current = record
+        frame = self.data[offset:offset + int(np.prod(shape))].reshape(shape)
+        if region is None:
+            return frame
+        l, t, r, b = region
+        if l < x or t < y or r > x + w or b > y + h:
+            return None
+        return frame[t - y:b - y, l - x:r - x]
+
+    def region(self):
+        # 마지막으로 돌려준 프레임의 녹화 위치 (x, y, w, h)
+        record = self.current or self.records[0]
+        return record[2]
+
+    def config(self):
+        # 마지막으로 돌려준 프레임을 캡처할 때의 설정 (녹화되지 않았으면 None)
+        record = self.current or self.records[0]
+        return self.configs.get(record[3])
+
+    def rewind(self):
+        self.index = 0
+        self.started = None
+        self.current = None
+
+    def release(self):
+        self.records = []
+        self.data = None
+        if self.expanded is not None:
+            self.expanded.close()
+            self.expanded = None
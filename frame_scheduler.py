@@ -0,0 +1,132 @@
+# 프레임 스케줄러 (Deadline-based Frame Scheduler)
+# 단조 증가 고해상도 시계(perf_counter) 기준 절대 마감 시각으로 주사율을 맞추고,
+# 처리 시간이 계속 예산을 넘으면 처리 배율 -> 처리 주기 순으로 품질을 낮춘다.
+import time
+
+# 품질 단계 (처리 배율, 주기 배수). 0 = 최고 품질
+QUALITY_LEVELS = (
+    (1.0, 1),
+    (0.75, 1),
+    (0.5, 1),
+    (0.5, 2),
+    (0.5, 3),
+)
+
+MISS_WINDOW = 30        # 이 프레임 수 동안
+MISS_LIMIT = 8          # 이만큼 예산을 넘기면 한 단계 낮춤
+RECOVER_HEADROOM = 0.7  # 한 단계 올렸을 때 예상 시간이 예산의 이 비율 이하면 복구
+HOLD_FRAMES = 60        # 단계 변경 후 다시 바꾸기 전 최소 프레임 수
+EWMA_ALPHA = 0.1
+
+BACKOFF_MIN = 0.0005    # 새 프레임이 없을 때 첫 대기 (초)
+SPIN_MARGIN = 0.0005    # 마감 직전 이 시간은 sleep 대신 양보(yield)하며 대기
+
+
+class FrameScheduler:
+    def __init__(self, clock=time.perf_counter, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.adaptive = True
+        self.level = 0
+        self.next_deadline = None
+        self.backoff = 0.0
+        self.work_avg = None
+        self.window_frames = 0
+        self.window_misses = 0
+        self.hold = 0
+
+        # 통계
+        self.frames = 0
+        self.missed_deadlines = 0
+
+    @property
+    def scale(self):
+        return QUALITY_LEVELS[self.level][0]
+
+    @property
+    def rate_divisor(self):
+        return QUALITY_LEVELS[self.level][1]
+
+    def interval(self, refresh_rate):
+        if refresh_rate <= 0:
+            return 0.0
+        return self.rate_divisor / float(refresh_rate)
+
+    def reset(self):
+        # 일시 정지 후 재개 시 밀린 마감 시각을 따라잡으려 하지 않도록 초기화
+        self.next_deadline = None
+        self.backoff = 0.0
+
+    def wait_for_frame(self, refresh_rate):
+        # 새 프레임이 없을 때: 0.5ms 부터 두 배씩, 최대 프레임 간격의 절반까지 대기
+        limit = max(BACKOFF_MIN, self.interval(refresh_rate) * 0.5 or 0.005)
+        self.backoff = min(limit, max(BACKOFF_MIN, self.backoff * 2))
+        self.sleep(self.backoff)
+
+    def frame_done(self, work_time, refresh_rate):
+        # 한 프레임 처리 완료. 품질 조정 후 다음 마감 시각까지 대기
+        self.backoff = 0.0
+        self.frames += 1
+        interval = self.interval(refresh_rate)
+        if self.adaptive and interval > 0:
+            self._adapt(work_time, interval)
+            interval = self.interval(refresh_rate)
+        self._wait_next(interval)
+
+    def _adapt(self, work_time, budget):
+        if self.work_avg is None:
+            self.work_avg = work_time
+        else:
+            self.work_avg += EWMA_ALPHA * (work_time - self.work_avg)
+
+        self.window_frames += 1
+        if work_time > budget:
+            self.window_misses += 1
+        if self.hold > 0:
+            self.hold -= 1
+
+        if self.window_frames >= MISS_WINDOW:
+            misses = self.window_misses
+            self.window_frames = self.window_misses = 0
+            if misses >= MISS_LIMIT and self.level < len(QUALITY_LEVELS) - 1 and self.hold == 0:
+                self._set_level(self.level + 1)
+                return
+
+        if self.level > 0 and self.hold == 0:
+            # 한 단계 올렸을 때 처리 시간은 픽셀 수에 비례한다고 보고 예측
+            scale, divisor = QUALITY_LEVELS[self.level]
+            up_scale, up_divisor = QUALITY_LEVELS[self.level - 1]
+            predicted = self.work_avg * (up_scale / scale) ** 2
+            up_budget = budget * up_divisor / divisor
+            if predicted < up_budget * RECOVER_HEADROOM:
+                self._set_level(self.level - 1)
+
+    def _set_level(self, level):
+        self.level = level
+        self.hold = HOLD_FRAMES
+        self.window_frames = self.window_misses = 0
+
+    def _wait_next(self, interval):
+        now = self.clock()
+        if interval <= 0:
+            # 주사율 제한 해제 시에도 최소한의 양보
+            self.sleep(0.001)
+            self.next_deadline = None
+            return
+
+        if self.next_deadline is None:
+            self.next_deadline = now + interval
+        else:
+            self.next_deadline += interval
+            if now > self.next_deadline:
+                # 마감을 놓침 -> 밀린 프레임을 몰아서 처리하지 않고 현재 시각 기준으로 재정렬
+                self.missed_deadlines += 1
+                self.next_deadline = now + interval
+                return
+
+        # 절대 시각 기준 대기 (오차가 누적되지 않음)
+        remaining = self.next_deadline - now
+        if remaining > SPIN_MARGIN:
+            self.sleep(remaining - SPIN_MARGIN)
+        while self.clock() < self.next_deadline:
+            self.sleep(0)
@@ -0,0 +1,245 @@
+# 프레임 소스 (Frame Sources)
+# 모든 소스는 DXCam 카메라와 같은 형태를 따른다:
+#   width / height 속성, grab(region=(l, t, r, b)) -> BGR ndarray 또는 None, release()
+# dxcam 은 DXCamSource 생성 시점에만 import 하므로 Linux 에서도 나머지 소스는 사용 가능.
+import os
+
+import cv2
+import numpy as np
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+def _crop(frame, region):
+    if region is None:
+        return frame
+    l, t, r, b = region
+    return frame[t:b, l:r]
+
+
+class FrameSource:
+    width = 0
+    height = 0
+
+    def grab(self, region=None):
+        raise NotImplementedError
+
+    def rewind(self):
+        # 처음 프레임부터 다시 (반복 측정용, 지원하지 않는 소스는 무시)
+        pass
+
+    def release(self):
+        pass
+
+
+class DXCamSource(FrameSource):
+    def __init__(self, output_idx=0):
+        import dxcam
+        # output_color="BGR" 그대로 사용 (OpenCV 변환이 빠름)
+        self.cam = dxcam.create(output_idx=output_idx, output_color="BGR")
+        self.output_idx = output_idx
+
+    @property
+    def width(self):
+        return self.cam.width
+
+    @property
+    def height(self):
+        return self.cam.height
+
+    def grab(self, region=None):
+        return self.cam.grab(region=region)
+
+    def release(self):
+        # 안전하게 기존 카메라 해제
+        cam, self.cam = self.cam, None
+        del cam
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, loop=True):
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"동영상을 열 수 없음: {path}")
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+    def grab(self, region=None):
+        ok, frame = self.cap.read()
+        if not ok and self.loop:
+            # 끝에 도달하면 처음부터 다시 재생
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        if not ok:
+            return None
+        return _crop(frame, region)
+
+    def rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirSource(FrameSource):
+    def __init__(self, path, loop=True):
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTS)
+        )
+        if not self.files:
+            raise IOError(f"이미지가 없음: {path}")
+        self.loop = loop
+        self.index = 0
+        # 크기는 읽을 수 있는 첫 이미지 기준 (깨진 파일은 grab() 에서 None)
+        first = next((image for image in (cv2.imread(path, cv2.IMREAD_COLOR) for path in self.files)
+                      if image is not None), None)
+        if first is None:
+            raise IOError(f"읽을 수 있는 이미지가 없음: {path}")
+        self.height, self.width = first.shape[:2]
+
+    def grab(self, region=None):
+        if self.index >= len(self.files):
+            if not self.loop:
+                return None
+            self.index = 0
+        frame = cv2.imread(self.files[self.index], cv2.IMREAD_COLOR)
+        self.index += 1
+        if frame is None:
+            return None
+        return _crop(frame, region)
+
+    def rewind(self):
+        self.index = 0
+
+
+class SyntheticSource(FrameSource):
+    # 미리 생성한 합성 프레임을 순환 재생 (캡처 장치 없이 벤치마크용)
+    KINDS = ("ui", "noise", "natural", "scroll")
+    SCROLL_STEPS = (0, 8, 24, 40, 40, 120, -16, -40)  # scroll: 프레임 간 세로 이동량 (px)
+
+    def __init__(self, width, height, kind="ui", count=8, seed=0):
+        if kind not in self.KINDS:
+            raise ValueError(f"알 수 없는 합성 프레임 종류: {kind}")
+        self.width = width
+        self.height = height
+        self.kind = kind
+        rng = np.random.default_rng(seed)
+        if kind == "scroll":
+            self.frames = self._make_scroll(rng, count)
+        else:
+            make = getattr(self, f"_make_{kind}")
+            self.frames = [make(rng) for _ in range(count)]
+        self.index = 0
+
+    def grab(self, region=None):
+        frame = self.frames[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        return _crop(frame, region)
+
+    def rewind(self):
+        self.index = 0
+
+    def _make_noise(self, rng):
+        return rng.integers(0, 256, (self.height, self.width, 3), dtype=np.uint8)
+
+    def _make_ui(self, rng):
+        # 창 / 버튼 형태의 사각형과 텍스트가 있는 UI 풍 화면
+        w, h = self.width, self.height
+        frame = np.full((h, w, 3), 235, dtype=np.uint8)
+        for _ in range(40):
+            x0, y0 = int(rng.integers(0, w)), int(rng.integers(0, h))
+            x1 = min(w - 1, x0 + int(rng.integers(w // 20, w // 3)))
+            y1 = min(h - 1, y0 + int(rng.integers(h // 20, h // 3)))
+            color = tuple(int(c) for c in rng.integers(0, 256, 3))
+            cv2.rectangle(frame, (x0, y0), (x1, y1), color, -1)
+            cv2.rectangle(frame, (x0, y0), (x1, y1), (40, 40, 40), 1)
+        scale = h / 1080.0
+        for _ in range(60):
+            x, y = int(rng.integers(0, w)), int(rng.integers(0, h))
+            cv2.putText(frame, "Edge Overlay 1234", (x, y), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.6 * scale + 0.2, (20, 20, 20), 1, cv2.LINE_AA)
+        return frame
+
+    def _make_scroll(self, rng, count):
+        # 긴 문서 한 장을 세로로 스크롤하며 보는 화면 (문서 / 코드 편집기)
+        # 상단 고정 헤더는 스크롤되지 않음
+        w, h = self.width, self.height
+        steps = [int(rng.choice(self.SCROLL_STEPS)) for _ in range(count)]
+        offsets = np.cumsum([0] + steps[1:])
+        offsets -= offsets.min()
+        page = np.full((h + int(offsets.max()), w, 3), 250, dtype=np.uint8)
+        scale = h / 1080.0
+        line = max(12, int(22 * scale))
+        for y in range(line, page.shape[0], line):
+            indent = int(rng.integers(0, 8)) * line
+            length = int(rng.integers(w // 8, w * 3 // 4))
+            if rng.random() < 0.1:
+                cv2.rectangle(page, (indent, y - line + 4), (indent + length, y + 2), (225, 235, 245), -1)
+            text = "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz (){}=+;:.,0123456789"), length // max(1, line // 2)))
+            cv2.putText(page, text, (indent + 8, y), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5 * scale + 0.1, (30, 30, 30), 1, cv2.LINE_AA)
+        header = max(24, h // 20)
+        frames = []
+        for offset in offsets:
+            frame = page[offset:offset + h].copy()
+            frame[:header] = (60, 60, 70)
+            cv2.putText(frame, "Edge Overlay - document.txt", (10, header * 2 // 3),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5 * scale + 0.1, (230, 230, 230), 1, cv2.LINE_AA)
+            frames.append(frame)
+        return frames
+
+    def _make_natural(self, rng):
+        # 사진 풍 화면: 여러 옥타브의 부드러운 잡음 (지형 / 구름 같은 완만한 경계 + 잔 질감)
+        w, h = self.width, self.height
+        frame = np.zeros((h, w, 3), np.float32)
+        amplitude = 1.0
+        cells = 4
+        while cells <= w // 4:
+            grid = rng.random((cells * h // w + 2, cells + 2, 3), dtype=np.float32)
+            frame += amplitude * cv2.resize(grid, (w, h), interpolation=cv2.INTER_CUBIC)
+            amplitude *= 0.6
+            cells *= 2
+        frame /= 2.5    # 옥타브 진폭 합 (1 / (1 - 0.6))
+        # 뚜렷한 물체 경계 (살짝 흐린 타원)
+        shapes = np.zeros((h, w, 3), np.float32)
+        for _ in range(24):
+            center = (int(rng.integers(0, w)), int(rng.integers(0, h)))
+            axes = (int(rng.integers(w // 40, w // 6)), int(rng.integers(h // 40, h // 6)))
+            color = tuple(float(c) for c in rng.random(3) * 1.2 - 0.6)
+            cv2.ellipse(shapes, center, axes, float(rng.integers(0, 180)), 0, 360, color, -1)
+        frame += cv2.GaussianBlur(shapes, (0, 0), max(0.8, h / 1080.0))
+        np.clip(frame, 0.0, 1.0, out=frame)
+        frame *= 255.0
+        return frame.astype(np.uint8)
+
+
+def open_source(spec, width=1920, height=1080):
+    # "synthetic[:kind]", "dxcam[:idx]", "video:PATH", "images:DIR"
+    # "replay:PATH" (녹화 파일, 제한 없이) / "replay-rt:PATH" (녹화 파일, 원래 캡처 간격대로)
+    # "span:SPEC@X,Y;SPEC@X,Y" (여러 모니터를 가상 데스크톱 위치에 이어 붙임, capture_span 참고)
+    kind, _, arg = spec.partition(":")
+    if kind == "synthetic":
+        return SyntheticSource(width, height, kind=arg or "ui")
+    if kind == "dxcam":
+        return DXCamSource(int(arg or 0))
+    if kind == "video":
+        return VideoFileSource(arg)
+    if kind == "images":
+        return ImageDirSource(arg)
+    if kind in ("replay", "replay-rt"):
+        from frame_recording import ReplaySource
+        return ReplaySource(arg, realtime=kind == "replay-rt")
+    if kind == "span":
+        from capture_span import open_span
+        return open_span(arg, width, height)
+    raise ValueError(f"알 수 없는 소스: {spec}")
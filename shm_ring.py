@@ -0,0 +1,177 @@
+# 공유 메모리 링 버퍼 (Shared Memory Ring)
+# 프로세스 사이에 프레임 / 엣지 마스크를 복사 없이 전달한다. 쓰는 쪽은 하나.
+# 슬롯마다 seqlock: 쓰는 동안 seq 가 홀수, 다 쓰면 짝수.
+# 읽는 쪽은 읽기 전후 seq 가 같고 짝수이면 온전한 데이터로 본다.
+# 슬롯을 순서대로 덮어쓰므로 읽는 쪽이 (slots - 1) 프레임 넘게 늦으면 seq 가 바뀌어 감지된다.
+# 오래 읽는 쪽 (처리 프로세스, 출력을 표시하는 GUI) 은 pin() 으로 슬롯 하나를 잡아 두면 쓰는 쪽이 그 슬롯을 건너뛴다.
+import os
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+HEADER_FIELDS = 7   # [슬롯 수, 슬롯 용량 (바이트), 게시 횟수, 마지막 게시 슬롯, 읽는 쪽이 잡은 슬롯,
+                    #  만든 프로세스 pid, 쓰는 쪽의 마지막 heartbeat (perf_counter_ns)]
+META_FIELDS = 8     # 슬롯별 [seq, 높이, 너비, 채널, 사용자 값 4개]
+ALIGN = 64
+
+# 연결 (_attach) 과 생성을 한 번에 하나씩: 3.13 미만 POSIX 의 _attach 는 resource_tracker.register 를
+# 프로세스 전체에서 잠시 바꾸므로, 그동안 다른 스레드 (스트림 / 일괄 처리 / span) 가 만든 링이 등록에서 빠지거나
+# 겹친 연결이 빈 함수를 복원해 버리지 않도록 함
+_tracker_lock = threading.Lock()
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _attach(name):
+    # 다른 프로세스가 만든 공유 메모리 연결
+    # POSIX 에서는 연결만 한 프로세스가 종료될 때 resource_tracker 가 지워버리므로 추적하지 않음
+    # (연결 후 unregister 하면 spawn 으로 tracker 를 공유하는 만든 쪽의 등록까지 지워짐)
+    if sys.platform == "win32":
+        return shared_memory.SharedMemory(name=name)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedRing:
+    # name=None 이면 새로 만들고 (slots, capacity 필요), 아니면 기존 링에 연결
+    # create=True 이면 정해진 이름으로 새로 만듦 (다른 프로세스가 이름으로 찾아 연결, 같은 이름이 있으면 FileExistsError)
+    def __init__(self, name=None, slots=3, capacity=0, create=False):
+        self.owner = name is None or create
+        if self.owner:
+            header = _aligned((HEADER_FIELDS + slots * META_FIELDS) * 8)
+            capacity = _aligned(capacity)
+            with _tracker_lock:
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=header + slots * capacity)
+        else:
+            self.shm = _attach(name)
+        self.header = np.ndarray(HEADER_FIELDS, np.int64, self.shm.buf)
+        if self.owner:
+            self.header[:] = (slots, capacity, 0, -1, -1, os.getpid(), time.perf_counter_ns())
+        self.slots, self.capacity = int(self.header[0]), int(self.header[1])
+        self.meta = np.ndarray((self.slots, META_FIELDS), np.int64, self.shm.buf, HEADER_FIELDS * 8)
+        if self.owner:
+            self.meta[:] = 0
+        self.offset = _aligned((HEADER_FIELDS + self.slots * META_FIELDS) * 8)
+        self.data = np.ndarray(self.slots * self.capacity, np.uint8, self.shm.buf, self.offset)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def view(self, index, shape):
+        # 슬롯 index 의 메모리를 shape (uint8) 으로 본 뷰 (복사 없음)
+        size = int(np.prod(shape))
+        if size > self.capacity:
+            raise ValueError(f"슬롯 용량 부족: {size} > {self.capacity}")
+        start = index * self.capacity
+        return self.data[start:start + size].reshape(shape)
+
+    def begin_write(self, shape):
+        # 다음 슬롯 쓰기 시작 -> (슬롯 번호, 뷰). 다 쓴 뒤 end_write 로 게시
+        index = (int(self.header[3]) + 1) % self.slots
+        if index == int(self.header[4]):
+            index = (index + 1) % self.slots
+        meta = self.meta[index]
+        meta[0] += 1    # 홀수: 쓰는 중
+        if index == int(self.header[4]):
+            # 확인과 표시 사이에 읽는 쪽이 이 슬롯을 잡음 -> seq 를 되돌려 (읽는 쪽의 seq 그대로) 다음 슬롯 사용
+            meta[0] -= 1
+            index = (index + 1) % self.slots
+            meta = self.meta[index]
+            meta[0] += 1
+        meta[1:4] = tuple(shape) + (0,) * (3 - len(shape))
+        return index, self.view(index, shape)
+
+    def end_write(self, index, *extra):
+        # extra: 슬롯에 함께 남길 정수 값 (최대 4개, 예: 위치 / 캡처 시각)
+        meta = self.meta[index]
+        meta[4:4 + len(extra)] = extra
+        meta[0] += 1    # 짝수: 완료
+        self.header[3] = index
+        self.header[2] += 1
+        self.header[6] = time.perf_counter_ns()
+
+    def beat(self):
+        # 게시할 것이 없어도 쓰는 쪽이 살아 있음을 알림 (end_write 도 갱신)
+        self.header[6] = time.perf_counter_ns()
+
+    def owner_pid(self):
+        return int(self.header[5])
+
+    def idle(self):
+        # 쓰는 쪽의 마지막 heartbeat 이후 지난 시간 (초)
+        return (time.perf_counter_ns() - int(self.header[6])) / 1e9
+
+    def published(self):
+        # 지금까지 게시한 횟수 (새 데이터 확인용)
+        return int(self.header[2])
+
+    def latest(self):
+        # 마지막으로 게시된 슬롯 -> (슬롯 번호, seq, 뷰, extra) 또는 None (없음 / 쓰는 중)
+        index = int(self.header[3])
+        if index < 0:
+            return None
+        return self.read(index)
+
+    def read(self, index):
+        # 슬롯 index -> (슬롯 번호, seq, 뷰, extra) 또는 None (쓰는 중)
+        meta = self.meta[index]
+        seq = int(meta[0])
+        if seq & 1:
+            return None
+        h, w, c = (int(v) for v in meta[1:4])
+        view = self.view(index, (h, w, c) if c else (h, w))
+        extra = tuple(int(v) for v in meta[4:])
+        if int(meta[0]) != seq:
+            return None
+        return index, seq, view, extra
+
+    def pin(self, index, seq):
+        # 읽는 동안 쓰는 쪽이 건너뛰도록 슬롯을 잡음 (잡기 전에 이미 덮어쓰기 시작했으면 False)
+        # 읽는 쪽이 하나일 때만 사용. 다 읽은 뒤에도 valid() 로 한 번 더 확인
+        # 실패하면 이전에 잡은 슬롯을 다시 잡음 (예: GUI 가 표시 중인 프레임)
+        previous = int(self.header[4])
+        self.header[4] = index
+        if self.valid(index, seq):
+            return True
+        self.header[4] = previous
+        return False
+
+    def unpin(self, index=None):
+        # index 를 주면 그 슬롯을 잡고 있을 때만 풂 (그 사이 다른 슬롯을 잡았으면 유지, 닫힌 링은 무시)
+        header = self.header
+        if header is not None and (index is None or int(header[4]) == index):
+            header[4] = -1
+
+    def valid(self, index, seq):
+        # latest() 로 얻은 뷰를 다 쓴 뒤 확인: 그 사이 덮어써지지 않았으면 True (닫힌 링은 False)
+        meta = self.meta
+        return meta is not None and int(meta[index, 0]) == seq
+
+    def close(self):
+        # 만든 쪽은 이름 제거 (이미 연결한 프로세스의 매핑은 유지됨)
+        # 뷰가 아직 남아 있으면 (예: GUI 가 그리는 중인 QImage) 매핑은 닫지 않고 GC 에 맡김
+        if self.owner:
+            self.owner = False
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.header = self.meta = self.data = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
@@ -0,0 +1,150 @@
+# 성능 측정 (Performance Telemetry)
+# 단계별 처리 시간, 달성 FPS, 버려진 / 변화 없는 프레임 수, 캡처 -> 화면 표시 지연을 집계한다.
+# Qt 비의존: 워커 스레드가 기록하고 GUI 스레드가 읽으므로 잠금으로 보호한다.
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+WINDOW = 600        # 단계별로 유지할 최근 측정값 수 (60 FPS 기준 약 10초)
+FPS_WINDOW = 2.0    # FPS 계산 구간 (초)
+PERCENTILES = (50, 95, 99)
+
+# 표시 순서 (엔진 단계 + 워커 / GUI 단계)
+TIMELINE = (
+    "grab", "gray", "change", "motion", "auto", "scale", "blur", "canny", "dilate", "colorize",
+    "vector", "handoff", "queue", "paint", "process", "e2e",
+)
+
+
+class Telemetry:
+    def __init__(self, window=WINDOW, clock=time.perf_counter):
+        self.clock = clock
+        self.window = window
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+            self.counters = {"processed": 0, "presented": 0, "unchanged": 0, "dropped": 0,
+                             "missed_deadlines": 0, "gui_busy": 0}
+            self.processed_times = deque()
+            self.presented_times = deque()
+            self.started = self.clock()
+            self.remote = None
+
+    def record(self, name, seconds):
+        with self.lock:
+            values = self.samples.get(name)
+            if values is None:
+                values = self.samples[name] = deque(maxlen=self.window)
+            values.append(seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def frame_processed(self, timings, changed):
+        # 엔진 한 번의 update 결과 기록 (timings: {단계: 초})
+        now = self.clock()
+        with self.lock:
+            self.counters["processed"] += 1
+            if not changed:
+                self.counters["unchanged"] += 1
+            self._tick(self.processed_times, now)
+        for name, seconds in timings.items():
+            if seconds > 0:
+                self.record(name, seconds)
+
+    def frame_presented(self, captured_at):
+        # 화면에 처음 그려진 프레임 (captured_at: 캡처 시각, 같은 clock 기준)
+        now = self.clock()
+        with self.lock:
+            self.counters["presented"] += 1
+            self._tick(self.presented_times, now)
+        self.record("e2e", now - captured_at)
+
+    def set_remote(self, stats):
+        # 다른 프로세스에서 받은 stats() 결과 (다중 프로세스 모드의 캡처 / 처리 단계)
+        # 이 프로세스에 없는 단계와 카운터를 stats() 에 합쳐서 보여줌
+        with self.lock:
+            self.remote = stats
+
+    def _tick(self, times, now):
+        times.append(now)
+        while times and now - times[0] > FPS_WINDOW:
+            times.popleft()
+
+    def _fps(self, times, now):
+        # 최근 구간 안의 프레임 수 / 구간 길이
+        while times and now - times[0] > FPS_WINDOW:
+            times.popleft()
+        if len(times) < 2:
+            return 0.0
+        span = now - times[0]
+        return (len(times) - 1) / span if span > 0 else 0.0
+
+    def stats(self):
+        # {"fps": ..., "counters": {...}, "stages": {이름: {"mean", "p50", "p95", "p99", "max"} (ms)}}
+        now = self.clock()
+        with self.lock:
+            samples = {name: np.fromiter(values, float) for name, values in self.samples.items()}
+            result = {
+                "uptime": now - self.started,
+                "fps": self._fps(self.presented_times, now),
+                "process_fps": self._fps(self.processed_times, now),
+                "counters": dict(self.counters),
+            }
+            remote = self.remote
+        stages = {}
+        for name, values in samples.items():
+            if values.size == 0:
+                continue
+            ms = values * 1000.0
+            entry = {"mean": float(ms.mean()), "max": float(ms.max()), "count": int(ms.size)}
+            for q, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+                entry[f"p{q}"] = float(v)
+            stages[name] = entry
+        if remote:
+            for name, entry in remote["stages"].items():
+                stages.setdefault(name, entry)
+            counters = result["counters"]
+            for name, value in remote["counters"].items():
+                counters[name] = counters.get(name, 0) + value
+            if not result["process_fps"]:
+                result["process_fps"] = remote["process_fps"]
+        order = [name for name in TIMELINE if name in stages]
+        order += sorted(name for name in stages if name not in TIMELINE)
+        result["stages"] = {name: stages[name] for name in order}
+        return result
+
+    def dump(self, path, extra=None):
+        # JSON 파일로 저장 (extra: 설정 등 함께 남길 값)
+        data = self.stats()
+        if extra:
+            data.update(extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return path
+
+    def hud_lines(self, target_fps=None):
+        # 오버레이 HUD 에 표시할 요약 문자열
+        s = self.stats()
+        c = s["counters"]
+        stages = s["stages"]
+        fps = f"FPS {s['fps']:.1f}"
+        if target_fps:
+            fps += f" / {target_fps}"
+        lines = [f"{fps} (처리 {s['process_fps']:.1f}) | 버림 {c['dropped']} | 변화 없음 {c['unchanged']}"
+                 f" | 마감 초과 {c['missed_deadlines']} | GUI 포화 {c['gui_busy']}"]
+        e2e = stages.get("e2e")
+        if e2e:
+            lines.append(f"지연 e2e p50 {e2e['p50']:.1f} / p95 {e2e['p95']:.1f} / p99 {e2e['p99']:.1f} ms")
+        parts = [f"{name} {stages[name]['p95']:.1f}" for name in TIMELINE
+                 if name in stages and name not in ("e2e", "process")]
+        for i in range(0, len(parts), 6):
+            lines.append(("p95 ms: " if i == 0 else "        ") + " | ".join(parts[i:i + 6]))
+        return lines
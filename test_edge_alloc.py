@@ -0,0 +1,40 @@
+# 정상 상태 프레임 할당 검사 (python -m pytest test_edge_alloc.py)
+# 버퍼 재할당 0, 프레임마다 남는 메모리 0, 프레임당 할당은 Python 객체 여유 + 벡터 출력 결과뿐
+# 해상도 / 출력 조합을 바꿔 보려면: python edge_bench.py alloc --resolutions 1080p ...
+import pytest
+
+from edge_bench import ALLOC_GROWTH_SLACK, ALLOC_SEQUENCES, SUITE_OUTPUTS, alloc_check, private_store
+from edge_engine import VECTOR_OUTPUTS
+
+# 두 해상도의 프레임당 할당 차이 허용: 영역 튜플 개수 차이만큼 (360p -> 1080p 그레이 한 줄 차이 1280 B 보다 작게)
+# -> 한 줄 이상 크기의 임시 버퍼는 고정 여유 안에 숨어도 여기서 드러남
+SCALE_SLACK = 1024
+
+
+def check(sequence, output, width, height, threads=0):
+    store = private_store(OUTPUT_MODE=output if output in VECTOR_OUTPUTS else "mask", WORKER_THREADS=threads)
+    result = alloc_check(sequence, output, "synthetic:ui", width, height, frames=20, store=store)
+    assert result["realloc"] == 0
+    assert result["growth"] <= ALLOC_GROWTH_SLACK, f"{result['growth']} B 가 프레임 사이에 남음"
+    assert result["peak"] <= result["allowed"], f"프레임당 {result['peak']} B 할당 (출력 제외)"
+    return result["peak"]
+
+
+@pytest.mark.parametrize("output", SUITE_OUTPUTS)
+@pytest.mark.parametrize("sequence", ALLOC_SEQUENCES)
+def test_steady_state_allocations(sequence, output):
+    check(sequence, output, 1280, 720)
+
+
+@pytest.mark.parametrize("sequence", ALLOC_SEQUENCES)
+def test_steady_state_allocations_tiled(sequence):
+    check(sequence, "mask", 1920, 1080, threads=4)
+
+
+@pytest.mark.parametrize("threads", [0, 2])
+@pytest.mark.parametrize("output", [output for output in SUITE_OUTPUTS if output != "vector"])
+@pytest.mark.parametrize("sequence", ALLOC_SEQUENCES)
+def test_allocations_do_not_scale_with_frame(sequence, output, threads):
+    # 360p 와 1080p 의 밴드 수가 같도록 threads <= 2
+    small, large = check(sequence, output, 640, 360, threads), check(sequence, output, 1920, 1080, threads)
+    assert large - small <= SCALE_SLACK, f"360p {small} B -> 1080p {large} B (화면 크기 임시 버퍼)"